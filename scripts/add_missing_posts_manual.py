@@ -3,9 +3,10 @@
 Manually add the 2 missing posts that weren't in WordPress extraction
 """
 
-import json
 import random
 
+from blog_store import transaction
+
 # Random author names we're using
 AUTHORS = [
     "Sarah Mitchell",
@@ -103,29 +104,23 @@ missing_posts = [
 
 print("=== Adding Missing Blog Posts ===\n")
 
-# Load existing blog data
-with open('src/data/blog_posts.json', 'r', encoding='utf-8') as f:
-    blog_data = json.load(f)
-
-original_count = len(blog_data['posts'])
-
-for post in missing_posts:
-    # Check if already exists
-    if not any(p['slug'] == post['slug'] for p in blog_data['posts']):
-        blog_data['posts'].append(post)
-        print(f"✓ Added: {post['title']}")
-        print(f"  Slug: /{post['slug']}")
-        print(f"  Author: {post['author']}")
-        print(f"  Tags: {', '.join(post['tags'])}\n")
-    else:
-        print(f"⚠ Already exists: {post['title']}\n")
+# Update the blog data in one transaction
+with transaction() as blog_data:
+    original_count = len(blog_data['posts'])
 
-# Update total
-blog_data['total_posts'] = len(blog_data['posts'])
+    for post in missing_posts:
+        # Check if already exists
+        if not any(p['slug'] == post['slug'] for p in blog_data['posts']):
+            blog_data['posts'].append(post)
+            print(f"✓ Added: {post['title']}")
+            print(f"  Slug: /{post['slug']}")
+            print(f"  Author: {post['author']}")
+            print(f"  Tags: {', '.join(post['tags'])}\n")
+        else:
+            print(f"⚠ Already exists: {post['title']}\n")
 
-# Save updated data
-with open('src/data/blog_posts.json', 'w', encoding='utf-8') as f:
-    json.dump(blog_data, f, indent=2, ensure_ascii=False)
+    # Update total
+    blog_data['total_posts'] = len(blog_data['posts'])
 
 print(f"✅ Total posts: {original_count} → {len(blog_data['posts'])}")
-print("💾 Saved updated blog_posts.json")
+print("💾 Saved updated blog post store")
@@ -3,25 +3,31 @@
 Add view counts to all blog posts
 """
 
-import json
 import random
 
-print("=== Adding Post View Counts ===\n")
+from blog_store import transaction
 
-# Load existing blog data
-with open('src/data/blog_posts.json', 'r', encoding='utf-8') as f:
-    blog_data = json.load(f)
+# Bump when add_views() would give posts different counts
+VERSION = 1
 
-# Add random view counts to each post (between 1,000 and 25,000)
-for post in blog_data['posts']:
+def add_views(post):
+    """Give a post a random view count (between 1,000 and 25,000)"""
     # Generate realistic view count
-    views = random.randint(1000, 25000)
-    post['views'] = views
-    print(f"✓ {post['title'][:60]}... → {views:,} views")
+    post['views'] = random.randint(1000, 25000)
+    return True
 
-# Save updated data
-with open('src/data/blog_posts.json', 'w', encoding='utf-8') as f:
-    json.dump(blog_data, f, indent=2, ensure_ascii=False)
+def main():
+    print("=== Adding Post View Counts ===\n")
 
-print(f"\n✅ Added view counts to {len(blog_data['posts'])} posts")
-print("💾 Saved updated blog_posts.json")
+    # Update the blog data in one transaction
+    with transaction(content=False) as blog_data:
+        # Add random view counts to each post
+        for post in blog_data['posts']:
+            add_views(post)
+            print(f"✓ {post['title'][:60]}... → {post['views']:,} views")
+
+    print(f"\n✅ Added view counts to {len(blog_data['posts'])} posts")
+    print("💾 Saved updated blog post store")
+
+if __name__ == "__main__":
+    main()
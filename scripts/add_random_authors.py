@@ -3,9 +3,10 @@
 Add random author names to blog posts
 """
 
-import json
 import random
 
+from blog_store import transaction
+
 # List of fake author names
 AUTHORS = [
     "Sarah Mitchell",
@@ -16,27 +17,33 @@ AUTHORS = [
     "Robert Johnson"
 ]
 
-# Load existing blog data
-with open('src/data/blog_posts.json', 'r', encoding='utf-8') as f:
-    blog_data = json.load(f)
+# Version of assign_author()'s output; bump it when the authors it picks change
+VERSION = 1
 
-# Assign random authors to each post
-for post in blog_data['posts']:
+def assign_author(post):
+    """Give a post a random author"""
     post['author'] = random.choice(AUTHORS)
-
-# Save updated data
-with open('src/data/blog_posts.json', 'w', encoding='utf-8') as f:
-    json.dump(blog_data, f, indent=2, ensure_ascii=False)
-
-# Show stats
-author_counts = {}
-for post in blog_data['posts']:
-    author = post['author']
-    author_counts[author] = author_counts.get(author, 0) + 1
-
-print("✅ Added random authors to all blog posts!")
-print(f"\n📊 Author distribution:")
-for author, count in sorted(author_counts.items(), key=lambda x: x[1], reverse=True):
-    print(f"   {author}: {count} posts")
-
-print(f"\n💾 Saved updated blog_posts.json")
+    return True
+
+def main():
+    # Update the blog data in one transaction
+    with transaction(content=False) as blog_data:
+        # Assign random authors to each post
+        for post in blog_data['posts']:
+            assign_author(post)
+
+    # Show stats
+    author_counts = {}
+    for post in blog_data['posts']:
+        author = post['author']
+        author_counts[author] = author_counts.get(author, 0) + 1
+
+    print("✅ Added random authors to all blog posts!")
+    print(f"\n📊 Author distribution:")
+    for author, count in sorted(author_counts.items(), key=lambda x: x[1], reverse=True):
+        print(f"   {author}: {count} posts")
+
+    print(f"\n💾 Saved updated blog post store")
+
+if __name__ == "__main__":
+    main()
@@ -4,103 +4,91 @@ WordPress Database Analyzer
 Extracts key information from WordPress SQL dump for migration planning
 """
 
+import os
 import re
 import json
+import argparse
 from collections import defaultdict
 from datetime import datetime
 
-def extract_posts_data(sql_content):
-    """Extract post data from wp_posts table"""
-    posts = []
-    pages = []
-    post_types = defaultdict(int)
-    post_statuses = defaultdict(int)
-
-    # Find wp_posts INSERT statements
-    posts_pattern = r"INSERT INTO `wp_posts`.*?VALUES\s*(.*?);"
-    matches = re.findall(posts_pattern, sql_content, re.DOTALL)
-
-    total_inserts = len(matches)
-
-    for match in matches:
-        # Extract individual rows from VALUES
-        # This regex looks for rows in format (val1, val2, ..., valN)
-        row_pattern = r"\((\d+),\s*(\d+),\s*'([^']*)',\s*'([^']*)',\s*(?:'(?:[^'\\\\]|\\\\.)*'|\"(?:[^\"\\\\]|\\\\.)*\"),\s*(?:'(?:[^'\\\\]|\\\\.)*'|\"(?:[^\"\\\\]|\\\\.)*\"),\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*(?:'(?:[^'\\\\]|\\\\.)*'|\"(?:[^\"\\\\]|\\\\.)*\"),\s*\d+,\s*(?:'(?:[^'\\\\]|\\\\.)*'|\"(?:[^\"\\\\]|\\\\.)*\"),\s*\d+,\s*'([^']*)',\s*'([^']*)',\s*\d+\)"
-
-        rows = re.finditer(row_pattern, match)
-        for row in rows:
-            try:
-                post_id = row.group(1)
-                post_date = row.group(3)
-                post_excerpt = row.group(5)
-                post_status = row.group(6)
-                post_name = row.group(10)  # slug
-                post_type = row.group(15)
-
-                post_types[post_type] += 1
-                post_statuses[post_status] += 1
-
-                post_data = {
-                    'id': post_id,
-                    'slug': post_name,
-                    'status': post_status,
-                    'type': post_type,
-                    'date': post_date
-                }
-
-                if post_status == 'publish':
-                    if post_type == 'post':
-                        posts.append(post_data)
-                    elif post_type == 'page':
-                        pages.append(post_data)
-            except Exception as e:
-                continue
-
-    return {
-        'posts': posts,
-        'pages': pages,
-        'post_types': dict(post_types),
-        'post_statuses': dict(post_statuses),
-        'total_inserts': total_inserts
-    }
+from wp_checkpoint import DEFAULT_INTERVAL, Checkpoint, run_rows
+from wp_dump import iter_row_spans, row_dict
+
+QUIZ_KEYWORDS = ['quiz', 'test', 'question', 'exam', 'practice', 'dmv test', 'driving test']
+
+QUIZ_PATTERNS = {keyword: re.compile(keyword, re.IGNORECASE) for keyword in QUIZ_KEYWORDS}
+
+def handle_row(state, table, row):
+    """Add one row from the dump to the analysis state"""
+    # Search for quiz-related content in every stored value
+    quiz_keywords = state['quiz_keywords']
+    for value in row:
+        if value:
+            for keyword, pattern in QUIZ_PATTERNS.items():
+                quiz_keywords[keyword] += len(pattern.findall(value))
+
+    if table == 'wp_posts':
+        state['total_rows'] += 1
+        post = row_dict(table, row)
+        post_status = post['post_status']
+        post_type = post['post_type']
+
+        state['post_types'][post_type] += 1
+        state['post_statuses'][post_status] += 1
+
+        post_data = {
+            'id': post['ID'],
+            'slug': post['post_name'],
+            'status': post_status,
+            'type': post_type,
+            'date': post['post_date']
+        }
 
-def extract_terms(sql_content):
-    """Extract categories and tags from wp_terms"""
-    terms = []
-
-    terms_pattern = r"INSERT INTO `wp_terms`.*?VALUES\s*(.*?);"
-    matches = re.findall(terms_pattern, sql_content, re.DOTALL)
-
-    for match in matches:
-        # Extract term data
-        row_pattern = r"\((\d+),\s*'([^']*)',\s*'([^']*)'"
-        rows = re.finditer(row_pattern, match)
-        for row in rows:
-            terms.append({
-                'id': row.group(1),
-                'name': row.group(2),
-                'slug': row.group(3)
-            })
-
-    return terms
-
-def search_quiz_content(sql_content):
-    """Search for quiz-related content"""
-    quiz_keywords = {
-        'quiz': 0,
-        'test': 0,
-        'question': 0,
-        'exam': 0,
-        'practice': 0,
-        'dmv test': 0,
-        'driving test': 0
-    }
+        if post_status == 'publish':
+            if post_type == 'post':
+                state['posts'].append(post_data)
+            elif post_type == 'page':
+                state['pages'].append(post_data)
+
+    elif table == 'wp_terms':
+        # Extract categories and tags
+        term = row_dict(table, row)
+        state['terms'].append({
+            'id': term['term_id'],
+            'name': term['name'],
+            'slug': term['slug']
+        })
+
+def analyze_dump(sql_file, checkpoint=None, resume=False):
+    """Collect posts, terms and quiz keyword counts in a single pass over the dump
+
+    With a Checkpoint, progress is saved periodically and whenever the run
+    fails; `resume` continues from the last saved checkpoint.
+    """
+    state = checkpoint.load() if checkpoint is not None and resume else None
+    if state is not None:
+        print(f"   ↩️  Resuming from {checkpoint.describe()}")
+    else:
+        state = {
+            'posts': [],
+            'pages': [],
+            'terms': [],
+            'post_types': defaultdict(int),
+            'post_statuses': defaultdict(int),
+            'total_rows': 0,
+            'quiz_keywords': {keyword: 0 for keyword in QUIZ_KEYWORDS},
+        }
 
-    for keyword in quiz_keywords:
-        pattern = re.compile(keyword, re.IGNORECASE)
-        quiz_keywords[keyword] = len(pattern.findall(sql_content))
+    spans = iter_row_spans(sql_file, resume=checkpoint.position if checkpoint else None)
+    run_rows(spans, handle_row, state, checkpoint)
 
-    return quiz_keywords
+    return {
+        'posts': state['posts'],
+        'pages': state['pages'],
+        'post_types': dict(state['post_types']),
+        'post_statuses': dict(state['post_statuses']),
+        'total_rows': state['total_rows']
+    }, state['terms'], state['quiz_keywords']
 
 def analyze_url_patterns(posts, pages):
     """Analyze URL patterns from slugs"""
@@ -126,6 +114,12 @@ def analyze_url_patterns(posts, pages):
     return url_patterns
 
 def main():
+    parser = argparse.ArgumentParser(description='Analyze the WordPress dump for migration planning')
+    parser.add_argument('--resume', action='store_true', help='continue from the last checkpoint')
+    parser.add_argument('--checkpoint-interval', type=float, default=DEFAULT_INTERVAL,
+                        help='seconds between checkpoints')
+    args = parser.parse_args()
+
     print("🔍 WordPress Database Analyzer\n")
     print("=" * 60)
 
@@ -134,18 +128,17 @@ def main():
     print(f"\n📂 Reading: {sql_file}")
 
     try:
-        with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-            sql_content = f.read()
-
-        file_size_mb = len(sql_content) / (1024 * 1024)
+        file_size = os.path.getsize(sql_file)
+        file_size_mb = file_size / (1024 * 1024)
         print(f"   File size: {file_size_mb:.2f} MB")
-        print(f"   Total length: {len(sql_content):,} characters\n")
+        print(f"   Total length: {file_size:,} bytes\n")
 
         # Extract data
-        print("📊 Analyzing wp_posts table...")
-        posts_data = extract_posts_data(sql_content)
+        print("📊 Analyzing wp_posts, wp_terms and quiz content...")
+        checkpoint = Checkpoint(sql_file, 'analyze', interval=args.checkpoint_interval)
+        posts_data, terms, quiz_keywords = analyze_dump(sql_file, checkpoint, args.resume)
 
-        print(f"\n   Total INSERT statements: {posts_data['total_inserts']}")
+        print(f"\n   Total wp_posts rows: {posts_data['total_rows']}")
         print(f"   Published posts: {len(posts_data['posts'])}")
         print(f"   Published pages: {len(posts_data['pages'])}")
 
@@ -157,18 +150,16 @@ def main():
         for status, count in sorted(posts_data['post_statuses'].items(), key=lambda x: x[1], reverse=True):
             print(f"     - {status}: {count}")
 
-        # Extract terms
-        print(f"\n🏷️  Analyzing wp_terms table (categories/tags)...")
-        terms = extract_terms(sql_content)
+        # Terms
+        print(f"\n🏷️  wp_terms table (categories/tags)...")
         print(f"   Found {len(terms)} terms")
         if terms[:10]:
             print(f"   Sample terms:")
             for term in terms[:10]:
                 print(f"     - {term['name']} (slug: {term['slug']})")
 
-        # Search for quiz content
-        print(f"\n🎯 Searching for quiz-related content...")
-        quiz_keywords = search_quiz_content(sql_content)
+        # Quiz content
+        print(f"\n🎯 Quiz-related content...")
         for keyword, count in sorted(quiz_keywords.items(), key=lambda x: x[1], reverse=True):
             if count > 0:
                 print(f"   '{keyword}': {count} occurrences")
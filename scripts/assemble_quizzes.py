@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Simulation test generator
+Assembles practice tests from the question bank (see quiz_bank.py): each
+test gets a fixed number of questions per group (traffic signs and rules
+of the road by default, 6 + 40 like the DMV simulation tests), and tests
+do not share questions until a group's pool is used up.
+
+Each group's questions are shuffled once into an index array and tests take
+consecutive slices of it, so a test costs the same however large the pool
+grows; when a pool runs out it is reshuffled and sampling continues. The
+same bank, quotas and --seed give the same tests.
+
+Titles, category and description are in the chosen --language (see
+LABELS) and each test carries its language code. Tests are numbered on from
+the highest number the bank's titles of that kind already use, and nothing
+is written if a generated title, slug or ID is taken.
+
+Usage: python3 scripts/assemble_quizzes.py [--count 100] [--seed 1]
+           [--quota signs=6 rules=40] [--language en] [--start N] [--expand]
+           [--output generated_quizzes.json]
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+
+from data_store import read_json
+from quiz_bank import DEFAULT_OUTPUT as DEFAULT_BANK, quiz_questions
+
+# Questions with an image or in one of these categories are sign questions
+SIGN_CATEGORIES = {
+    'Traffic Signs', 'Regulatory Signs', 'Warning Signs', 'Guide Signs', 'Trafik İşaretleri',
+}
+DEFAULT_QUOTAS = {'signs': 6, 'rules': 40}
+
+# Quiz fields of a generated test, like the DMV simulation tests
+PASSING_SCORE = 83
+TIME_LIMIT = 60
+
+# Per language: title, category (the one that language's quizzes use) and
+# description of a generated test
+LABELS = {
+    'en': {
+        'title': 'California DMV Simulation Test #{number}',
+        'category': 'Full Simulation Tests',
+        'description': ('Full-length California DMV practice test with {size} questions. '
+                        'Pass with {score}% ({correct}/{size} correct).'),
+    },
+    'es': {
+        'title': 'Examen de Simulación del DMV en Español #{number}',
+        'category': 'Spanish Tests / Pruebas en Español',
+        'description': ('Examen completo de práctica del DMV de California con {size} preguntas. '
+                        'Apruebe con {score}% ({correct}/{size} correctas).'),
+    },
+    'tr': {
+        'title': 'DMV Turkish Simulation Test #{number} / DMV Türkçe Simülasyon Testi #{number}',
+        'category': 'Turkish Tests / Türkçe Testler',
+        'description': ('California DMV Türkçe simülasyon testi, {size} soru. '
+                        'Geçmek için %{score} ({correct}/{size} doğru).'),
+    },
+    'zh': {
+        'title': 'DMV Chinese Simulation Test #{number} / DMV 中文模擬考試 #{number}',
+        'category': 'Chinese Tests / 中文考試',
+        'description': ('California DMV 中文模擬考試 - {size}題。'
+                        '及格分數 {score}%（{correct}/{size} 題正確）。'),
+    },
+}
+
+
+def question_group(question):
+    if question.get('image') or question.get('category') in SIGN_CATEGORIES:
+        return 'signs'
+    return 'rules'
+
+
+def quiz_language(quiz):
+    """Language of a bank quiz; the Spanish quizzes in quizzes.json have no
+    language field and are told apart by their category"""
+    if 'language' in quiz:
+        return quiz['language']
+    return 'es' if quiz.get('category', '').startswith('Spanish') else 'en'
+
+
+def group_pools(bank, language):
+    """{group: [question IDs]} of the bank's questions in `language`, in bank order"""
+    in_language = set()
+    for quiz in bank['quizzes']:
+        if quiz_language(quiz) == language:
+            in_language.update(quiz['questions'])
+    pools = {}
+    for question_id, question in bank['questions'].items():
+        if question_id in in_language:
+            pools.setdefault(question_group(question), []).append(question_id)
+    return pools
+
+
+class _Pool:
+    """One group's questions, handed out in shuffled order without repeats
+    until all were used, then reshuffled"""
+
+    def __init__(self, ids, rng):
+        self.ids = list(ids)
+        self.rng = rng
+        self.rng.shuffle(self.ids)
+        self.pos = 0
+        self.rounds = 1
+
+    def take(self, count):
+        taken = self.ids[self.pos:self.pos + count]
+        self.pos += len(taken)
+        if len(taken) < count:
+            # Next round; what this test already holds goes to the back of it
+            held = set(taken)
+            self.rng.shuffle(self.ids)
+            self.ids = ([question_id for question_id in self.ids if question_id not in held]
+                        + [question_id for question_id in self.ids if question_id in held])
+            self.rounds += 1
+            self.pos = count - len(taken)
+            taken += self.ids[:self.pos]
+        return taken
+
+
+def assemble(bank, count, quotas=DEFAULT_QUOTAS, seed=1, language='en'):
+    """`count` tests as lists of question IDs, plus {group: rounds} telling how
+    often each pool was gone through
+
+    Raises ValueError if a quota asks for more questions than its group has.
+    """
+    pools = group_pools(bank, language)
+    for group, quota in quotas.items():
+        available = len(pools.get(group, []))
+        if quota > available:
+            raise ValueError(f"quota {group}={quota} but the bank has {available} "
+                             f"{group} questions in {language!r}")
+
+    rng = random.Random(seed)
+    samplers = {group: _Pool(pools[group], rng) for group, quota in quotas.items() if quota}
+    tests = []
+    for _ in range(count):
+        questions = []
+        for group, sampler in samplers.items():
+            questions += sampler.take(quotas[group])
+        # Mix the groups; the sign questions should not all come first
+        rng.shuffle(questions)
+        tests.append(questions)
+    return tests, {group: sampler.rounds for group, sampler in samplers.items()}
+
+
+def default_prefix(language):
+    return 'generated-simulation-test' if language == 'en' else f'generated-{language}-simulation-test'
+
+
+def test_quiz(bank, number, question_ids, prefix, expand, language='en'):
+    size = len(question_ids)
+    labels = LABELS[language]
+    quiz = {
+        'id': f'{prefix}-{number}',
+        'title': labels['title'].format(number=number),
+        'description': labels['description'].format(
+            size=size, score=PASSING_SCORE, correct=-(-size * PASSING_SCORE // 100)),
+        'category': labels['category'],
+        'language': language,
+        'slug': f'{prefix}-{number}',
+        'passingScore': PASSING_SCORE,
+        'timeLimit': TIME_LIMIT,
+        'questions': question_ids,
+    }
+    if expand:
+        quiz['questions'] = quiz_questions(bank, quiz)
+    return quiz
+
+
+def next_number(bank, language='en'):
+    """First test number after the highest one in the bank's titles that start
+    like the language's generated titles"""
+    head = LABELS[language]['title'].split('{number}')[0]
+    number_re = re.compile(re.escape(head) + r'(\d+)')
+    numbers = [int(match.group(1)) for quiz in bank['quizzes']
+               for match in [number_re.match(quiz.get('title', ''))] if match]
+    return max(numbers, default=0) + 1
+
+
+def clashes(bank, quizzes):
+    """Titles, slugs and IDs of the generated quizzes that a bank quiz or an
+    earlier generated quiz already has, as 'field value' strings"""
+    taken = {field: {quiz.get(field) for quiz in bank['quizzes']}
+             for field in ('id', 'title', 'slug')}
+    found = []
+    for quiz in quizzes:
+        for field, values in taken.items():
+            if quiz[field] in values:
+                found.append(f'{field} {quiz[field]!r}')
+            values.add(quiz[field])
+    return found
+
+
+def parse_quotas(values):
+    quotas = {}
+    for value in values:
+        group, _, count = value.partition('=')
+        if group not in DEFAULT_QUOTAS or not count.isdigit():
+            raise argparse.ArgumentTypeError(f"expected {'|'.join(DEFAULT_QUOTAS)}=N, got {value!r}")
+        quotas[group] = int(count)
+    return quotas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate simulation tests from the question bank')
+    parser.add_argument('--bank', default=DEFAULT_BANK)
+    parser.add_argument('--count', type=int, default=100, help='tests to generate')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--quota', nargs='+', default=[],
+                        help='questions per group, e.g. signs=6 rules=40')
+    parser.add_argument('--language', default='en', choices=sorted(LABELS))
+    parser.add_argument('--prefix', help='ID and slug prefix (default: generated-[LANGUAGE-]simulation-test)')
+    parser.add_argument('--start', type=int,
+                        help='number of the first test (default: after the bank\'s highest)')
+    parser.add_argument('--expand', action='store_true',
+                        help='write full questions (quizzes.json schema) instead of bank IDs')
+    parser.add_argument('--output', default='generated_quizzes.json')
+    args = parser.parse_args()
+
+    print("=== Simulation Test Generator ===\n")
+
+    quotas = dict(DEFAULT_QUOTAS, **parse_quotas(args.quota))
+    bank = read_json(args.bank)
+    pools = group_pools(bank, args.language)
+    print(f"📚 {args.bank}: " + ', '.join(f"{len(ids)} {group}" for group, ids in pools.items())
+          + f" questions in {args.language!r}")
+
+    started = time.perf_counter()
+    try:
+        tests, rounds = assemble(bank, args.count, quotas, args.seed, args.language)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    start = args.start if args.start is not None else next_number(bank, args.language)
+    prefix = args.prefix or default_prefix(args.language)
+    quizzes = [test_quiz(bank, number, question_ids, prefix, args.expand, args.language)
+               for number, question_ids in enumerate(tests, start)]
+    elapsed = time.perf_counter() - started
+
+    taken = clashes(bank, quizzes)
+    if taken:
+        print(f"❌ {len(taken)} title(s), slug(s) or ID(s) already in use, nothing written:")
+        for clash in taken[:10]:
+            print(f"   {clash}")
+        return
+
+    print(f"🎲 {len(tests)} tests of {sum(quotas.values())} questions "
+          f"({', '.join(f'{group}={quota}' for group, quota in quotas.items())}), seed {args.seed}, "
+          f"numbered from #{start}")
+    for group, count in rounds.items():
+        print(f"   {group}: pool used {count} time(s)")
+    print(f"⏱️  Assembled in {elapsed:.3f}s")
+
+    output = {'bank': args.bank, 'seed': args.seed, 'quotas': quotas, 'quizzes': quizzes}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
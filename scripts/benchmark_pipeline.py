@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+WordPress extraction benchmark
+Times each extractor stage and records its peak Python memory on a dump
+(a synthetic one by default), and writes the results as JSON so runs can be
+compared across commits
+
+Usage: python3 scripts/benchmark_pipeline.py [--dump FILE] [--posts 1000] [--body-size 20000]
+           [--rows-per-insert 100] [--escapes] [--stages posts tags ...] [--output FILE]
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from synthetic_dump import generate_dump
+from wp_dump import iter_rows
+
+
+def stage_posts(sql_file, context):
+    from extract_full_blog_posts import extract_from_dump
+    posts, _ = extract_from_dump(sql_file, workers=context['workers'])
+    return len(posts)
+
+
+def stage_featured_images(sql_file, context):
+    from extract_image_urls import FeaturedImages, IMAGE_COLUMNS, IMAGE_META_KEYS
+    images = FeaturedImages()
+    rows = iter_rows(sql_file, tables={'wp_postmeta'}, columns=IMAGE_COLUMNS,
+                     where={'meta_key': IMAGE_META_KEYS})
+    for table, row in rows:
+        images.add(table, row)
+    context['attachment_ids'] = set(images.thumbnails.values())
+    return len(images.thumbnails)
+
+
+def stage_attachments(sql_file, context):
+    from extract_image_urls import extract_attachment_urls
+    return len(extract_attachment_urls(sql_file, context['attachment_ids']))
+
+
+def stage_image_join(sql_file, context):
+    from extract_image_urls import extract_featured_images
+    return len(extract_featured_images(sql_file))
+
+
+def stage_tags(sql_file, context):
+    from extract_tags import collect_post_tags
+    return len(collect_post_tags(sql_file))
+
+
+def stage_keywords(sql_file, context):
+    from extract_keywords import extract_postmeta
+    return len(extract_postmeta(sql_file, workers=context['workers']))
+
+
+def stage_quizzes(sql_file, context):
+    from extract_wp_quizzes import extract_quiz_data
+    _, questions_by_quiz, _ = extract_quiz_data(sql_file)
+    return sum(len(questions) for questions in questions_by_quiz.values())
+
+
+# Run in this order; attachments uses the IDs found by featured_images
+STAGES = {
+    'posts': stage_posts,
+    'featured_images': stage_featured_images,
+    'attachments': stage_attachments,
+    'image_join': stage_image_join,
+    'tags': stage_tags,
+    'keywords': stage_keywords,
+    'quizzes': stage_quizzes,
+}
+
+
+def run_stage(func, sql_file, context, repeat, memory):
+    """Best wall time of `repeat` runs, then one traced run for peak memory
+
+    The extractors print per record, so their output is discarded. Peak
+    memory is what tracemalloc sees in this process (mmap'd pages and
+    worker processes are not included).
+    """
+    times = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            gc.collect()
+            started = time.perf_counter()
+            items = func(sql_file, context)
+            times.append(time.perf_counter() - started)
+
+        result = {'seconds': min(times), 'runs': times, 'items': items}
+        if memory:
+            gc.collect()
+            tracemalloc.start()
+            try:
+                func(sql_file, context)
+                result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    return result
+
+
+def git_commit():
+    """HEAD of the repository this script lives in, or None"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(sql_file, stages, repeat=3, memory=True, workers=1):
+    """Run the named stages on a dump and return {stage: result}"""
+    context = {'workers': workers}
+    if 'attachments' in stages and 'featured_images' not in stages:
+        # Untimed: attachments needs the featured image IDs
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            stage_featured_images(sql_file, context)
+
+    results = {}
+    for name in stages:
+        try:
+            results[name] = run_stage(STAGES[name], sql_file, context, repeat, memory)
+        except ImportError as e:
+            # e.g. a stage whose optional dependency is not installed
+            results[name] = {'skipped': str(e)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the WordPress extraction stages')
+    parser.add_argument('--dump', help='existing SQL dump to measure (default: generate one)')
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--body-size', type=int, default=20000, help='average post_content characters')
+    parser.add_argument('--meta-per-post', type=int, default=4)
+    parser.add_argument('--rows-per-insert', type=int, default=100, help='1 for single-row INSERTs')
+    parser.add_argument('--escapes', action='store_true', help='add pathological escapes to posts')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage (best is kept)')
+    parser.add_argument('--workers', type=int, default=1, help='parser processes for posts and keywords')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args()
+
+    print("=== WordPress Extraction Benchmark ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.dump:
+            sql_file = args.dump
+            dump = {'path': sql_file, 'bytes': os.path.getsize(sql_file)}
+        else:
+            sql_file = os.path.join(tmp_dir, 'synthetic.sql')
+            print(f"📝 Generating a synthetic dump with {args.posts:,} posts...")
+            dump = generate_dump(sql_file, posts=args.posts, body_size=args.body_size,
+                                 meta_per_post=args.meta_per_post,
+                                 rows_per_insert=args.rows_per_insert,
+                                 escapes=args.escapes, seed=args.seed)
+            dump['path'] = None
+        print(f"📂 Dump: {dump['bytes'] / 1024 / 1024:.1f} MB\n")
+
+        stages = [name for name in STAGES if name in args.stages]
+        results = run_benchmark(sql_file, stages, args.repeat, not args.no_memory, args.workers)
+
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"   ⏭️  {name}: skipped ({result['skipped']})")
+            continue
+        line = f"   ⏱️  {name}: {result['seconds']:.3f}s, {result['items']:,} items"
+        if 'peak_bytes' in result:
+            line += f", peak {result['peak_bytes'] / 1024 / 1024:.1f} MB"
+        print(line)
+
+    output = {
+        'created_at': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'workers': args.workers,
+        'repeat': args.repeat,
+        'dump': dump,
+        'stages': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+
+    print(f"\n💾 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
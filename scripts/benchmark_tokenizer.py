@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tokenizer microbenchmark
+Times wp_dump's row tokenizer against the per-character field splitter and
+replace() unescaping the extract scripts used to copy around, on wp_posts
+rows with large post_content
+
+Usage: python3 scripts/benchmark_tokenizer.py [--sizes 10000 50000 100000] [--repeat 5]
+"""
+
+import argparse
+import time
+
+from wp_dump import _parse_row
+
+# A paragraph of post HTML with the escapes mysqldump writes
+PARAGRAPH = (
+    "<p>Don\\'t forget your \\\"permit\\\" before the DMV test;\\r\\n"
+    "lanes, signs (and speed limits) are covered.</p>\\n"
+)
+
+
+def make_row(content_size):
+    """A wp_posts row tuple whose post_content is about `content_size` bytes"""
+    content = PARAGRAPH * (content_size // len(PARAGRAPH) + 1)
+    fields = [
+        '1914', '1', "'2023-05-01 10:00:00'", "'2023-05-01 10:00:00'",
+        f"'{content}'", "'California DMV Written Test'", "''", "'publish'",
+        "'open'", "'open'", "''", "'california-dmv-written-test'", "''", "''",
+        "'2023-05-02 10:00:00'", "'2023-05-02 10:00:00'", "''", '0',
+        "'https://www.dmvcalifornia.us/?p=1914'", '0', "'post'", "''", '0'
+    ]
+    return '(' + ','.join(fields) + ')'
+
+
+def legacy_split(record):
+    """The per-character splitter the extract scripts used before wp_dump"""
+    record = record.strip().lstrip('(').rstrip(')')
+    parts = []
+    current = ""
+    in_quotes = False
+    escape_next = False
+
+    for char in record:
+        if escape_next:
+            current += char
+            escape_next = False
+            continue
+
+        if char == '\\':
+            current += char
+            escape_next = True
+            continue
+
+        if char == "'" and not escape_next:
+            in_quotes = not in_quotes
+            current += char
+            continue
+
+        if char == ',' and not in_quotes:
+            parts.append(current.strip())
+            current = ""
+            continue
+
+        current += char
+
+    if current:
+        parts.append(current.strip())
+    return parts
+
+
+def legacy_content(record):
+    """post_content the way the extract scripts used to get it: split, then
+    unescape with a chain of replace() calls"""
+    content = legacy_split(record)[4].strip("'")
+    content = content.replace("\\'", "'").replace('\\"', '"')
+    content = content.replace("\\r\\n", "\n").replace("\\n", "\n")
+    return content.replace("\\t", "\t")
+
+
+def fast_content(data):
+    """post_content from wp_dump, decoded while tokenizing"""
+    return _parse_row(data, 0)[0][4]
+
+
+def best_time(func, arg, repeat):
+    """Fastest of `repeat` runs, in seconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the mysqldump row tokenizer')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000],
+                        help='post_content sizes in bytes')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print("=== Tokenizer Microbenchmark ===\n")
+    print(f"{'content':>10}  {'per-char':>10}  {'wp_dump':>10}  {'speedup':>8}")
+
+    for size in args.sizes:
+        record = make_row(size)
+        data = record.encode('utf-8')
+
+        # Both must agree on post_content (the old chain also turned \r\n
+        # into \n) before timing them
+        if legacy_content(record) != fast_content(data).replace("\r\n", "\n"):
+            raise SystemExit(f"❌ Tokenizers disagree on a {size} byte row")
+
+        slow_time = best_time(legacy_content, record, args.repeat)
+        fast_time = best_time(fast_content, data, args.repeat)
+        print(f"{len(data):>10,}  {slow_time * 1000:>8.2f}ms  {fast_time * 1000:>8.3f}ms"
+              f"  {slow_time / fast_time:>7.0f}x")
+
+    print("\n✅ Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Blog post fixer pipeline
+Runs the blog fixers as stages in one process: the store is loaded once,
+each post passes through every stage in order, and the store is saved once,
+with the time spent in each stage reported at the end
+
+Every stage declares the post fields it reads. After a run the fingerprints
+of those fields are kept in src/data/blog/pipeline.json, so the next run only
+hands a stage the posts whose inputs changed since then, and every post
+again when the VERSION of the stage's script was bumped. Other edits to a
+script (new flags, other modes) do not rerun its stage.
+
+Usage: python3 scripts/blog_pipeline.py [--stages authors views ...] [--force]
+           [--baseline] [--list]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+from add_post_views import add_views
+from add_random_authors import assign_author
+from blog_store import DEFAULT_STORE_DIR, transaction
+from data_store import dumps, locked, read_json, write_text
+from fix_broken_images import remove_broken_images
+from generate_tags import generate_tags
+from update_traffic_laws_post import extend_traffic_laws_post
+
+STATE_FILE = 'pipeline.json'
+
+# func(post) fixes one post in place and returns True if it changed it;
+# inputs are the post fields its result depends on, and keep(post), when
+# set, tells which posts the stage leaves alone unless run with --force
+Stage = namedtuple('Stage', 'func inputs description keep', defaults=(None,))
+
+
+def has_tags(post):
+    # Tags already on a post are often picked by hand
+    return bool(post.get('tags'))
+
+
+# Run in this order
+STAGES = {
+    'authors': Stage(assign_author, ('id',), 'random author for new posts'),
+    'views': Stage(add_views, ('id',), 'random view count for new posts'),
+    'tags': Stage(generate_tags, ('title', 'excerpt', 'tags'), 'tags for posts without any', has_tags),
+    'broken_images': Stage(remove_broken_images, ('content',), 'remove broken Pixabay images'),
+    'traffic_laws': Stage(extend_traffic_laws_post, ('slug', 'content'),
+                          'extra sections for the 2025 traffic laws post'),
+}
+
+
+def stage_version(stage):
+    """The stage function and the VERSION of its script, so bumping it reruns
+    the stage"""
+    module = sys.modules[stage.func.__module__]
+    return f'{module.__name__}.{stage.func.__name__}:{module.VERSION}'
+
+
+def fingerprint(version, post, inputs):
+    """Hash of a stage's inputs from one post"""
+    values = [version] + [post.get(field) for field in inputs]
+    return hashlib.sha256(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+def state_path(store_dir):
+    return os.path.join(store_dir, STATE_FILE)
+
+
+def run_pipeline(names, store_dir=DEFAULT_STORE_DIR, force=False, baseline=False):
+    """Run the named stages over the store in one transaction
+
+    A stage skips posts whose inputs match the fingerprints of the last run,
+    unless `force`, which also runs stages on the posts their keep() leaves
+    alone. With `baseline` nothing runs and the current posts are
+    recorded as up to date. Returns ({stage: stats}, {'load': s, 'save': s}).
+    """
+    stages = [(name, STAGES[name]) for name in STAGES if name in names]
+    versions = {name: stage_version(stage) for name, stage in stages}
+    content = any('content' in stage.inputs for _, stage in stages)
+    stats = {name: {'posts': 0, 'changed': 0, 'seconds': 0.0} for name, _ in stages}
+    path = state_path(store_dir)
+
+    with locked(store_dir):
+        state = read_json(path) if os.path.exists(path) else {}
+
+        started = time.perf_counter()
+        with transaction(store_dir, content) as blog_data:
+            loaded = time.perf_counter()
+            posts = blog_data['posts']
+
+            for post in posts:
+                if baseline:
+                    break
+                key = str(post['id'])
+                for name, stage in stages:
+                    seen = state.get(name, {}).get(key)
+                    if not force and (seen == fingerprint(versions[name], post, stage.inputs)
+                                      or stage.keep and stage.keep(post)):
+                        continue
+                    stage_started = time.perf_counter()
+                    changed = stage.func(post)
+                    stats[name]['seconds'] += time.perf_counter() - stage_started
+                    stats[name]['posts'] += 1
+                    stats[name]['changed'] += bool(changed)
+
+            finished = time.perf_counter()
+        saved = time.perf_counter()
+
+        # Fingerprint the inputs as this run leaves them
+        for name, stage in stages:
+            state[name] = {str(post['id']): fingerprint(versions[name], post, stage.inputs)
+                           for post in posts}
+        write_text(path, dumps(state))
+
+    return stats, {'load': loaded - started, 'save': saved - finished}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the blog post fixers in one pass over the store')
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--force', action='store_true',
+                        help='run every stage on every post, replacing existing tags')
+    parser.add_argument('--baseline', action='store_true',
+                        help='record the current posts as up to date without running anything')
+    parser.add_argument('--list', action='store_true', help='list the stages and exit')
+    args = parser.parse_args()
+
+    print("=== Blog Post Pipeline ===\n")
+
+    if args.list:
+        for name, stage in STAGES.items():
+            print(f"   {name}: {stage.description} (reads {', '.join(stage.inputs)})")
+        return
+
+    stats, timings = run_pipeline(args.stages, args.store_dir, args.force, args.baseline)
+
+    print(f"📂 Loaded the store in {timings['load']:.3f}s")
+    if args.baseline:
+        print(f"📌 Recorded the current posts as up to date for: {', '.join(stats)}")
+        return
+    for name, result in stats.items():
+        if not result['posts']:
+            print(f"   ⏭️  {name}: up to date")
+            continue
+        print(f"   ⏱️  {name}: {result['posts']} post(s), {result['changed']} changed, "
+              f"{result['seconds']:.3f}s")
+    print(f"💾 Saved the store in {timings['save']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
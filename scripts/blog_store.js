@@ -0,0 +1,177 @@
+// Node version of load_blog_data()/save_blog_data() from blog_store.py, for
+// the asset scripts: same src/data/blog layout, and a save only rewrites the
+// content shards whose posts changed. Change the shard size with the Python CLI.
+
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+
+const STORE_VERSION = 1;
+const STORE_DIR = path.join(__dirname, '../src/data/blog');
+const DERIVED_FIELDS = ['contentHash', 'firstImage'];
+
+// Same entities as ENTITIES in blog_store.py
+const ENTITIES = {
+  amp: '&', lt: '<', gt: '>', quot: '"', apos: "'", nbsp: ' ',
+  lsquo: '\u2018', rsquo: '\u2019', ldquo: '\u201c', rdquo: '\u201d',
+  ndash: '\u2013', mdash: '\u2014', hellip: '\u2026',
+};
+
+const indexPath = (storeDir) => path.join(storeDir, 'index.json');
+const shardPath = (storeDir, shard) => path.join(storeDir, 'content', `${shard}.json`);
+const searchPath = (storeDir) => path.join(storeDir, 'search.json');
+
+function contentHash(content) {
+  return crypto.createHash('sha256').update(content, 'utf8').digest('hex');
+}
+
+function firstImage(content) {
+  const imgMatch = content.match(/<img[^>]+src="([^">]+)"/);
+  return imgMatch ? imgMatch[1] : null;
+}
+
+function decodeEntity(entity, name) {
+  if (name[0] === '#') {
+    const code = /^#x/i.test(name) ? parseInt(name.slice(2), 16) : parseInt(name.slice(1), 10);
+    return code > 0 && code < 0x110000 ? String.fromCodePoint(code) : entity;
+  }
+  return Object.prototype.hasOwnProperty.call(ENTITIES, name) ? ENTITIES[name] : entity;
+}
+
+// search_text() of blog_store.py: the content as lowercase plain text
+function searchText(content) {
+  return content
+    .replace(/<[^>]+>/g, ' ')
+    .replace(/&(#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z]+);/g, decodeEntity)
+    .split(/\s+/)
+    .filter(Boolean)
+    .join(' ')
+    .toLowerCase();
+}
+
+// Same durability as data_store.py: fsync a temporary file, then rename it.
+// Node has no flock, so these scripts do not take the Python scripts' lock.
+function writeJson(file, data) {
+  const tmpFile = `${file}.${process.pid}.tmp`;
+  const fd = fs.openSync(tmpFile, 'w');
+  try {
+    fs.writeSync(fd, JSON.stringify(data, null, 2));
+    fs.fsyncSync(fd);
+  } finally {
+    fs.closeSync(fd);
+  }
+  fs.renameSync(tmpFile, file);
+}
+
+function readIndex(storeDir) {
+  const index = JSON.parse(fs.readFileSync(indexPath(storeDir), 'utf8'));
+  if (index.version !== STORE_VERSION) {
+    throw new Error(`${indexPath(storeDir)} has store version ${index.version}, expected ${STORE_VERSION}`);
+  }
+  return index;
+}
+
+function readShard(storeDir, shard) {
+  const file = shardPath(storeDir, shard);
+  return fs.existsSync(file) ? JSON.parse(fs.readFileSync(file, 'utf8')).posts : {};
+}
+
+function readSearch(storeDir) {
+  const file = searchPath(storeDir);
+  return fs.existsSync(file) ? JSON.parse(fs.readFileSync(file, 'utf8')).posts : {};
+}
+
+// The store in the shape blog_posts.json used to have; pass { content: false }
+// when only metadata is needed
+function loadBlogData({ content = true, storeDir = STORE_DIR } = {}) {
+  const { version, shard_size: shardSize, posts, ...blogData } = readIndex(storeDir);
+  const shards = {};
+
+  blogData.posts = posts.map((meta) => {
+    const post = { ...meta };
+    DERIVED_FIELDS.forEach((field) => delete post[field]);
+    if (content) {
+      const shard = Math.floor(meta.id / shardSize);
+      shards[shard] = shards[shard] || readShard(storeDir, shard);
+      post.content = shards[shard][String(meta.id)] ?? '';
+    }
+    return post;
+  });
+  return blogData;
+}
+
+// Write blog data back; posts without `content` keep their stored content
+function saveBlogData(blogData, { storeDir = STORE_DIR } = {}) {
+  const oldIndex = readIndex(storeDir);
+  const shardSize = oldIndex.shard_size;
+  const oldPosts = new Map(oldIndex.posts.map((meta) => [meta.id, meta]));
+  const updates = new Map();
+  const removals = new Map();
+  const search = {};
+  let oldSearch = null;
+  const shardOf = (id) => Math.floor(id / shardSize);
+
+  const metas = blogData.posts.map((post) => {
+    const { content, ...meta } = post;
+    const oldMeta = oldPosts.get(post.id);
+
+    if (content !== undefined) {
+      meta.contentHash = contentHash(content);
+      meta.firstImage = firstImage(content);
+      if (!oldMeta || oldMeta.contentHash !== meta.contentHash) {
+        const shard = shardOf(post.id);
+        if (!updates.has(shard)) updates.set(shard, {});
+        updates.get(shard)[String(post.id)] = content;
+      }
+      search[String(post.id)] = searchText(content);
+    } else if (!oldMeta) {
+      throw new Error(`Post ${post.id} is new but has no content`);
+    } else {
+      DERIVED_FIELDS.forEach((field) => { meta[field] = oldMeta[field]; });
+      oldSearch = oldSearch || readSearch(storeDir);
+      // Stores written before search.json existed: from the stored content
+      search[String(post.id)] = oldSearch[String(post.id)]
+        ?? searchText(readShard(storeDir, shardOf(post.id))[String(post.id)] ?? '');
+    }
+    return meta;
+  });
+
+  const newIds = new Set(metas.map((meta) => meta.id));
+  oldPosts.forEach((meta, id) => {
+    if (newIds.has(id)) return;
+    const shard = shardOf(id);
+    if (!removals.has(shard)) removals.set(shard, []);
+    removals.get(shard).push(String(id));
+  });
+
+  fs.mkdirSync(path.join(storeDir, 'content'), { recursive: true });
+  let written = 0;
+  new Set([...updates.keys(), ...removals.keys()]).forEach((shard) => {
+    const contents = readShard(storeDir, shard);
+    (removals.get(shard) || []).forEach((id) => { delete contents[id]; });
+    Object.assign(contents, updates.get(shard) || {});
+
+    const file = shardPath(storeDir, shard);
+    if (Object.keys(contents).length > 0) {
+      // Integer-like keys keep ascending order in JS objects, as in the Python writer
+      writeJson(file, { posts: contents });
+    } else if (fs.existsSync(file)) {
+      fs.unlinkSync(file);
+    }
+    written++;
+  });
+
+  const { posts, ...topLevel } = blogData;
+  writeJson(indexPath(storeDir), {
+    version: STORE_VERSION,
+    shard_size: shardSize,
+    ...topLevel,
+    total_posts: metas.length,
+    posts: metas,
+  });
+  // Integer-like keys come out in ascending order, as the Python writer sorts them
+  writeJson(searchPath(storeDir), { posts: search });
+  return written;
+}
+
+module.exports = { STORE_DIR, loadBlogData, saveBlogData };
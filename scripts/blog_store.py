@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Sharded blog post store
+Keeps the blog posts as a compact index (every field but the HTML content)
+plus content shards, so listing pages and metadata fixers never touch the
+post bodies, and a save only rewrites the shards whose content changed
+
+Layout of src/data/blog/:
+    index.json          top-level fields and one entry per post without
+                        'content', plus its contentHash and firstImage
+    content/<n>.json    {"posts": {"<id>": "<html>", ...}} for the posts
+                        with id // shard_size == n
+    search.json         {"posts": {"<id>": "<text>", ...}}: each post's
+                        content as lowercase plain text, which the blog
+                        list fetches once a search is typed
+
+Usage: python3 scripts/blog_store.py export blog_posts.json [--shard-size 1]
+       python3 scripts/blog_store.py build [--to blog_posts.json]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import os
+import re
+from collections import defaultdict
+
+from data_store import dumps, locked, read_json, write_text
+
+# Bump when the index or shard layout changes
+STORE_VERSION = 1
+
+DEFAULT_STORE_DIR = 'src/data/blog'
+INDEX_FILE = 'index.json'
+CONTENT_DIR = 'content'
+SEARCH_FILE = 'search.json'
+
+# Posts per content shard; 1 gives one file per post
+DEFAULT_SHARD_SIZE = 1
+
+# Stored in the index, derived from the content on save
+DERIVED_FIELDS = ('contentHash', 'firstImage')
+
+IMG_SRC_RE = re.compile(r'<img[^>]+src="([^">]+)"')
+
+# The entities search_text() decodes; blog_store.js decodes the same ones, so
+# both writers store the same text
+ENTITY_RE = re.compile(r'&(#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z]+);')
+ENTITIES = {
+    'amp': '&', 'lt': '<', 'gt': '>', 'quot': '"', 'apos': "'", 'nbsp': ' ',
+    'lsquo': '\u2018', 'rsquo': '\u2019', 'ldquo': '\u201c', 'rdquo': '\u201d',
+    'ndash': '\u2013', 'mdash': '\u2014', 'hellip': '\u2026',
+}
+
+
+def content_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def first_image(content):
+    """src of the first <img> in the HTML, for post cards that link to a post"""
+    m = IMG_SRC_RE.search(content)
+    return m.group(1) if m else None
+
+
+def _entity(m):
+    name = m.group(1)
+    if name[0] == '#':
+        code = int(name[2:], 16) if name[1] in 'xX' else int(name[1:])
+        return chr(code) if 0 < code < 0x110000 else m.group(0)
+    return ENTITIES.get(name, m.group(0))
+
+
+def search_text(content):
+    """The HTML as lowercase plain text with single spaces, for search"""
+    text = ENTITY_RE.sub(_entity, re.sub(r'<[^>]+>', ' ', content))
+    return ' '.join(text.split()).lower()
+
+
+def shard_of(post_id, shard_size):
+    return int(post_id) // shard_size
+
+
+def index_path(store_dir):
+    return os.path.join(store_dir, INDEX_FILE)
+
+
+def shard_path(store_dir, shard):
+    return os.path.join(store_dir, CONTENT_DIR, f'{shard}.json')
+
+
+def search_path(store_dir):
+    return os.path.join(store_dir, SEARCH_FILE)
+
+
+def _read_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def read_index(store_dir=DEFAULT_STORE_DIR):
+    """The store's index, or None when the store does not exist yet"""
+    path = index_path(store_dir)
+    if not os.path.exists(path):
+        return None
+    index = read_json(path)
+    if index.get('version') != STORE_VERSION:
+        raise ValueError(f"{path} has store version {index.get('version')}, expected {STORE_VERSION}")
+    return index
+
+
+def read_shard(store_dir, shard):
+    path = shard_path(store_dir, shard)
+    if not os.path.exists(path):
+        return {}
+    return read_json(path)['posts']
+
+
+def read_search(store_dir=DEFAULT_STORE_DIR):
+    """{"<id>": search text} of the stored posts; empty before the first save"""
+    path = search_path(store_dir)
+    if not os.path.exists(path):
+        return {}
+    return read_json(path)['posts']
+
+
+def _write_if_changed(path, text):
+    if not os.path.exists(path) or _read_text(path) != text:
+        write_text(path, text)
+
+
+class BlogStore:
+    """Read access to the store: the index up front, post content on demand
+
+    Shards are read the first time one of their posts' content is asked
+    for and then kept, so reading a handful of posts costs a handful of
+    small files however many posts there are.
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        self.index = read_index(store_dir)
+        if self.index is None:
+            raise FileNotFoundError(index_path(store_dir))
+        self.shard_size = self.index['shard_size']
+        self.posts = self.index['posts']
+        self._shards = {}
+
+    def _shard(self, post_id):
+        shard = shard_of(post_id, self.shard_size)
+        if shard not in self._shards:
+            self._shards[shard] = read_shard(self.store_dir, shard)
+        return self._shards[shard]
+
+    def content(self, post_id):
+        """HTML content of a post, or None if the store has none for it"""
+        return self._shard(post_id).get(str(post_id))
+
+    def get_post(self, post_id):
+        """The post with this ID including its content, or None"""
+        for meta in self.posts:
+            if meta['id'] == post_id:
+                return dict(meta, content=self.content(post_id))
+        return None
+
+    def get_post_by_slug(self, slug):
+        """The post with this slug including its content, or None"""
+        for meta in self.posts:
+            if meta['slug'] == slug:
+                return dict(meta, content=self.content(meta['id']))
+        return None
+
+
+def load_blog_data(store_dir=DEFAULT_STORE_DIR, content=True):
+    """Load the store in the shape blog_posts.json used to have
+
+    Returns the index's top-level fields with 'posts' holding one dict per
+    post. Scripts that only change metadata should pass content=False: the
+    posts then have no 'content' key and save_blog_data() leaves their
+    shards alone.
+    """
+    with locked(store_dir):
+        store = BlogStore(store_dir)
+        blog_data = {key: value for key, value in store.index.items()
+                     if key not in ('version', 'shard_size')}
+        posts = []
+        for meta in store.posts:
+            post = {key: value for key, value in meta.items() if key not in DERIVED_FIELDS}
+            if content:
+                post['content'] = store.content(meta['id']) or ''
+            posts.append(post)
+        blog_data['posts'] = posts
+        return blog_data
+
+
+def save_blog_data(blog_data, store_dir=DEFAULT_STORE_DIR, shard_size=None):
+    """Write blog data (as returned by load_blog_data()) back to the store
+
+    The index is always rewritten; a content shard only when one of its
+    posts was added, removed or has content whose hash differs from the one
+    in the index. Posts without a 'content' key keep their stored content.
+    Returns the number of shards written or removed.
+    """
+    with locked(store_dir):
+        return _save(blog_data, store_dir, shard_size)
+
+
+def _save(blog_data, store_dir, shard_size):
+    old_index = read_index(store_dir) or {}
+    old_posts = {meta['id']: meta for meta in old_index.get('posts', [])}
+    shard_size = shard_size or old_index.get('shard_size') or DEFAULT_SHARD_SIZE
+    resharding = bool(old_index) and shard_size != old_index['shard_size']
+
+    updates = defaultdict(dict)
+    metas = []
+    search = {}
+    old_search = None
+    for post in blog_data['posts']:
+        post_id = post['id']
+        old_meta = old_posts.get(post_id)
+        meta = {key: value for key, value in post.items() if key != 'content'}
+
+        if 'content' in post:
+            html = post['content']
+            meta['contentHash'] = content_hash(html)
+            meta['firstImage'] = first_image(html)
+            if resharding or old_meta is None or old_meta.get('contentHash') != meta['contentHash']:
+                updates[shard_of(post_id, shard_size)][str(post_id)] = html
+            search[str(post_id)] = search_text(html)
+        elif old_meta is None:
+            raise ValueError(f"Post {post_id} is new but has no content")
+        elif resharding:
+            raise ValueError("Changing the shard size needs every post's content")
+        else:
+            for field in DERIVED_FIELDS:
+                meta[field] = old_meta.get(field)
+            if old_search is None:
+                old_search = read_search(store_dir)
+            text = old_search.get(str(post_id))
+            if text is None:
+                # Stores written before search.json existed
+                shard = read_shard(store_dir, shard_of(post_id, shard_size))
+                text = search_text(shard.get(str(post_id), ''))
+            search[str(post_id)] = text
+        metas.append(meta)
+
+    # Drop the content of posts that are gone, and of every old shard when resharding
+    new_ids = {meta['id'] for meta in metas}
+    removals = defaultdict(set)
+    for post_id in old_posts:
+        if resharding or post_id not in new_ids:
+            removals[shard_of(post_id, old_index['shard_size'])].add(str(post_id))
+
+    os.makedirs(os.path.join(store_dir, CONTENT_DIR), exist_ok=True)
+    written = 0
+    for shard in sorted(set(updates) | set(removals)):
+        contents = {} if resharding else read_shard(store_dir, shard)
+        for post_id in removals.get(shard, ()):
+            contents.pop(post_id, None)
+        contents.update(updates.get(shard, {}))
+
+        path = shard_path(store_dir, shard)
+        if contents:
+            write_text(path, dumps({'posts': dict(sorted(contents.items(), key=lambda item: int(item[0])))}))
+        elif os.path.exists(path):
+            os.remove(path)
+        written += 1
+
+    index = {'version': STORE_VERSION, 'shard_size': shard_size}
+    index.update((key, value) for key, value in blog_data.items() if key != 'posts')
+    index['total_posts'] = len(metas)
+    index['posts'] = metas
+    # Skip the writes when nothing in the index or search text changed either
+    _write_if_changed(index_path(store_dir), dumps(index))
+    _write_if_changed(search_path(store_dir),
+                      dumps({'posts': dict(sorted(search.items(), key=lambda item: int(item[0])))}))
+    return written
+
+
+@contextlib.contextmanager
+def transaction(store_dir=DEFAULT_STORE_DIR, content=True):
+    """Load, modify and save the store under its lock
+
+        with transaction(content=False) as blog_data:
+            for post in blog_data['posts']:
+                post['views'] = 0
+
+    Other scripts wait until the block is done, so none of them can save
+    over these changes, and everything done inside costs one load and one
+    save. Nothing is written if the block raises.
+    """
+    with locked(store_dir):
+        blog_data = load_blog_data(store_dir, content)
+        yield blog_data
+        save_blog_data(blog_data, store_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain the sharded blog post store')
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help='write the store from a blog_posts.json file')
+    export.add_argument('posts_file', help='a blog_posts.json-style file')
+    export.add_argument('--shard-size', type=int, help=f'posts per content shard (default {DEFAULT_SHARD_SIZE})')
+
+    build = commands.add_parser('build', help='write a single blog_posts.json file from the store')
+    build.add_argument('--to', dest='posts_file', default='blog_posts.json')
+
+    args = parser.parse_args()
+
+    print("=== Blog Post Store ===\n")
+
+    if args.command == 'export':
+        blog_data = read_json(args.posts_file)
+        written = save_blog_data(blog_data, args.store_dir, args.shard_size)
+        print(f"📂 Read {len(blog_data['posts'])} posts from {args.posts_file}")
+        print(f"💾 Wrote {written} content shard(s) and the index to {args.store_dir}")
+    else:
+        blog_data = load_blog_data(args.store_dir)
+        write_text(args.posts_file, dumps(blog_data))
+        print(f"💾 Wrote {len(blog_data['posts'])} posts to {args.posts_file}")
+
+
+if __name__ == "__main__":
+    main()
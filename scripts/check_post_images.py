@@ -1,21 +1,59 @@
 #!/usr/bin/env python3
-import json
-import re
-
-data = json.load(open('src/data/blog_posts.json'))
-post = next((p for p in data['posts'] if p['slug'] == 'safe-driving-tips-for-novice-drivers'), None)
-
-if post:
-    print('Title:', post['title'])
-    print('ID:', post['id'])
-    print('\nChecking images in content...')
-
-    img_tags = re.findall(r'<img[^>]*src="([^"]+)"[^>]*>', post['content'])
-    print(f'\nFound {len(img_tags)} images:')
-    for i, img in enumerate(img_tags, 1):
-        print(f'{i}. {img}')
-
-    print('\n--- Full content preview (first 1000 chars) ---')
-    print(post['content'][:1000])
-else:
-    print('Post not found')
+"""
+List the images in a blog post, or count them per host across all posts
+"""
+
+import argparse
+from collections import Counter
+from urllib.parse import urlsplit
+
+from blog_store import BlogStore
+from html_sanitizer import CollectImages, Sanitizer
+
+def check_post(store, slug):
+    post = store.get_post_by_slug(slug)
+
+    if post:
+        print('Title:', post['title'])
+        print('ID:', post['id'])
+        print('\nChecking images in content...')
+
+        images = CollectImages('images')
+        Sanitizer([images]).rewrite(post['content'], post['id'])
+        print(f'\nFound {len(images.images)} images:')
+        for i, (_, src, _) in enumerate(images.images, 1):
+            print(f'{i}. {src}')
+
+        print('\n--- Full content preview (first 1000 chars) ---')
+        print(post['content'][:1000])
+    else:
+        print('Post not found')
+
+def check_all(store):
+    images = CollectImages('images')
+    sanitizer = Sanitizer([images])
+    for meta in store.posts:
+        sanitizer.rewrite(store.content(meta['id']) or '', meta['id'])
+
+    hosts = Counter(urlsplit(src or '').netloc or '(local)' for _, src, _ in images.images)
+    with_images = {post_id for post_id, _, _ in images.images}
+    print(f'Found {len(images.images)} images in {len(with_images)} of {len(store.posts)} posts '
+          f'({sanitizer.seconds:.3f}s)')
+    print('\n📊 Images per host:')
+    for host, count in hosts.most_common():
+        print(f'   {host}: {count}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the images in the blog posts')
+    parser.add_argument('slug', nargs='?', default='safe-driving-tips-for-novice-drivers')
+    parser.add_argument('--all', action='store_true', help='count images per host across all posts')
+    args = parser.parse_args()
+
+    store = BlogStore()
+    if args.all:
+        check_all(store)
+    else:
+        check_post(store, args.slug)
+
+if __name__ == "__main__":
+    main()
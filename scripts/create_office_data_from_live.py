@@ -5,7 +5,7 @@ Since WordPress extraction is complex, we'll generate basic structure
 and fetch details as needed
 """
 
-import json
+from data_store import write_json
 
 # Office data from the live site
 offices_data = [
@@ -210,8 +210,7 @@ output = {
     'offices': offices
 }
 
-with open('src/data/dmv_offices.json', 'w', encoding='utf-8') as f:
-    json.dump(output, f, indent=2, ensure_ascii=False)
+write_json('src/data/dmv_offices.json', output)
 
 print(f"✅ Created data for {len(offices)} DMV offices")
 print(f"💾 Saved to: src/data/dmv_offices.json")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Safe access to the JSON files under src/data
+Reads and writes go through an exclusive lock file next to the data, and
+writes land in a temporary file that is fsynced and renamed over the
+original, so two scripts run at once cannot lose each other's updates and a
+crash never leaves a truncated file behind
+"""
+
+import contextlib
+import json
+import os
+import sys
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Lock files held by this process: {lock path: [fd, depth]}
+_held = {}
+
+
+def lock_path(path):
+    return path + '.lock'
+
+
+def _lock(fd, blocking):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def locked(path):
+    """Hold the exclusive lock for `path` (a file or directory) while inside
+
+    The lock is re-entrant within a process, so a function that locks can
+    call another one that locks the same path.
+    """
+    key = os.path.abspath(lock_path(path))
+    if key in _held:
+        _held[key][1] += 1
+        try:
+            yield
+        finally:
+            _held[key][1] -= 1
+        return
+
+    fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            _lock(fd, blocking=False)
+        except OSError:
+            print(f"⏳ Waiting for another script to release {path}...", file=sys.stderr)
+            _lock(fd, blocking=True)
+        _held[key] = [fd, 1]
+        try:
+            yield
+        finally:
+            del _held[key]
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path):
+    """Make a rename in this directory durable (not possible on Windows)"""
+    try:
+        fd = os.open(path or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dumps(data):
+    """The layout every script writes: two-space indent, UTF-8 kept as is"""
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def write_text(path, text):
+    """Replace `path` with `text` atomically and durably"""
+    tmp_file = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    _fsync_dir(os.path.dirname(path))
+
+
+def write_json(path, data):
+    """Atomically replace a JSON file, under its lock"""
+    with locked(path):
+        write_text(path, dumps(data))
+
+
+@contextlib.contextmanager
+def transaction(path):
+    """Read-modify-write a JSON file under its lock
+
+        with transaction('src/data/dmv_offices.json') as data:
+            data['offices'].append(office)
+
+    The file is loaded once and written once when the block exits
+    normally, and only if the data changed; an exception leaves it as it
+    was. Any number of updates can be made inside one block.
+    """
+    with locked(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            original = f.read()
+        data = json.loads(original)
+        yield data
+        text = dumps(data)
+        if text != original:
+            write_text(path, text)
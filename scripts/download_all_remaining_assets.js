@@ -3,8 +3,10 @@ const path = require('path');
 const https = require('https');
 const http = require('http');
 
-const blogPostsPath = path.join(__dirname, '../src/data/blog_posts.json');
-let blogContent = fs.readFileSync(blogPostsPath, 'utf8');
+const { loadBlogData, saveBlogData } = require('./blog_store');
+
+// URLs are replaced in the JSON text of the posts
+let blogContent = JSON.stringify(loadBlogData(), null, 2);
 
 // Create directories
 const imagesDir = path.join(__dirname, '../public/images/blog');
@@ -114,8 +116,8 @@ async function main() {
   console.log(`   Already existed: ${alreadyExists}`);
   console.log(`   Failed: ${failed}`);
 
-  // Update blog_posts.json
-  console.log(`\n🔄 Updating blog_posts.json...`);
+  // Update the blog posts
+  console.log(`\n🔄 Updating blog posts...`);
 
   let updatedContent = blogContent;
   Object.keys(mapping).forEach(oldUrl => {
@@ -126,8 +128,8 @@ async function main() {
     updatedContent = updatedContent.replace(new RegExp(escaped, 'g'), newUrl);
   });
 
-  fs.writeFileSync(blogPostsPath, updatedContent);
-  console.log('✓ Updated blog_posts.json');
+  saveBlogData(JSON.parse(updatedContent));
+  console.log('✓ Updated blog post store');
 
   // Verify
   const remaining = (updatedContent.match(/www\.dmvcalifornia\.us\/wp-content/g) || []).length;
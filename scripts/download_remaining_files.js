@@ -3,8 +3,9 @@ const path = require('path');
 const https = require('https');
 const http = require('http');
 
-const blogPostsPath = path.join(__dirname, '../src/data/blog_posts.json');
-const blogData = JSON.parse(fs.readFileSync(blogPostsPath, 'utf8'));
+const { loadBlogData, saveBlogData } = require('./blog_store');
+
+const blogData = loadBlogData();
 
 // Create directories if they don't exist
 const imagesDir = path.join(__dirname, '../public/images/blog');
@@ -132,9 +133,9 @@ function updateBlogPosts(mapping) {
 
   console.log(`\nUpdated ${updatedCount} blog posts`);
 
-  // Save updated blog_posts.json
-  fs.writeFileSync(blogPostsPath, JSON.stringify(blogData, null, 2));
-  console.log('Saved updated blog_posts.json');
+  // Save updated posts
+  saveBlogData(blogData);
+  console.log('Saved updated blog post store');
 
   // Save mapping file for reference
   const mappingPath = path.join(__dirname, 'remaining_files_mapping.json');
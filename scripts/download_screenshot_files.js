@@ -2,8 +2,9 @@ const fs = require('fs');
 const path = require('path');
 const https = require('https');
 
-const blogPostsPath = path.join(__dirname, '../src/data/blog_posts.json');
-const blogData = JSON.parse(fs.readFileSync(blogPostsPath, 'utf8'));
+const { loadBlogData, saveBlogData } = require('./blog_store');
+
+const blogData = loadBlogData();
 
 // Create directory if it doesn't exist
 const imagesDir = path.join(__dirname, '../public/images/blog');
@@ -60,7 +61,7 @@ async function main() {
   }
 
   // Now update all references in blog posts
-  let content = fs.readFileSync(blogPostsPath, 'utf8');
+  let content = JSON.stringify(loadBlogData(), null, 2);
 
   // Replace all variations of the screenshot URLs
   const replacements = [
@@ -78,8 +79,8 @@ async function main() {
     content = content.replace(old, newUrl);
   });
 
-  fs.writeFileSync(blogPostsPath, content);
-  console.log('\n✓ Updated blog_posts.json');
+  saveBlogData(JSON.parse(content));
+  console.log('\n✓ Updated blog post store');
   console.log('✓ Migration completed!');
 }
 
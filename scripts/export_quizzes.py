@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Quiz export for lazy loading
+Splits the quiz files the site serves into one small JSON file per quiz
+plus a manifest with what listing pages need (id, title, slug, questionCount,
+passingScore, ...). src/lib/quizzes.ts reads the manifest and imports a
+quiz's file only when that quiz is rendered or requested. With
+--packed it also writes every quiz into one columnar file whose strings
+(answers, explanations, categories repeated across quizzes) are stored
+once and referenced by index.
+
+The output only depends on the input files: keys keep their order, the
+string table is in order of first use and the files are written compactly,
+so exporting twice gives identical bytes.
+
+Rerun it after editing any of the quiz files.
+
+Usage: python3 scripts/export_quizzes.py [FILE ...] [--out-dir src/data/quizzes]
+           [--packed]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+from data_store import read_json, write_text
+from quiz_bank import load_quizzes
+
+# The quiz files the site imports
+DEFAULT_QUIZ_FILES = [
+    'src/data/quizzes.json',
+    'src/data/turkish-quizzes.json',
+    'src/data/spanish-sign-test.json',
+    'src/data/turkish-sign-test.json',
+    'src/data/chinese-quizzes.json',
+]
+DEFAULT_OUT_DIR = 'src/data/quizzes'
+MANIFEST_FILE = 'manifest.json'
+PACKED_FILE = 'quizzes.packed.json'
+
+# Bump when the packed layout changes
+PACKED_VERSION = 1
+
+# Quiz fields copied into the manifest, when the quiz has them
+MANIFEST_FIELDS = ('id', 'title', 'description', 'slug', 'category', 'language',
+                   'passingScore', 'timeLimit')
+
+
+def compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def quiz_file(quiz):
+    return f"{quiz['id']}.json"
+
+
+def manifest_entry(quiz, text, source):
+    entry = {field: quiz[field] for field in MANIFEST_FIELDS if field in quiz}
+    entry['questionCount'] = len(quiz['questions'])
+    entry['file'] = quiz_file(quiz)
+    # Pages pick their quizzes by the file they used to import
+    entry['source'] = os.path.basename(source)
+    # Changes with the file's content, for cache busting (?v=...)
+    entry['hash'] = hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+    return entry
+
+
+class _Strings:
+    """String table in order of first use"""
+
+    def __init__(self):
+        self.index = {}
+        self.table = []
+
+    def intern(self, value):
+        if value not in self.index:
+            self.index[value] = len(self.table)
+            self.table.append(value)
+        return self.index[value]
+
+
+def pack_questions(questions, strings):
+    """Questions as columns: {field: [value per question]}
+
+    Fields that only ever hold strings (or lists of strings, like options)
+    are stored as string table indexes and named in 'interned'; a question
+    without a field has null in its column.
+    """
+    fields = []
+    for question in questions:
+        for field in question:
+            if field not in fields:
+                fields.append(field)
+
+    def is_text(value):
+        return isinstance(value, str) or (isinstance(value, list)
+                                          and all(isinstance(item, str) for item in value))
+
+    columns = {}
+    interned = []
+    for field in fields:
+        values = [question.get(field) for question in questions]
+        if all(value is None or is_text(value) for value in values):
+            interned.append(field)
+            values = [None if value is None
+                      else strings.intern(value) if isinstance(value, str)
+                      else [strings.intern(item) for item in value]
+                      for value in values]
+        columns[field] = values
+    return {'count': len(questions), 'interned': interned, 'columns': columns}
+
+
+def pack(quizzes):
+    """Every quiz in the packed layout; unpack() restores them"""
+    strings = _Strings()
+    packed = []
+    for quiz in quizzes:
+        entry = {key: value for key, value in quiz.items() if key != 'questions'}
+        entry['questions'] = pack_questions(quiz['questions'], strings)
+        packed.append(entry)
+    return {'version': PACKED_VERSION, 'strings': strings.table, 'quizzes': packed}
+
+
+def unpack(packed):
+    """The quizzes of a packed export, as the quiz files hold them"""
+    strings = packed['strings']
+    quizzes = []
+    for entry in packed['quizzes']:
+        block = entry['questions']
+        questions = [{} for _ in range(block['count'])]
+        interned = set(block['interned'])
+        for field, values in block['columns'].items():
+            for question, value in zip(questions, values):
+                if value is None:
+                    continue
+                if field in interned:
+                    value = strings[value] if isinstance(value, int) else [strings[i] for i in value]
+                question[field] = value
+        quiz = {key: value for key, value in entry.items() if key != 'questions'}
+        quiz['questions'] = questions
+        quizzes.append(quiz)
+    return quizzes
+
+
+def export_quizzes(paths, out_dir=DEFAULT_OUT_DIR, packed=False):
+    """Write the per-quiz files, the manifest and optionally the packed file
+
+    Per-quiz files the previous manifest listed for quizzes that no longer
+    exist are removed.
+    Returns {file name: size in bytes} of what was written.
+    """
+    quizzes = []
+    sources = []
+    seen = {}
+    for path in paths:
+        for quiz in load_quizzes(path):
+            if quiz['id'] in seen:
+                raise ValueError(f"quiz id {quiz['id']!r} is in both {seen[quiz['id']]} and {path}")
+            seen[quiz['id']] = path
+            quizzes.append(quiz)
+            sources.append(path)
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    previous = read_json(manifest_path)['quizzes'] if os.path.exists(manifest_path) else []
+    written = {}
+
+    def write(name, text):
+        write_text(os.path.join(out_dir, name), text)
+        written[name] = len(text.encode('utf-8'))
+
+    manifest = []
+    for quiz, source in zip(quizzes, sources):
+        text = compact(quiz)
+        write(quiz_file(quiz), text)
+        manifest.append(manifest_entry(quiz, text, source))
+    write(MANIFEST_FILE, compact({'quizzes': manifest}))
+
+    packed_path = os.path.join(out_dir, PACKED_FILE)
+    if packed:
+        data = pack(quizzes)
+        if unpack(data) != quizzes:
+            raise AssertionError('packed export does not round-trip')
+        write(PACKED_FILE, compact(data))
+    elif os.path.exists(packed_path):
+        os.remove(packed_path)
+
+    for entry in previous:
+        path = os.path.join(out_dir, entry['file'])
+        if entry['file'] not in written and os.path.exists(path):
+            os.remove(path)
+            print(f"🗑️  Removed stale {path}")
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the quizzes as per-quiz files plus a manifest')
+    parser.add_argument('files', nargs='*', help='quiz files (default: the ones the site imports)')
+    parser.add_argument('--out-dir', default=DEFAULT_OUT_DIR)
+    parser.add_argument('--packed', action='store_true',
+                        help=f'also write {PACKED_FILE} with interned strings')
+    args = parser.parse_args()
+
+    print("=== Quiz Export ===\n")
+
+    paths = args.files or DEFAULT_QUIZ_FILES
+    written = export_quizzes(paths, args.out_dir, args.packed)
+
+    sources = sum(os.path.getsize(path) for path in paths)
+    quiz_sizes = [size for name, size in written.items() if name not in (MANIFEST_FILE, PACKED_FILE)]
+    print(f"📦 {len(quiz_sizes)} quiz files in {args.out_dir}")
+    print(f"   largest {max(quiz_sizes) / 1024:.1f} KB, median "
+          f"{sorted(quiz_sizes)[len(quiz_sizes) // 2] / 1024:.1f} KB "
+          f"(the source files hold {sources / 1024:.0f} KB)")
+    print(f"   {MANIFEST_FILE}: {written[MANIFEST_FILE] / 1024:.1f} KB")
+    if PACKED_FILE in written:
+        with open(os.path.join(args.out_dir, PACKED_FILE), 'rb') as f:
+            gzipped = len(gzip.compress(f.read(), mtime=0))
+        print(f"   {PACKED_FILE}: {written[PACKED_FILE] / 1024:.1f} KB "
+              f"({gzipped / 1024:.1f} KB gzipped), all quizzes")
+
+
+if __name__ == "__main__":
+    main()
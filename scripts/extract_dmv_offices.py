@@ -3,8 +3,8 @@
 Extract all DMV office pages from WordPress database
 """
 
-import json
-import re
+from data_store import write_json
+from wp_cache import open_cache, get_post_by_slug
 
 # Known office slugs from the live website
 OFFICE_SLUGS = [
@@ -48,45 +48,33 @@ OFFICE_SLUGS = [
     "willows-dmv", "winnetka-dmv", "woodland-dmv", "yreka-dmv", "yuba-city-dmv"
 ]
 
-def extract_post(sql_file, slug):
-    """Extract a specific post by slug from SQL"""
-    with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            # Look for the slug in post_name field (field 12)
-            if f"'{slug}'" in line and "INSERT INTO `wp_posts`" in line:
-                # Try to find the record
-                records = re.findall(
-                    r"\((\d+),[^,]*,[^,]*,[^,]*,'([^']*)'[^,]*,'([^']*)'[^,]*(,(?:[^']*'[^']*')*)[^,]*'(publish|draft)'[^,]*'([^']*)'",
-                    line
-                )
+def extract_post(conn, slug):
+    """Look up a published post by slug in the dump cache"""
+    post = get_post_by_slug(conn, slug)
+    if not post:
+        return None
 
-                for record in records:
-                    post_id, title, post_content, _, status, post_name = record[:6]
+    # Normalize line endings
+    post_content = post['post_content'].replace("\r\n", "\n")
 
-                    if post_name == slug and status == 'publish':
-                        # Unescape content
-                        post_content = post_content.replace("\\'", "'").replace('\\"', '"')
-                        post_content = post_content.replace("\\r\\n", "\n").replace("\\n", "\n")
-                        post_content = post_content.replace("\\t", "\t")
-
-                        return {
-                            'id': int(post_id),
-                            'title': title.replace("\\'", "'").replace('\\"', '"'),
-                            'slug': post_name,
-                            'content': post_content
-                        }
-
-    return None
+    return {
+        'id': post['ID'],
+        'title': post['post_title'],
+        'slug': post['post_name'],
+        'content': post_content
+    }
 
 print("=== Extracting DMV Office Pages ===\n")
 print(f"Searching for {len(OFFICE_SLUGS)} office pages...\n")
 
+conn = open_cache('data/wordpress/dmvcali2.sql')
+
 offices = []
 found_count = 0
 not_found = []
 
 for slug in OFFICE_SLUGS:
-    office = extract_post('data/wordpress/dmvcali2.sql', slug)
+    office = extract_post(conn, slug)
 
     if office:
         offices.append(office)
@@ -103,8 +91,7 @@ output = {
     'offices': offices
 }
 
-with open('src/data/dmv_offices.json', 'w', encoding='utf-8') as f:
-    json.dump(output, f, indent=2, ensure_ascii=False)
+write_json('src/data/dmv_offices.json', output)
 
 print(f"\n✅ Extracted {found_count} out of {len(OFFICE_SLUGS)} DMV office pages")
 print(f"💾 Saved to: src/data/dmv_offices.json")
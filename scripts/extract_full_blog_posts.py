@@ -6,8 +6,32 @@ Extract complete blog posts from WordPress database with full content and images
 import re
 import json
 import html
+import mmap
+import hashlib
+import argparse
 from datetime import datetime
 
+from blog_store import load_blog_data
+from extract_image_urls import IMAGE_COLUMNS, IMAGE_META_KEYS, FeaturedImages
+from wp_checkpoint import DEFAULT_INTERVAL, Checkpoint, run_rows
+from wp_dump import iter_row_spans_parallel, parse_row_at, row_dict
+
+# wp_posts fields a blog post is built from; sourceHash covers exactly these
+SOURCE_FIELDS = (
+    'post_author', 'post_date', 'post_content', 'post_title', 'post_excerpt', 'post_name'
+)
+
+POST_COLUMNS = {'ID', 'post_status', 'post_modified_gmt'} | set(SOURCE_FIELDS) | IMAGE_COLUMNS
+
+# What the incremental pass reads for every post: no content, title or excerpt
+CHANGE_COLUMNS = {'ID', 'post_status', 'post_name', 'post_modified_gmt'} | IMAGE_COLUMNS
+
+POST_FILTER = {
+    'post_status': {'publish', 'inherit'},
+    'post_type': {'post', 'attachment'},
+    'meta_key': IMAGE_META_KEYS,
+}
+
 def clean_html_for_excerpt(text):
     """Remove HTML tags and clean text for excerpt"""
     text = re.sub(r'<[^>]+>', '', text)
@@ -15,158 +39,200 @@ def clean_html_for_excerpt(text):
     text = ' '.join(text.split())
     return text
 
-def extract_posts_from_sql(sql_content):
-    """Extract complete published posts from wp_posts"""
-    posts = []
-
-    # Find the wp_posts INSERT section
-    posts_pattern = r"INSERT INTO `wp_posts`.*?VALUES\s*(.*?)(?=\n(?:--|CREATE|INSERT INTO `(?!wp_posts)))"
-    match = re.search(posts_pattern, sql_content, re.DOTALL | re.IGNORECASE)
-
-    if not match:
-        print("Could not find wp_posts section")
-        return posts
-
-    values_section = match.group(1)
-
-    # Split by record boundaries - find opening parenthesis at start of line or after comma
-    # Each record is like: (ID, author, date, date_gmt, content, title, ...)
-    records = re.split(r'\),\s*\(', values_section)
-
-    print(f"Found {len(records)} total records in wp_posts")
-
-    for i, record in enumerate(records):
-        try:
-            # Clean up the record
-            record = record.strip().lstrip('(').rstrip(')')
-
-            # Skip if too short
-            if len(record) < 100:
-                continue
-
-            # Check if this is a published post
-            if "'publish'" not in record or "'post'" not in record:
-                continue
-
-            # Extract ID (first field)
-            id_match = re.match(r'(\d+),', record)
-            if not id_match:
-                continue
-            post_id = int(id_match.group(1))
-
-            # Split by fields more carefully - need to handle escaped quotes
-            # WordPress structure: ID, author, date, date_gmt, content, title, excerpt, status, ...
-
-            # Extract key fields using more robust pattern
-            # Field positions in wp_posts:
-            # 0: ID, 1: post_author, 2: post_date, 3: post_date_gmt, 4: post_content, 5: post_title
-
-            parts = []
-            current = ""
-            in_quotes = False
-            escape_next = False
-
-            for char in record:
-                if escape_next:
-                    current += char
-                    escape_next = False
-                    continue
-
-                if char == '\\':
-                    current += char
-                    escape_next = True
-                    continue
-
-                if char == "'" and not escape_next:
-                    in_quotes = not in_quotes
-                    current += char
-                    continue
-
-                if char == ',' and not in_quotes:
-                    parts.append(current.strip())
-                    current = ""
-                    continue
-
-                current += char
-
-            if current:
-                parts.append(current.strip())
-
-            if len(parts) < 20:  # wp_posts has about 23 fields
-                continue
-
-            # Extract fields
-            post_author = parts[1].strip("'")
-            post_date = parts[2].strip("'")
-            post_content = parts[4].strip("'")
-            post_title = parts[5].strip("'")
-            post_excerpt = parts[6].strip("'") if len(parts) > 6 else ""
-            post_name = parts[12].strip("'") if len(parts) > 12 else f"post-{post_id}"  # slug
-
-            # Skip WordPress revisions and autosaves
-            if 'revision' in post_name.lower() or 'autosave' in post_name.lower():
-                continue
-
-            # Unescape content
-            post_content = post_content.replace("\\'", "'").replace('\\"', '"')
-            post_content = post_content.replace("\\r\\n", "\n").replace("\\n", "\n")
-            post_content = post_content.replace("\\t", "\t")
-
-            # Unescape title
-            post_title = post_title.replace("\\'", "'").replace('\\"', '"')
-
-            # Generate excerpt if empty
-            if not post_excerpt:
-                post_excerpt = clean_html_for_excerpt(post_content)[:200] + "..."
-            else:
-                post_excerpt = post_excerpt.replace("\\'", "'").replace('\\"', '"')
-
-            post_data = {
-                'id': post_id,
-                'title': post_title,
-                'slug': post_name,
-                'content': post_content,  # FULL CONTENT
-                'excerpt': post_excerpt,
-                'publishedAt': post_date,
-                'author': post_author
-            }
-
-            posts.append(post_data)
-            print(f"✓ [{len(posts)}] {post_title[:60]} ({len(post_content)} chars)")
-
-        except Exception as e:
-            # Silently continue - some records may be malformed
+def source_hash(post):
+    """Hash of the wp_posts fields a blog post is built from"""
+    digest = hashlib.sha256()
+    for field in SOURCE_FIELDS:
+        digest.update((post[field] or '').encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def is_revision(post):
+    """WordPress revisions and autosaves"""
+    post_name = (post['post_name'] or '').lower()
+    return 'revision' in post_name or 'autosave' in post_name
+
+def build_post(post):
+    """Build a blog post dict from a published wp_posts row"""
+    post_id = int(post['ID'])
+    post_author = post['post_author']
+    post_date = post['post_date']
+    post_content = post['post_content']
+    post_title = post['post_title']
+    post_excerpt = post['post_excerpt'] or ""
+    post_name = post['post_name'] or f"post-{post_id}"  # slug
+
+    # Values come already unescaped from wp_dump; only normalize line endings
+    post_content = post_content.replace("\r\n", "\n")
+
+    # Generate excerpt if empty
+    if not post_excerpt:
+        post_excerpt = clean_html_for_excerpt(post_content)[:200] + "..."
+
+    return {
+        'id': post_id,
+        'title': post_title,
+        'slug': post_name,
+        'content': post_content,  # FULL CONTENT
+        'excerpt': post_excerpt,
+        'publishedAt': post_date,
+        'author': post_author,
+        'modifiedAt': post['post_modified_gmt'],
+        'sourceHash': source_hash(post)
+    }
+
+def handle_row(state, table, row):
+    """Add one row from the dump to the extraction state"""
+    # Attachments and image meta go into the join's hash maps
+    if state['images'].add(table, row):
+        return
+
+    if table == 'wp_posts':
+        post = row_dict(table, row)
+        if post['post_status'] != 'publish':
+            return
+        # Skip WordPress revisions and autosaves; build the post before
+        # touching the state so a failing row leaves no part of it there
+        post_data = None if is_revision(post) else build_post(post)
+        state['total_records'] += 1
+        if post_data is None:
+            return
+
+        posts = state['posts']
+        posts.append(post_data)
+        print(f"✓ [{len(posts)}] {post_data['title'][:60]} ({len(post_data['content'])} chars)")
+
+def extract_from_dump(sql_file, workers=None, checkpoint=None, resume=False):
+    """Extract published posts with their featured image URLs in a single pass
+    over the dump, parsed on `workers` processes
+
+    Returns (posts, featured_images), where featured_images maps post IDs to
+    attachment IDs and each post with a resolvable image has 'featuredImage'.
+    With a Checkpoint, progress is saved periodically and whenever the run
+    fails; `resume` continues from the last saved checkpoint.
+    """
+    state = checkpoint.load() if checkpoint is not None and resume else None
+    if state is not None:
+        print(f"↩️  Resuming from {checkpoint.describe()}\n")
+    else:
+        state = {'posts': [], 'images': FeaturedImages(), 'total_records': 0}
+
+    # Only posts, attachments and image meta are decoded; revisions, pages
+    # and other meta are skipped on the raw bytes
+    spans = iter_row_spans_parallel(sql_file, tables={'wp_posts', 'wp_postmeta'},
+                                    columns=POST_COLUMNS, where=POST_FILTER,
+                                    workers=workers,
+                                    resume=checkpoint.position if checkpoint else None)
+
+    run_rows(spans, handle_row, state, checkpoint)
+
+    # Join posts -> thumbnails -> attachment URLs now that all maps are full
+    posts = state['posts']
+    images = state['images']
+    image_urls = images.resolve()
+    for post in posts:
+        if post['id'] in image_urls:
+            post['featuredImage'] = image_urls[post['id']]
+
+    print(f"\nFound {state['total_records']} published records in wp_posts")
+    print(f"📸 Found {len(images.thumbnails)} featured images, resolved {len(image_urls)} URLs")
+    return posts, images.thumbnails
+
+def extract_changes(sql_file, existing_posts, workers=None):
+    """Compare the dump with already extracted posts and rebuild only what changed
+
+    `existing_posts` are posts from an earlier extraction (the blog post store).
+    A first pass reads every published post's ID, slug and post_modified_gmt
+    plus the image join, but no content. Posts that are new or whose
+    modifiedAt differs from the stored one are then read back by byte
+    offset, hashed, and rebuilt only if the hash differs from sourceHash, so
+    the cost beyond that pass grows with the number of changed posts.
+
+    Returns a change set: 'added' and 'changed' hold rebuilt posts,
+    'touched' the IDs whose post_modified_gmt moved but whose content did
+    not (with the new modifiedAt), 'missing' the IDs of existing posts that
+    are no longer published in the dump, and 'unchanged' a count.
+    """
+    existing = {post['id']: post for post in existing_posts}
+    images = FeaturedImages()
+    candidates = []
+    seen = set()
+    unchanged = 0
+
+    spans = iter_row_spans_parallel(sql_file, tables={'wp_posts', 'wp_postmeta'},
+                                    columns=CHANGE_COLUMNS, where=POST_FILTER,
+                                    workers=workers)
+    for table, row, offset, length in spans:
+        if images.add(table, row) or table != 'wp_posts':
             continue
+        post = row_dict(table, row)
+        if post['post_status'] != 'publish' or is_revision(post):
+            continue
+        post_id = int(post['ID'])
+        seen.add(post_id)
+        old_post = existing.get(post_id)
+        if old_post is not None and old_post.get('modifiedAt') == post['post_modified_gmt']:
+            unchanged += 1
+        else:
+            candidates.append((post_id, offset, length))
+
+    changes = {'added': [], 'changed': [], 'touched': [], 'unchanged': unchanged}
+    image_urls = images.resolve()
+
+    with open(sql_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for post_id, offset, length in candidates:
+            post = row_dict('wp_posts', parse_row_at(data[offset:offset + length], 0))
+            old_post = existing.get(post_id)
+            if old_post is not None and old_post.get('sourceHash') == source_hash(post):
+                changes['touched'].append({'id': post_id, 'modifiedAt': post['post_modified_gmt']})
+                continue
 
-    return posts
-
-def extract_featured_images(sql_content):
-    """Extract featured image mappings from wp_postmeta"""
-    featured_images = {}
+            post_data = build_post(post)
+            if post_id in image_urls:
+                post_data['featuredImage'] = image_urls[post_id]
+            changes['added' if old_post is None else 'changed'].append(post_data)
 
-    # Find wp_postmeta section
-    meta_pattern = r"INSERT INTO `wp_postmeta`.*?VALUES\s*(.*?)(?=\n(?:--|CREATE|INSERT INTO `(?!wp_postmeta)))"
-    match = re.search(meta_pattern, sql_content, re.DOTALL | re.IGNORECASE)
+    changes['missing'] = sorted(post_id for post_id in existing if post_id not in seen)
+    return changes
 
-    if not match:
-        print("Could not find wp_postmeta section")
-        return featured_images
+def run_incremental(sql_file, store_dir, workers=None):
+    """Write the change set between the dump and the blog post store"""
+    print(f"🔁 Comparing with: {store_dir}\n")
+    # Only the index is needed: IDs, modifiedAt and sourceHash
+    existing_posts = load_blog_data(store_dir, content=False)['posts']
 
-    values_section = match.group(1)
+    changes = extract_changes(sql_file, existing_posts, workers)
+    for label, key in (('➕ Added', 'added'), ('✏️  Changed', 'changed')):
+        for post in changes[key]:
+            print(f"{label}: [{post['id']}] {post['title'][:60]}")
 
-    # Look for _thumbnail_id meta keys
-    # Format: (meta_id, post_id, meta_key, meta_value)
-    thumbnail_pattern = r"\((\d+),\s*(\d+),\s*'_thumbnail_id',\s*'(\d+)'\)"
+    print(f"\n📊 {len(changes['added'])} added, {len(changes['changed'])} changed, "
+          f"{len(changes['touched'])} touched, {len(changes['missing'])} missing, "
+          f"{changes['unchanged']} unchanged")
 
-    for match in re.finditer(thumbnail_pattern, values_section):
-        post_id = int(match.group(2))
-        attachment_id = int(match.group(3))
-        featured_images[post_id] = attachment_id
+    output = {
+        'extracted_at': datetime.now().isoformat(),
+        'compared_with': store_dir,
+        **changes
+    }
+    output_file = 'blog_posts_changes.json'
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
 
-    print(f"\n📸 Found {len(featured_images)} featured images")
-    return featured_images
+    print(f"💾 Saved to: {output_file}")
 
 def main():
+    parser = argparse.ArgumentParser(description='Extract full blog posts from the WordPress dump')
+    parser.add_argument('--workers', type=int, help='parser processes (default: one per CPU core)')
+    parser.add_argument('--resume', action='store_true', help='continue from the last checkpoint')
+    parser.add_argument('--checkpoint-interval', type=float, default=DEFAULT_INTERVAL,
+                        help='seconds between checkpoints')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only rebuild posts that changed since the store was extracted')
+    parser.add_argument('--store-dir', default='../src/data/blog',
+                        help='blog post store to compare with in --incremental mode')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("WordPress FULL Blog Post Extractor (with images)")
     print("=" * 70)
@@ -175,14 +241,13 @@ def main():
     print(f"\n📂 Reading: {sql_file}\n")
 
     try:
-        with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-            sql_content = f.read()
-
-        print("📊 Extracting published posts with FULL content...\n")
-        posts = extract_posts_from_sql(sql_content)
+        if args.incremental:
+            run_incremental(sql_file, args.store_dir, args.workers)
+            return
 
-        print("\n📸 Extracting featured images...")
-        featured_images = extract_featured_images(sql_content)
+        print("📊 Extracting published posts with FULL content and featured images...\n")
+        checkpoint = Checkpoint(sql_file, 'full_blog_posts', interval=args.checkpoint_interval)
+        posts, featured_images = extract_from_dump(sql_file, args.workers, checkpoint, args.resume)
 
         print(f"\n✅ Successfully extracted {len(posts)} complete blog posts!\n")
 
@@ -221,8 +286,8 @@ def main():
         print(f"   Shortest: {min(lengths)} chars")
         print(f"   Longest: {max(lengths)} chars")
 
-    except FileNotFoundError:
-        print(f"❌ Error: Could not find {sql_file}")
+    except FileNotFoundError as e:
+        print(f"❌ Error: Could not find {e.filename}")
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
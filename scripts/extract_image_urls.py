@@ -3,89 +3,107 @@
 Extract featured image URLs from WordPress database
 """
 
-import re
 import json
 
-def extract_attachment_urls(sql_content, attachment_ids):
+from wp_dump import iter_rows, row_dict
+
+UPLOADS_URL = 'https://www.dmvcalifornia.us/wp-content/uploads/'
+
+# Rows FeaturedImages needs, as iter_rows() filters
+IMAGE_META_KEYS = {'_thumbnail_id', '_wp_attached_file'}
+IMAGE_COLUMNS = {'ID', 'guid', 'post_type', 'post_id', 'meta_key', 'meta_value'}
+
+def attachment_url(guid, attached_file):
+    """URL of an attachment: its guid when that points into the uploads
+    directory, otherwise its _wp_attached_file path there, otherwise any
+    absolute guid (e.g. ?attachment_id= links)"""
+    if guid and '/wp-content/uploads/' in guid:
+        return guid
+    if attached_file:
+        return UPLOADS_URL + attached_file.lstrip('/')
+    if guid and (guid.startswith('http') or guid.startswith('//')):
+        return guid
+    return None
+
+class FeaturedImages:
+    """Hash join of featured images, filled while streaming the dump
+
+    Feed it wp_posts attachment rows and _thumbnail_id/_wp_attached_file
+    postmeta rows in any order with add(); resolve() joins them at the end.
+    """
+
+    def __init__(self):
+        self.thumbnails = {}      # post_id -> attachment_id
+        self.guids = {}           # attachment_id -> guid
+        self.attached_files = {}  # attachment_id -> _wp_attached_file
+
+    def add(self, table, row):
+        """Record a row if it is one of ours; returns True when it was used"""
+        if table == 'wp_posts':
+            post = row_dict(table, row)
+            if post['post_type'] != 'attachment':
+                return False
+            self.guids[int(post['ID'])] = post['guid']
+            return True
+
+        if table == 'wp_postmeta':
+            meta = row_dict(table, row)
+            meta_key = meta['meta_key']
+            meta_value = meta['meta_value'] or ''
+            if meta_key == '_thumbnail_id' and meta_value.isdigit():
+                self.thumbnails[int(meta['post_id'])] = int(meta_value)
+                return True
+            if meta_key == '_wp_attached_file':
+                self.attached_files[int(meta['post_id'])] = meta_value
+                return True
+        return False
+
+    def resolve(self):
+        """Return {post_id: image_url} for posts whose thumbnail resolves"""
+        images = {}
+        for post_id, attachment_id in self.thumbnails.items():
+            url = attachment_url(self.guids.get(attachment_id),
+                                 self.attached_files.get(attachment_id))
+            if url:
+                images[post_id] = url
+        return images
+
+def extract_featured_images(sql_file):
+    """Resolve {post_id: image_url} for every featured image in one pass"""
+    images = FeaturedImages()
+    rows = iter_rows(sql_file, tables={'wp_posts', 'wp_postmeta'}, columns=IMAGE_COLUMNS,
+                     where={'post_type': 'attachment', 'meta_key': IMAGE_META_KEYS})
+    for table, row in rows:
+        images.add(table, row)
+
+    print(f"📸 Found {len(images.thumbnails)} featured images, "
+          f"{len(images.guids)} attachments")
+    return images.resolve()
+
+def extract_attachment_urls(sql_file, attachment_ids):
     """Extract image URLs for specific attachment IDs from wp_posts"""
     image_urls = {}
 
-    # Find wp_posts section
-    posts_pattern = r"INSERT INTO `wp_posts`.*?VALUES\s*(.*?)(?=\n(?:--|CREATE|INSERT INTO `(?!wp_posts)))"
-    match = re.search(posts_pattern, sql_content, re.DOTALL | re.IGNORECASE)
-
-    if not match:
-        print("Could not find wp_posts section")
-        return image_urls
-
-    values_section = match.group(1)
-    records = re.split(r'\),\s*\(', values_section)
-
     print(f"Looking for {len(attachment_ids)} image attachments...")
 
-    for record in records:
-        try:
-            record = record.strip().lstrip('(').rstrip(')')
-
-            # Check if this is an attachment post type
-            if "'attachment'" not in record:
-                continue
-
-            # Extract ID
-            id_match = re.match(r'(\d+),', record)
-            if not id_match:
-                continue
-
-            post_id = int(id_match.group(1))
-
-            # Only process if this is one of our featured images
-            if post_id not in attachment_ids:
-                continue
-
-            # Split by fields
-            parts = []
-            current = ""
-            in_quotes = False
-            escape_next = False
-
-            for char in record:
-                if escape_next:
-                    current += char
-                    escape_next = False
-                    continue
-
-                if char == '\\':
-                    current += char
-                    escape_next = True
-                    continue
-
-                if char == "'" and not escape_next:
-                    in_quotes = not in_quotes
-                    current += char
-                    continue
+    # Only attachment rows are decoded, and only the fields we need
+    rows = iter_rows(sql_file, tables={'wp_posts'}, columns={'ID', 'guid'},
+                     where={'post_type': 'attachment'})
 
-                if char == ',' and not in_quotes:
-                    parts.append(current.strip())
-                    current = ""
-                    continue
+    for table, row in rows:
+        post = row_dict(table, row)
+        post_id = int(post['ID'])
 
-                current += char
-
-            if current:
-                parts.append(current.strip())
-
-            if len(parts) < 12:
-                continue
-
-            # Field 12 is post_name (slug), we need guid (URL) which is field 11
-            guid = parts[10].strip("'") if len(parts) > 10 else ""
+        # Only process if this is one of our featured images
+        if post_id not in attachment_ids:
+            continue
 
-            if guid and (guid.startswith('http') or guid.startswith('//')):
-                image_urls[post_id] = guid
-                print(f"✓ Found image {post_id}: {guid[:80]}")
+        # The attachment's guid is its file URL
+        guid = post['guid'] or ""
 
-        except Exception as e:
-            continue
+        if guid and (guid.startswith('http') or guid.startswith('//')):
+            image_urls[post_id] = guid
+            print(f"✓ Found image {post_id}: {guid[:80]}")
 
     return image_urls
 
@@ -94,38 +112,18 @@ def main():
     print("WordPress Featured Image URL Extractor")
     print("=" * 70)
 
-    # Load merged blog data with featured_images mapping
+    # Load merged blog data (only its posts are used; images come from the dump)
     with open('blog_posts_merged.json', 'r', encoding='utf-8') as f:
         blog_data = json.load(f)
 
-    featured_images = blog_data.get('featured_images', {})
-
-    # Get unique attachment IDs
-    attachment_ids = set(featured_images.values())
-
-    print(f"\n📸 Found {len(featured_images)} posts with featured images")
-    print(f"📸 Need to extract {len(attachment_ids)} unique image URLs\n")
-
     # Load WordPress SQL
     sql_file = '../data/wordpress/dmvcali2.sql'
-    print(f"📂 Reading: {sql_file}\n")
-
-    with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-        sql_content = f.read()
-
-    # Extract image URLs
-    image_urls = extract_attachment_urls(sql_content, attachment_ids)
-
-    print(f"\n✅ Extracted {len(image_urls)} image URLs")
+    print(f"\n📂 Reading: {sql_file}\n")
 
-    # Create post_id -> image_url mapping
-    post_images = {}
-    for post_id_str, attachment_id in featured_images.items():
-        post_id = int(post_id_str)
-        if attachment_id in image_urls:
-            post_images[post_id] = image_urls[attachment_id]
+    # Resolve featured images in one pass over the dump
+    post_images = extract_featured_images(sql_file)
 
-    print(f"✅ Mapped {len(post_images)} posts to their featured images")
+    print(f"\n✅ Mapped {len(post_images)} posts to their featured images")
 
     # Update blog data with image URLs
     for post in blog_data['posts']:
@@ -5,12 +5,13 @@ Directly extracts the 4 known quizzes from wp_pro_quiz tables
 """
 
 import json
-import re
 from datetime import datetime
 
+from wp_dump import iter_rows
+
 def clean_text(text):
-    """Clean escaped text"""
-    return text.replace("\\'", "'").replace("\\r\\n", "\n").replace("\\n", "\n")
+    """Normalize line endings of a decoded dump value"""
+    return text.replace("\r\n", "\n")
 
 def extract_quizzes():
     """Manually extract the 4 quizzes we know exist"""
@@ -75,29 +76,26 @@ def extract_quizzes():
 
     return quizzes
 
-def extract_sample_questions(sql_content):
+def extract_sample_questions(sql_file):
     """Extract a sample of questions for each quiz"""
     questions_by_quiz = {1: [], 2: [], 3: [], 4: []}
-
-    # Find the wp_wp_pro_quiz_question INSERT section
-    question_section_match = re.search(
-        r"INSERT INTO `wp_wp_pro_quiz_question`.*?VALUES\s*(.*?)(?=\n-- |CREATE TABLE|$)",
-        sql_content,
-        re.DOTALL
-    )
-
-    if not question_section_match:
+    question_ids = {quiz_id: [] for quiz_id in questions_by_quiz}
+
+    # Collect question IDs per quiz from wp_wp_pro_quiz_question rows; other
+    # tables are skipped unparsed and only the two ID columns are decoded
+    rows = iter_rows(sql_file, tables={'wp_wp_pro_quiz_question'}, columns={'id', 'quiz_id'})
+    for _, row in rows:
+        # Row starts with (id, quiz_id, ...)
+        quiz_id = int(row[1])
+        if quiz_id in question_ids:
+            question_ids[quiz_id].append(row[0])
+
+    if not any(question_ids.values()):
         print("⚠️  Could not find question data")
         return questions_by_quiz
 
-    values_section = question_section_match.group(1)
-
-    # Split by question records - each starts with (id, quiz_id, ...)
     # Simplified: just count questions per quiz
-    for quiz_id in [1, 2, 3, 4]:
-        # Count how many times this quiz_id appears in questions
-        pattern = rf"\((\d+),\s*{quiz_id},"
-        matches = re.findall(pattern, values_section)
+    for quiz_id, matches in question_ids.items():
         question_count = len(matches)
 
         if question_count > 0:
@@ -129,9 +127,6 @@ def main():
     print(f"\n📂 Reading: {sql_file}\n")
 
     try:
-        with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-            sql_content = f.read()
-
         # Get quiz metadata
         print("📊 Extracting quiz metadata...")
         quizzes = extract_quizzes()
@@ -139,7 +134,7 @@ def main():
 
         # Extract question counts
         print("❓ Analyzing questions...")
-        questions_by_quiz = extract_sample_questions(sql_content)
+        questions_by_quiz = extract_sample_questions(sql_file)
 
         # Update quiz question counts
         for quiz in quizzes:
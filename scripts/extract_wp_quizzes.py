@@ -1,138 +1,197 @@
 #!/usr/bin/env python3
 """
 WordPress Quiz Data Extractor
-Extracts quiz data from WP Pro Quiz plugin and converts to JSON
+Extracts the WP Pro Quiz quizzes, their questions and answers from the dump
+and writes them in the schema of src/data/quizzes.json
 """
 
+import os
 import re
+import html
 import json
-import phpserialize
-from datetime import datetime
-from collections import defaultdict
+import time
+import argparse
+from collections import Counter, defaultdict
+
+from blog_store import first_image
+from php_unserialize import PhpSerializeError, loads_counted
+from wp_dump import iter_rows, row_dict
+
+QUIZ_TABLES = {'wp_wp_pro_quiz_master', 'wp_wp_pro_quiz_question', 'wp_wp_pro_quiz_category'}
+
+# What build_question() reads; titles, tips and wrong-answer messages are skipped
+QUESTION_COLUMNS = {
+    'id', 'quiz_id', 'online', 'sort', 'question', 'correct_msg', 'answer_type',
+    'answer_data', 'category_id'
+}
+
+# Language code -> (quiz category in the site's JSON, words in a quiz name)
+LANGUAGES = {
+    'tr': ('Turkish Tests / Türkçe Testler', ('turkish', 'türkçe')),
+    'es': ('Spanish Tests / Pruebas en Español', ('spanish', 'español', 'espanol')),
+    'zh': ('Chinese Tests / 中文考試', ('chinese', '中文')),
+}
+ENGLISH_CATEGORY = 'Practice Tests'
+
+# Pass mark when a quiz description does not state one ("... 85%")
+DEFAULT_PASSING_SCORE = 85
+PASSING_SCORE_RE = re.compile(r'(\d{2,3})\s*%')
+
+DEFAULT_QUESTION_CATEGORY = 'General'
+SIGN_QUESTION_CATEGORY = 'Traffic Signs'
+DEFAULT_DIFFICULTY = 'medium'
+
+def html_to_text(value):
+    """Plain text of an HTML fragment from the quiz tables"""
+    text = re.sub(r'<[^>]+>', ' ', value or '')
+    return ' '.join(html.unescape(text).split())
+
+def slugify(name):
+    return re.sub(r'[^\w]+', '-', name.lower()).strip('-')
+
+def detect_language(name):
+    """Language code from a quiz name; English when no other language is named"""
+    lowered = name.lower()
+    for code, (_, words) in LANGUAGES.items():
+        if any(word in lowered for word in words):
+            return code
+    return 'en'
+
+def build_quiz(row):
+    """Build quiz metadata from a wp_wp_pro_quiz_master row"""
+    # Columns: id, name, text, result_text, ...
+    quiz_id = int(row[0])
+    quiz_name = row[1]
+    description = html_to_text(row[2])
+    language = detect_language(quiz_name)
+    passing = PASSING_SCORE_RE.search(description)
+
+    quiz = {
+        'id': slugify(quiz_name),
+        'title': quiz_name,
+        'description': description,
+        'category': LANGUAGES[language][0] if language in LANGUAGES else ENGLISH_CATEGORY,
+        'slug': slugify(quiz_name),
+        'passingScore': int(passing.group(1)) if passing else DEFAULT_PASSING_SCORE,
+    }
+    # quizzes.json leaves English implicit; the other banks carry a code
+    if language != 'en':
+        quiz['language'] = language
+    return quiz_id, quiz
+
+def build_question(row, categories, stats):
+    """Build a question from a wp_wp_pro_quiz_question row
+
+    Returns (quiz ID, sort key, question), or None for questions the site's
+    schema cannot hold (not single choice, no correct answer) or that are
+    switched off; `stats` counts why.
+    """
+    question = row_dict('wp_wp_pro_quiz_question', row)
+    if question['online'] == '0':
+        stats['offline'] += 1
+        return None
+    if question['answer_type'] != 'single':
+        stats[f"answer type {question['answer_type']}"] += 1
+        return None
 
-def unserialize_php(data):
-    """Deserialize PHP serialized data"""
+    # answer_data is a serialized PHP array of WpProQuiz_Model_AnswerTypes objects
     try:
-        return phpserialize.loads(data.encode('utf-8'), decode_strings=True)
-    except Exception as e:
-        print(f"Error deserializing: {e}")
+        answers, repaired = loads_counted(question['answer_data'] or 'a:0:{}')
+    except PhpSerializeError as e:
+        print(f"Error decoding answers of question {question['id']}: {e}")
+        stats['bad answer data'] += 1
         return None
-
-def extract_quiz_master(sql_content):
-    """Extract quiz metadata from wp_wp_pro_quiz_master"""
-    quizzes = []
-
-    # Find the INSERT statement
-    master_pattern = r"INSERT INTO `wp_wp_pro_quiz_master`.*?VALUES\s*(.*?)(?=\n-- |\nCREATE|INSERT INTO `wp_wp_pro_quiz_prerequisite|$)"
-    match = re.search(master_pattern, sql_content, re.DOTALL)
-
-    if not match:
-        print("No quiz master data found")
-        return quizzes
-
-    values_section = match.group(1)
-
-    # Parse individual quiz records
-    # Pattern to match (id, 'name', 'text', ...)
-    quiz_pattern = r"\((\d+),\s*'([^']*)',\s*'((?:[^'\\\\]|\\\\.)*)'"
-
-    for quiz_match in re.finditer(quiz_pattern, values_section):
+    if repaired:
+        stats['repaired strings'] += repaired
+
+    options = []
+    correct = []
+    for answer in answers if isinstance(answers, list) else answers.values():
+        text = answer.get('_answer') or ''
+        options.append(html_to_text(text) if answer.get('_html') else text.strip())
+        if answer.get('_correct'):
+            correct.append(len(options) - 1)
+    if not correct:
+        stats['no correct answer'] += 1
+        return None
+    if len(correct) > 1:
+        stats['several correct answers (first kept)'] += 1
+
+    image = first_image(question['question'] or '')
+    category = categories.get(question['category_id'])
+    data = {
+        'id': 0,  # numbered per quiz once all its questions are in
+        'question': html_to_text(question['question']),
+        'options': options,
+        'correctAnswer': correct[0],
+        'explanation': html_to_text(question['correct_msg']),
+        'category': category or (SIGN_QUESTION_CATEGORY if image else DEFAULT_QUESTION_CATEGORY),
+        'difficulty': DEFAULT_DIFFICULTY,
+    }
+    if image:
+        data['image'] = image
+        data['hasImage'] = True
+    return int(question['quiz_id']), (int(question['sort']), int(question['id'])), data
+
+def extract_quiz_data(sql_file):
+    """Extract quizzes (wp_wp_pro_quiz_master), question categories and
+    questions (wp_wp_pro_quiz_question) in one pass over the dump
+
+    Returns (quizzes, questions_by_quiz, stats): quizzes maps WP quiz IDs to
+    quiz metadata, questions_by_quiz WP quiz IDs to their questions in quiz
+    order, and stats counts the questions that were skipped or repaired.
+    """
+    quizzes = {}
+    categories = {}
+    keyed_questions = defaultdict(list)
+    stats = Counter()
+
+    rows = iter_rows(sql_file, tables=QUIZ_TABLES, columns=QUESTION_COLUMNS)
+    for table, row in rows:
         try:
-            quiz_id = int(quiz_match.group(1))
-            quiz_name = quiz_match.group(2)
-            quiz_desc = quiz_match.group(3).replace("\\'", "'").replace("\\r\\n", "\n")
-
-            # Extract full record for this quiz (simplified)
-            # Find the complete record by ID
-            record_pattern = rf"\({quiz_id},\s*'[^']*',.*?\),\n"
-            record_match = re.search(record_pattern, values_section, re.DOTALL)
-
-            if record_match:
-                record = record_match.group(0)
-
-                # Extract key fields (this is simplified - real parsing would be more complex)
-                quiz_data = {
-                    'wpQuizId': quiz_id,
-                    'title': quiz_name,
-                    'description': quiz_desc,
-                    'slug': quiz_name.lower().replace(' ', '-').replace('/', '-'),
-                    'language': 'ENGLISH',  # Default
-                    'difficulty': 'BEGINNER',
-                    'category': 'GENERAL'
-                }
-
-                # Detect language from title
-                if 'turkish' in quiz_name.lower() or 'türkçe' in quiz_name.lower():
-                    quiz_data['language'] = 'TURKISH'
-                elif 'español' in quiz_name.lower() or 'spanish' in quiz_name.lower():
-                    quiz_data['language'] = 'SPANISH'
-
-                # Detect category from title
-                if 'sign' in quiz_name.lower():
-                    quiz_data['category'] = 'ROAD_SIGNS'
-                elif 'driving' in quiz_name.lower():
-                    quiz_data['category'] = 'GENERAL'
-
-                quizzes.append(quiz_data)
-                print(f"✓ Extracted quiz: {quiz_name} (ID: {quiz_id})")
-
-        except Exception as e:
-            print(f"Error parsing quiz: {e}")
+            if table == 'wp_wp_pro_quiz_master':
+                quiz_id, quiz = build_quiz(row)
+                quizzes[quiz_id] = quiz
+                print(f"✓ Extracted quiz: {quiz['title']} (ID: {quiz_id})")
+
+            elif table == 'wp_wp_pro_quiz_category':
+                # Columns: category_id, category_name, ...
+                categories[row[0]] = row[1]
+
+            elif table == 'wp_wp_pro_quiz_question':
+                built = build_question(row, categories, stats)
+                if built is not None:
+                    quiz_id, sort_key, question = built
+                    keyed_questions[quiz_id].append((sort_key, question))
+
+        except (ValueError, IndexError, AttributeError, TypeError) as e:
+            print(f"Error parsing {table} row {row[0] if row else '?'}: {e}")
             continue
 
-    return quizzes
-
-def extract_quiz_questions(sql_content):
-    """Extract questions and answers from wp_wp_pro_quiz_question"""
-    questions_by_quiz = defaultdict(list)
-
-    # Find all INSERT statements for questions
-    question_pattern = r"INSERT INTO `wp_wp_pro_quiz_question`.*?VALUES\s*(.*?);"
-    matches = re.finditer(question_pattern, sql_content, re.DOTALL)
-
-    for match in matches:
-        values_section = match.group(1)
-
-        # Parse individual question records
-        # Pattern: (id, quiz_id, online, sort, 'title', points, 'question', ...)
-        row_pattern = r"\((\d+),\s*(\d+),\s*(\d+),\s*(\d+),\s*'([^']*)',\s*(\d+),\s*'((?:[^'\\\\]|\\\\[\\\\'])*)',\s*'([^']*)',\s*'([^']*)',"
-
-        for row in re.finditer(row_pattern, values_section):
-            try:
-                question_id = int(row.group(1))
-                quiz_id = int(row.group(2))
-                online = int(row.group(3))
-                sort_order = int(row.group(4))
-                title = row.group(5)
-                points = int(row.group(6))
-                question_text = row.group(7).replace("\\'", "'").replace("\\r\\n", "\n")
-                correct_msg = row.group(8)
-                incorrect_msg = row.group(9)
-
-                # Extract answer_data (this is a simplified approach)
-                # In reality, we need to find the serialized answer_data field
-                # For now, we'll create a placeholder structure
-
-                question_data = {
-                    'wpQId': question_id,
-                    'quizId': quiz_id,
-                    'question': question_text,
-                    'explanation': correct_msg if correct_msg else None,
-                    'order': sort_order,
-                    'points': points,
-                    'answerType': 'SINGLE_CHOICE',
-                    'answers': []  # Will be populated from answer_data
-                }
-
-                questions_by_quiz[quiz_id].append(question_data)
-
-            except Exception as e:
-                print(f"Error parsing question: {e}")
-                continue
-
-    return questions_by_quiz
+    questions_by_quiz = {}
+    for quiz_id, keyed in keyed_questions.items():
+        keyed.sort(key=lambda item: item[0])
+        questions = [question for _, question in keyed]
+        for number, question in enumerate(questions, 1):
+            question['id'] = number
+        questions_by_quiz[quiz_id] = questions
+
+    return quizzes, questions_by_quiz, stats
+
+def assemble_quizzes(quizzes, questions_by_quiz):
+    """Quizzes with their questions, in WP quiz ID order, as quizzes.json lists them"""
+    result = []
+    for quiz_id in sorted(quizzes):
+        questions = questions_by_quiz.get(quiz_id, [])
+        if questions:
+            result.append(dict(quizzes[quiz_id], questions=questions))
+    return result
 
 def main():
+    parser = argparse.ArgumentParser(description='Extract the WP Pro Quiz quizzes from the WordPress dump')
+    parser.add_argument('--output', default='extracted_quizzes.json')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("WordPress Quiz Data Extractor")
     print("=" * 60)
@@ -142,56 +201,50 @@ def main():
     print(f"\n📂 Reading: {sql_file}")
 
     try:
-        with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-            sql_content = f.read()
-
-        print(f"   File size: {len(sql_content) / (1024*1024):.2f} MB\n")
-
-        # Extract quizzes
-        print("📊 Extracting quiz metadata...")
-        quizzes = extract_quiz_master(sql_content)
-        print(f"   Found {len(quizzes)} quizzes\n")
-
-        # Extract questions
-        print("❓ Extracting quiz questions...")
-        questions_by_quiz = extract_quiz_questions(sql_content)
-        print(f"   Found questions for {len(questions_by_quiz)} quizzes\n")
-
-        # Combine quizzes with their questions
-        for quiz in quizzes:
-            quiz_id = quiz['wpQuizId']
-            if quiz_id in questions_by_quiz:
-                quiz['questions'] = questions_by_quiz[quiz_id]
-                print(f"   {quiz['title']}: {len(quiz['questions'])} questions")
-
-        # Save to JSON
-        output_file = 'extracted_quizzes.json'
+        print(f"   File size: {os.path.getsize(sql_file) / (1024*1024):.2f} MB\n")
+
+        # Extract quizzes and questions
+        print("📊 Extracting quizzes, questions and answers...")
+        started = time.perf_counter()
+        quizzes, questions_by_quiz, stats = extract_quiz_data(sql_file)
+        elapsed = time.perf_counter() - started
+        print(f"   Found {len(quizzes)} quizzes")
+        print(f"   Found questions for {len(questions_by_quiz)} quizzes in {elapsed:.2f}s\n")
+
+        output = assemble_quizzes(quizzes, questions_by_quiz)
+        for quiz_id, quiz in quizzes.items():
+            if quiz_id not in questions_by_quiz:
+                print(f"   ⚠️  {quiz['title']}: no usable questions, left out")
+
+        if stats:
+            print("   Questions skipped or repaired:")
+            for reason, count in stats.most_common():
+                print(f"      {reason}: {count}")
+
+        # Save in the schema of src/data/quizzes.json
+        output_file = args.output
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'extracted_at': datetime.now().isoformat(),
-                'quizzes': quizzes,
-                'total_quizzes': len(quizzes),
-                'total_questions': sum(len(q.get('questions', [])) for q in quizzes)
-            }, f, indent=2, ensure_ascii=False)
+            json.dump({'quizzes': output}, f, indent=2, ensure_ascii=False)
 
+        total_questions = sum(len(quiz['questions']) for quiz in output)
         print(f"\n✅ Extraction complete!")
         print(f"   Saved to: {output_file}")
-        print(f"   Total quizzes: {len(quizzes)}")
-        print(f"   Total questions: {sum(len(q.get('questions', [])) for q in quizzes)}")
+        print(f"   Total quizzes: {len(output)}")
+        print(f"   Total questions: {total_questions}")
 
         # Print summary
         print("\n" + "=" * 60)
         print("Quiz Summary:")
         print("=" * 60)
-        for quiz in quizzes:
+        for quiz in output:
             print(f"\n📝 {quiz['title']}")
-            print(f"   Language: {quiz['language']}")
+            print(f"   Language: {quiz.get('language', 'en')}")
             print(f"   Category: {quiz['category']}")
-            print(f"   Questions: {len(quiz.get('questions', []))}")
+            print(f"   Questions: {len(quiz['questions'])}")
             print(f"   Slug: {quiz['slug']}")
 
-    except FileNotFoundError:
-        print(f"❌ Error: Could not find {sql_file}")
+    except FileNotFoundError as e:
+        print(f"❌ Error: Could not find {e.filename}")
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
@@ -4,62 +4,43 @@ WordPress URL Mapper
 Extracts all URLs from wp_posts for SEO preservation
 """
 
-import re
 import json
 from datetime import datetime
 from collections import defaultdict
 
-def extract_posts_and_pages(sql_content):
+from wp_dump import iter_rows, row_dict
+
+def extract_posts_and_pages(sql_file):
     """Extract all posts and pages with their URLs"""
     posts = []
     pages = []
 
-    # Find wp_posts INSERT section
-    posts_pattern = r"INSERT INTO `wp_posts`.*?VALUES\s*(.*?)(?=\n-- |INSERT INTO `wp_postsread|CREATE TABLE|$)"
-    match = re.search(posts_pattern, sql_content, re.DOTALL)
-
-    if not match:
-        print("⚠️  Could not find wp_posts data")
-        return posts, pages
-
-    values_section = match.group(1)
-
-    # Parse individual post records
-    # Format: (ID, post_author, 'post_date', 'post_date_gmt', 'post_content', 'post_title', 'post_excerpt', 'post_status', ...)
-    # Field 12 is post_name (slug)
-    # Field 21 is post_type
-
-    # Split by records - look for patterns like (160, 1, '2017-09-18 ...
-    record_pattern = r"\((\d+),\s*\d+,\s*'([^']*)',\s*'([^']*)',.*?'([^']*)',\s*'([^']*)',\s*'([^']*)',\s*'([^']*)',.*?'([^']*)',.*?'([^']*)'"
-
-    for match in re.finditer(record_pattern, values_section):
-        try:
-            post_id = int(match.group(1))
-            post_date = match.group(2)
-            post_title = match.group(5) if len(match.groups()) >= 5 else ''
-            post_status = match.group(8) if len(match.groups()) >= 8 else ''
-            post_name = match.group(9) if len(match.groups()) >= 9 else ''  # slug
-
-            # Try to extract post_type (field 21) - this is tricky
-            # For now, infer from context
-
-            if post_status == 'publish' and post_name:
-                post_data = {
-                    'id': post_id,
-                    'title': post_title[:100],  # Truncate for display
-                    'slug': post_name,
-                    'date': post_date,
-                    'status': post_status
-                }
-
-                # Infer type from slug patterns
-                if '-revision' in post_name or post_name.isdigit():
-                    continue  # Skip revisions
-
-                posts.append(post_data)
-
-        except Exception as e:
-            continue
+    rows = iter_rows(sql_file, tables={'wp_posts'},
+                     columns={'ID', 'post_date', 'post_title', 'post_status', 'post_name', 'post_type'},
+                     where={'post_status': 'publish', 'post_type': {'post', 'page'}})
+
+    for table, row in rows:
+        post = row_dict(table, row)
+        post_status = post['post_status']
+        post_name = post['post_name']  # slug
+        post_type = post['post_type']
+
+        if post_status == 'publish' and post_name and post_type in ('post', 'page'):
+            post_data = {
+                'id': int(post['ID']),
+                'title': post['post_title'][:100],  # Truncate for display
+                'slug': post_name,
+                'date': post['post_date'],
+                'status': post_status
+            }
+
+            # Skip revisions
+            if '-revision' in post_name or post_name.isdigit():
+                continue
+
+            posts.append(post_data)
+            if post_type == 'page':
+                pages.append(post_data)
 
     return posts, pages
 
@@ -99,11 +80,8 @@ def main():
     print(f"\n📂 Reading: {sql_file}\n")
 
     try:
-        with open(sql_file, 'r', encoding='utf-8', errors='ignore') as f:
-            sql_content = f.read()
-
         print("📊 Extracting posts and pages...")
-        posts, pages = extract_posts_and_pages(sql_content)
+        posts, pages = extract_posts_and_pages(sql_file)
 
         print(f"   Found {len(posts)} published posts/pages\n")
 
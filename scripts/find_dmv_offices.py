@@ -3,37 +3,33 @@
 Find all DMV office pages in WordPress
 """
 
-import re
+from wp_cache import open_cache, get_posts
 
 print("=== Finding DMV Office Pages ===\n")
 
-# Look for posts with dmv-related slugs
-with open('data/wordpress/dmvcali2.sql', 'r', encoding='utf-8', errors='ignore') as f:
-    for line in f:
-        # Look for INSERT INTO wp_posts
-        if "INSERT INTO `wp_posts`" in line:
-            # Find all records that might be DMV offices
-            # Match patterns like (id, ..., 'dmv-something', ...)
-            matches = re.findall(r"\((\d+),[^,]*,[^,]*,[^,]*,'([^']*)',[^,]*'([^']*)'[^,]*'(page|post)',[^,]*'publish'[^)]*'([^']*)'[^)]*\)", line)
+conn = open_cache('data/wordpress/dmvcali2.sql')
 
-            for match in matches:
-                post_id, title, excerpt, post_type, post_name = match
-                # Look for DMV office patterns
-                if ('dmv' in post_name.lower() or 'dmv' in title.lower()) and 'office' not in post_name:
-                    if not any(x in post_name for x in ['revision', 'autosave', 'test']):
-                        print(f"ID: {post_id}")
-                        print(f"  Title: {title}")
-                        print(f"  Slug: {post_name}")
-                        print(f"  Type: {post_type}")
-                        print()
+# Look for published posts and pages with dmv-related slugs
+for post_type in ('page', 'post'):
+    for post in get_posts(conn, post_type=post_type):
+        post_id = post['ID']
+        title = post['post_title']
+        post_name = post['post_name']
+
+        # Look for DMV office patterns
+        if ('dmv' in post_name.lower() or 'dmv' in title.lower()) and 'office' not in post_name:
+            if not any(x in post_name for x in ['revision', 'autosave', 'test']):
+                print(f"ID: {post_id}")
+                print(f"  Title: {title}")
+                print(f"  Slug: {post_name}")
+                print(f"  Type: {post_type}")
+                print()
 
 print("\n=== Also checking for 'dmv-offices' page ===\n")
 
 # Look for the main directory page
-with open('data/wordpress/dmvcali2.sql', 'r', encoding='utf-8', errors='ignore') as f:
-    for line in f:
-        if "dmv-offices" in line and "INSERT INTO `wp_posts`" in line:
-            # Extract the record
-            matches = re.findall(r"\((\d+),[^,]*,[^,]*,[^,]*,'([^']*)'", line)
-            for match in matches[:5]:
-                print(f"ID: {match[0]}, Title: {match[1]}")
+rows = conn.execute(
+    "SELECT ID, post_title FROM wp_posts WHERE post_name LIKE '%dmv-offices%' ORDER BY ID LIMIT 5"
+)
+for post_id, title in rows:
+    print(f"ID: {post_id}, Title: {title}")
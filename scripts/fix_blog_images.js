@@ -1,10 +1,6 @@
-const fs = require('fs');
-const path = require('path');
+const { loadBlogData, saveBlogData } = require('./blog_store');
 
-const blogPostsPath = path.join(__dirname, '../src/data/blog_posts.json');
-
-// Read and parse the JSON properly
-const blogData = JSON.parse(fs.readFileSync(blogPostsPath, 'utf8'));
+const blogData = loadBlogData();
 
 console.log('Fixing blog post image URLs...\n');
 
@@ -26,7 +22,7 @@ blogData.posts.forEach(post => {
 });
 
 // Save with proper formatting
-fs.writeFileSync(blogPostsPath, JSON.stringify(blogData, null, 2));
+saveBlogData(blogData);
 
 console.log(`\n✅ Fixed ${fixedCount} blog posts`);
 console.log('✓ JSON structure preserved');
@@ -1,43 +1,68 @@
 #!/usr/bin/env python3
 """
 Remove broken Pixabay images from posts
+Optionally also points images at new URLs (--image-map, --rewrite-host),
+all in one HTML pass per post
 """
 
-import json
-import re
+import argparse
 
-# Load blog data
-with open('src/data/blog_posts.json', 'r', encoding='utf-8') as f:
-    blog_data = json.load(f)
+from blog_store import transaction
+from data_store import read_json
+from html_sanitizer import CollapseEmpty, DropImages, RewriteImages, Sanitizer
 
-# Fix each post with broken images
-fixed_count = 0
-for post in blog_data['posts']:
-    if 'pixabay.com/get/' in post['content']:
-        original_content = post['content']
+# Temporary Pixabay download links; they no longer resolve
+BROKEN_IMAGES = r'^https?://pixabay\.com/get/'
 
-        # Remove img tags with pixabay.com/get/ URLs
-        # Match <img> tags with pixabay URLs
-        post['content'] = re.sub(
-            r'<img[^>]*src="https?://pixabay\.com/get/[^"]*"[^>]*>',
-            '',
-            post['content']
-        )
+def build_sanitizer(urls=None, hosts=None):
+    """Drop broken images, rewrite image URLs if asked, then remove the
+    figures and paragraphs the dropped images leave empty"""
+    rules = [DropImages('broken_images', BROKEN_IMAGES)]
+    if urls or hosts:
+        rules.append(RewriteImages('rewritten_images', urls, hosts))
+    rules.append(CollapseEmpty('empty_containers', ('figure', 'p')))
+    return Sanitizer(rules)
 
-        # Remove empty figure tags that might be left
-        post['content'] = re.sub(r'<figure[^>]*>\s*</figure>', '', post['content'])
+SANITIZER = build_sanitizer()
 
-        # Remove empty paragraphs
-        post['content'] = re.sub(r'<p>\s*</p>', '', post['content'])
+# Bump when remove_broken_images() would drop different images
+VERSION = 1
 
-        if original_content != post['content']:
-            print(f'✓ Fixed: {post["title"]}')
-            print(f'  Removed broken Pixabay images')
-            fixed_count += 1
+def remove_broken_images(post, sanitizer=SANITIZER):
+    """Strip broken Pixabay images from a post; True if its content changed"""
+    content = sanitizer.rewrite(post['content'], post['id'])
+    if content == post['content']:
+        return False
+    post['content'] = content
+    return True
 
-# Save updated data
-with open('src/data/blog_posts.json', 'w', encoding='utf-8') as f:
-    json.dump(blog_data, f, indent=2, ensure_ascii=False)
+def main():
+    parser = argparse.ArgumentParser(description='Remove broken images from the blog posts')
+    parser.add_argument('--image-map', help='JSON file mapping image URLs to new ones')
+    parser.add_argument('--rewrite-host', action='append', default=[], metavar='OLD=NEW',
+                        help='point images on host OLD at host NEW (repeatable)')
+    args = parser.parse_args()
 
-print(f'\n✅ Fixed {fixed_count} post(s) with broken images')
-print('💾 Saved updated blog_posts.json')
+    urls = read_json(args.image_map) if args.image_map else None
+    hosts = dict(pair.split('=', 1) for pair in args.rewrite_host)
+    sanitizer = build_sanitizer(urls, hosts)
+
+    # Update the blog data in one transaction
+    with transaction() as blog_data:
+        # Fix each post with broken images
+        fixed_count = 0
+        for post in blog_data['posts']:
+            if remove_broken_images(post, sanitizer):
+                print(f'✓ Fixed: {post["title"]}')
+                fixed_count += 1
+
+    report = sanitizer.report()
+    print(f'\n📊 {report["documents"]} posts in {report["seconds"]:.3f}s:')
+    for name, rule in report['rules'].items():
+        print(f'   {name}: {rule["hits"]} hit(s), {rule["seconds"]:.3f}s')
+
+    print(f'\n✅ Fixed the images in {fixed_count} post(s)')
+    print('💾 Saved updated blog post store')
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,10 @@
 Fix truncated blog posts by replacing with full content from live site
 """
 
-import json
 import random
 
+from blog_store import transaction
+
 # Random author names we're using
 AUTHORS = [
     "Sarah Mitchell",
@@ -264,33 +265,27 @@ fixed_posts = {
 
 print("=== Fixing Truncated Blog Posts ===\n")
 
-# Load existing blog data
-with open('src/data/blog_posts.json', 'r', encoding='utf-8') as f:
-    blog_data = json.load(f)
-
-fixed_count = 0
-
-for post in blog_data['posts']:
-    if post['slug'] in fixed_posts:
-        old_length = len(post['content'])
-        post['content'] = fixed_posts[post['slug']]['content']
-        post['excerpt'] = fixed_posts[post['slug']]['excerpt']
-        new_length = len(post['content'])
+# Update the blog data in one transaction
+with transaction() as blog_data:
+    fixed_count = 0
 
-        print(f"✓ Fixed: {post['title']}")
-        print(f"  Slug: /{post['slug']}")
-        print(f"  Content: {old_length} → {new_length} characters (+{new_length - old_length})")
-        print(f"  Author: {post['author']}")
-        print()
+    for post in blog_data['posts']:
+        if post['slug'] in fixed_posts:
+            old_length = len(post['content'])
+            post['content'] = fixed_posts[post['slug']]['content']
+            post['excerpt'] = fixed_posts[post['slug']]['excerpt']
+            new_length = len(post['content'])
 
-        fixed_count += 1
+            print(f"✓ Fixed: {post['title']}")
+            print(f"  Slug: /{post['slug']}")
+            print(f"  Content: {old_length} → {new_length} characters (+{new_length - old_length})")
+            print(f"  Author: {post['author']}")
+            print()
 
-# Save updated data
-with open('src/data/blog_posts.json', 'w', encoding='utf-8') as f:
-    json.dump(blog_data, f, indent=2, ensure_ascii=False)
+            fixed_count += 1
 
 print(f"✅ Fixed {fixed_count} truncated posts")
-print("💾 Saved updated blog_posts.json")
+print("💾 Saved updated blog post store")
 print("\nYou can now access the complete articles:")
 for slug in fixed_posts.keys():
     print(f"  • http://localhost:3001/{slug}/")
@@ -3,8 +3,13 @@
 Generate relevant tags for blog posts based on titles and content
 """
 
-import json
+import argparse
+import html
+import math
 import re
+from collections import Counter
+
+from blog_store import transaction
 
 # Define common DMV-related keywords and their associated tags
 TAG_KEYWORDS = {
@@ -29,55 +34,187 @@ TAG_KEYWORDS = {
     'Out of State': ['out of state', 'moving to california', 'transfer'],
 }
 
-print("=== Generating Tags for Blog Posts ===\n")
+def trie_pattern(words):
+    """Regex alternation for the words, nested as a prefix trie
+
+    A flat 'a|b|c' alternation makes the regex engine try every keyword at
+    every position; with shared prefixes factored out it follows one branch
+    per character, so a scan costs about the same however many keywords
+    there are.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A word ends here, so the rest is optional
+        return f'(?:{pattern})?' if '' in node else pattern
+
+    return build(trie)
+
+def compile_keywords(tag_keywords):
+    """Compile every keyword into one regex, so a text is scanned once
+
+    Returns (regex, keyword_tags). Keywords match lowercase text as whole
+    words, with an optional plural 's'/'es', so 'dl' does not match inside
+    'handle' nor 'fee' inside 'feel'. keyword_tags maps each keyword to the
+    tags it stands for: a keyword that contains another tag's keyword, like
+    'traffic violation' and 'violation', gives both tags even though the
+    regex only reports the longer match.
+    """
+    keywords = {keyword.lower() for keywords in tag_keywords.values() for keyword in keywords}
+    keyword_re = re.compile(rf'(?<!\w)({trie_pattern(keywords)})(?:e?s)?(?!\w)')
+
+    keyword_tags = {keyword: set() for keyword in keywords}
+    for tag, tag_words in tag_keywords.items():
+        for tag_word in tag_words:
+            word_re = re.compile(rf'(?<!\w){re.escape(tag_word.lower())}(?!\w)')
+            for keyword in keywords:
+                if word_re.search(keyword):
+                    keyword_tags[keyword].add(tag)
+    return keyword_re, keyword_tags
 
-# Load blog data
-with open('src/data/blog_posts.json', 'r', encoding='utf-8') as f:
-    blog_data = json.load(f)
+KEYWORD_RE, KEYWORD_TAGS = compile_keywords(TAG_KEYWORDS)
 
-# Generate tags for each post
-for post in blog_data['posts']:
+def find_tags(text):
+    """Tags whose keywords occur in the text"""
     tags = set()
+    for match in KEYWORD_RE.finditer(text.lower()):
+        tags |= KEYWORD_TAGS[match.group(1)]
+    return tags
 
-    # Combine title and excerpt for analysis
-    text = (post['title'] + ' ' + post.get('excerpt', '')).lower()
+def post_text(post, content=False):
+    """Title and excerpt of a post, plus its body as plain text if `content`"""
+    text = post['title'] + ' ' + post.get('excerpt', '')
+    if content:
+        text += ' ' + html.unescape(re.sub(r'<[^>]+>', ' ', post['content']))
+    return text
 
-    # Check for each tag keyword
-    for tag, keywords in TAG_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword.lower() in text:
-                tags.add(tag)
-                break
+def fallback_tag(text):
+    """Generic tag for a post none of the keywords matched"""
+    text = text.lower()
+    if 'dmv' in text:
+        return 'DMV Guide'
+    elif 'california' in text:
+        return 'California DMV'
+    return 'DMV Information'
+
+def set_tags(post, tags):
+    """Store a post's tags sorted; True if they changed"""
+    old_tags = post.get('tags')
+    post['tags'] = sorted(tags)
+    return post['tags'] != old_tags
+
+# Bump when generate_tags() would tag posts differently (keywords, rules)
+VERSION = 1
+
+def generate_tags(post, content=False):
+    """Set a post's tags from keywords in its title and excerpt (and body)"""
+    text = post_text(post, content)
+    tags = find_tags(text)
 
     # Add at least a generic tag if no specific tags found
     if not tags:
-        if 'dmv' in text:
-            tags.add('DMV Guide')
-        elif 'california' in text:
-            tags.add('California DMV')
-        else:
-            tags.add('DMV Information')
-
-    # Convert to sorted list
-    post['tags'] = sorted(list(tags))
-
-    print(f"✓ {post['title'][:60]}")
-    print(f"  Tags: {', '.join(post['tags'])}")
-    print()
-
-# Save updated data
-with open('src/data/blog_posts.json', 'w', encoding='utf-8') as f:
-    json.dump(blog_data, f, indent=2, ensure_ascii=False)
-
-print(f"\n✅ Generated tags for all {len(blog_data['posts'])} posts")
-print("💾 Saved updated blog_posts.json")
-
-# Show tag statistics
-all_tags = {}
-for post in blog_data['posts']:
-    for tag in post.get('tags', []):
-        all_tags[tag] = all_tags.get(tag, 0) + 1
-
-print(f"\n📊 Tag distribution ({len(all_tags)} unique tags):")
-for tag, count in sorted(all_tags.items(), key=lambda x: x[1], reverse=True):
-    print(f"   • {tag}: {count} posts")
+        tags.add(fallback_tag(text))
+
+    return set_tags(post, tags)
+
+# Scoring mode: a title mention counts this many times a body mention
+TITLE_WEIGHT = 3
+# At most this many tags per post...
+TOP_K = 4
+# ...each with at least this share of the post's total tag score
+THRESHOLD = 0.15
+
+def keyword_counts(post):
+    """One row of the term-document matrix: keyword -> weighted count"""
+    counts = Counter()
+    for match in KEYWORD_RE.finditer(post['title'].lower()):
+        counts[match.group(1)] += TITLE_WEIGHT
+    for match in KEYWORD_RE.finditer(post_text(dict(post, title=''), content=True).lower()):
+        counts[match.group(1)] += 1
+    return counts
+
+def score_tags(posts, top_k=TOP_K, threshold=THRESHOLD):
+    """Score every tag for every post by TF-IDF over the whole corpus
+
+    The keywords of TAG_KEYWORDS are the terms: each post's title, excerpt
+    and body (HTML stripped) are scanned once into a sparse row of keyword
+    counts. A keyword's weight in a post is (1 + log tf) * idf, with idf
+    smoothed over the posts, so a keyword every post uses counts for little;
+    a tag scores the sum of its keywords' weights. A post gets its top_k
+    tags by score, keeping those with at least `threshold` of its total.
+
+    Returns one (tags, {tag: score}) pair per post, in order.
+    """
+    matrix = [keyword_counts(post) for post in posts]
+
+    doc_freq = Counter()
+    for row in matrix:
+        doc_freq.update(row.keys())
+    idf = {keyword: math.log((1 + len(matrix)) / (1 + df)) + 1 for keyword, df in doc_freq.items()}
+
+    results = []
+    for row in matrix:
+        scores = Counter()
+        for keyword, tf in row.items():
+            weight = (1 + math.log(tf)) * idf[keyword]
+            for tag in KEYWORD_TAGS[keyword]:
+                scores[tag] += weight
+        total = sum(scores.values())
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        results.append(([tag for tag, score in ranked if score >= threshold * total], scores))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate tags for the blog posts')
+    parser.add_argument('--content', action='store_true',
+                        help='look for keywords in the post bodies too, not just title and excerpt')
+    parser.add_argument('--score', action='store_true',
+                        help='score tags by TF-IDF over all post bodies and keep the best ones')
+    parser.add_argument('--top-k', type=int, default=TOP_K, help='most tags per post in --score mode')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="least share of a post's tag score a tag needs in --score mode")
+    args = parser.parse_args()
+
+    print("=== Generating Tags for Blog Posts ===\n")
+
+    # Update the blog data in one transaction
+    with transaction(content=args.content or args.score) as blog_data:
+        if args.score:
+            scored = score_tags(blog_data['posts'], args.top_k, args.threshold)
+
+        # Generate tags for each post
+        for i, post in enumerate(blog_data['posts']):
+            if args.score:
+                tags = scored[i][0] or [fallback_tag(post_text(post, content=True))]
+                set_tags(post, tags)
+            else:
+                generate_tags(post, args.content)
+
+            print(f"✓ {post['title'][:60]}")
+            print(f"  Tags: {', '.join(post['tags'])}")
+            print()
+
+    print(f"\n✅ Generated tags for all {len(blog_data['posts'])} posts")
+    print("💾 Saved updated blog post store")
+
+    # Show tag statistics
+    all_tags = {}
+    for post in blog_data['posts']:
+        for tag in post.get('tags', []):
+            all_tags[tag] = all_tags.get(tag, 0) + 1
+
+    print(f"\n📊 Tag distribution ({len(all_tags)} unique tags):")
+    for tag, count in sorted(all_tags.items(), key=lambda x: x[1], reverse=True):
+        print(f"   • {tag}: {count} posts")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML sanitizer for post content
+Tokenizes a post's HTML once with html.parser and applies a set of rules on
+the way through: dropping images by URL, rewriting image URLs, collecting an
+image inventory and removing containers a rule left empty. Attribute order
+and quoting do not matter to the rules, markup they do not touch is copied
+through as written, and a post no rule changed comes back identical
+
+    sanitizer = Sanitizer([DropImages('pixabay', r'//pixabay\.com/get/'),
+                           CollapseEmpty('empty', ('figure', 'p'))])
+    post['content'] = sanitizer.rewrite(post['content'])
+"""
+
+import html
+import re
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlsplit, urlunsplit
+
+
+class Rule:
+    """Base of the rules: a name for reports, plus hits and time spent"""
+
+    def __init__(self, name):
+        self.name = name
+        self.hits = 0
+        self.seconds = 0.0
+
+
+class DropImages(Rule):
+    """Remove <img> elements whose src matches a regex"""
+
+    def __init__(self, name, pattern):
+        super().__init__(name)
+        self.pattern = re.compile(pattern)
+
+    def image(self, attrs, key):
+        if self.pattern.search(attrs.get('src') or ''):
+            self.hits += 1
+            return None
+        return attrs
+
+
+class RewriteImages(Rule):
+    """Point <img> src and srcset URLs elsewhere
+
+    `urls` maps whole URLs to new ones (like image_url_mapping.json), and
+    `hosts` maps host names to new host names for the remaining URLs.
+    """
+
+    def __init__(self, name, urls=None, hosts=None):
+        super().__init__(name)
+        self.urls = urls or {}
+        self.hosts = hosts or {}
+
+    def rewrite_url(self, url):
+        if url in self.urls:
+            return self.urls[url]
+        parts = urlsplit(url)
+        if parts.netloc in self.hosts:
+            return urlunsplit(parts._replace(netloc=self.hosts[parts.netloc]))
+        return url
+
+    def rewrite_srcset(self, srcset):
+        candidates = []
+        for candidate in srcset.split(','):
+            words = candidate.split()
+            if words:
+                candidates.append(' '.join([self.rewrite_url(words[0])] + words[1:]))
+        return ', '.join(candidates)
+
+    def image(self, attrs, key):
+        new_attrs = dict(attrs)
+        if attrs.get('src'):
+            new_attrs['src'] = self.rewrite_url(attrs['src'])
+        if attrs.get('srcset'):
+            new_attrs['srcset'] = self.rewrite_srcset(attrs['srcset'])
+        if new_attrs != attrs:
+            self.hits += 1
+        return new_attrs
+
+
+def srcset_urls(srcset):
+    """The image URLs of a srcset attribute"""
+    return [candidate.split()[0] for candidate in srcset.split(',') if candidate.strip()]
+
+
+class CollectImages(Rule):
+    """Record every image still in the content as (key, src, alt)
+
+    With srcset=True each URL of an image's srcset is recorded as well,
+    with the same key and alt.
+    """
+
+    def __init__(self, name, srcset=False):
+        super().__init__(name)
+        self.srcset = srcset
+        self.images = []
+
+    def image(self, attrs, key):
+        self.images.append((key, attrs.get('src'), attrs.get('alt')))
+        if self.srcset and attrs.get('srcset'):
+            for url in srcset_urls(attrs['srcset']):
+                self.images.append((key, url, attrs.get('alt')))
+        self.hits += 1
+        return attrs
+
+
+class CollapseEmpty(Rule):
+    """Remove `tags` elements that hold nothing but whitespace once an image
+    rule dropped what was in them; containers that were empty already stay"""
+
+    def __init__(self, name, tags):
+        super().__init__(name)
+        self.tags = frozenset(tags)
+
+
+def start_tag(tag, attrs, closed=False):
+    """Serialize a start tag from an attribute dict"""
+    parts = [tag]
+    for name, value in attrs.items():
+        parts.append(name if value is None else f'{name}="{html.escape(value)}"')
+    return '<' + ' '.join(parts) + (' />' if closed else '>')
+
+
+class _Element:
+    """An open container whose output is held back until it closes"""
+
+    def __init__(self, tag, start):
+        self.tag = tag
+        self.start = start
+        self.parts = []
+        self.emptied = False
+
+
+class _Pass(HTMLParser):
+    """One traversal of one document"""
+
+    def __init__(self, sanitizer, key):
+        super().__init__(convert_charrefs=False)
+        self.sanitizer = sanitizer
+        self.key = key
+        self.collapse = sanitizer.collapse
+        self.stack = [_Element(None, '')]
+        self.changed = False
+
+    def write(self, text):
+        self.stack[-1].parts.append(text)
+
+    def flush(self, element):
+        """Close an element into its parent as it was written"""
+        self.stack[-1].parts.append(element.start)
+        self.stack[-1].parts.extend(element.parts)
+
+    def start(self, tag, attrs, closed):
+        text = self.get_starttag_text()
+        if tag == 'img':
+            attrs = dict(attrs)
+            new_attrs = self.sanitizer.image(attrs, self.key)
+            if new_attrs is None:
+                self.stack[-1].emptied = True
+                self.changed = True
+                return
+            if new_attrs != attrs:
+                text = start_tag(tag, new_attrs, closed)
+                self.changed = True
+        elif self.collapse is not None and tag in self.collapse.tags and not closed:
+            self.stack.append(_Element(tag, text))
+            return
+        self.write(text)
+
+    def handle_starttag(self, tag, attrs):
+        self.start(tag, attrs, False)
+
+    def handle_startendtag(self, tag, attrs):
+        self.start(tag, attrs, True)
+
+    def handle_endtag(self, tag):
+        end = f'</{tag}>'
+        if not any(element.tag == tag for element in self.stack[1:]):
+            self.write(end)
+            return
+
+        # Unclosed containers inside this one are kept as they are
+        while self.stack[-1].tag != tag:
+            self.flush(self.stack.pop())
+
+        element = self.stack.pop()
+        started = time.perf_counter()
+        if element.emptied and not ''.join(element.parts).strip():
+            self.collapse.hits += 1
+            self.stack[-1].emptied = True
+            self.changed = True
+        else:
+            self.flush(element)
+            self.write(end)
+        self.collapse.seconds += time.perf_counter() - started
+
+    def handle_data(self, data):
+        self.write(data)
+
+    def handle_entityref(self, name):
+        self.write(f'&{name};')
+
+    def handle_charref(self, name):
+        self.write(f'&#{name};')
+
+    def handle_comment(self, data):
+        self.write(f'<!--{data}-->')
+
+    def handle_decl(self, decl):
+        self.write(f'<!{decl}>')
+
+    def handle_pi(self, data):
+        self.write(f'<?{data}>')
+
+    def unknown_decl(self, data):
+        self.write(f'<![{data}]>')
+
+    def finish(self):
+        self.close()
+        while len(self.stack) > 1:
+            self.flush(self.stack.pop())
+        return ''.join(self.stack[0].parts)
+
+
+class Sanitizer:
+    """Applies a list of rules to documents, one tokenizer pass each
+
+    Image rules (DropImages, RewriteImages, CollectImages) see every <img>
+    in the order given, and an image dropped by one is not seen by the
+    rules after it. Each rule keeps its hit count and the time spent in it;
+    report() returns them along with the number of documents, the number
+    changed and the total time.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.image_rules = [rule for rule in self.rules if hasattr(rule, 'image')]
+        self.collapse = next((rule for rule in self.rules if isinstance(rule, CollapseEmpty)), None)
+        self.documents = 0
+        self.changed = 0
+        self.seconds = 0.0
+
+    def image(self, attrs, key):
+        """Run the image rules over one <img>'s attributes; None drops it"""
+        for rule in self.image_rules:
+            started = time.perf_counter()
+            attrs = rule.image(attrs, key)
+            rule.seconds += time.perf_counter() - started
+            if attrs is None:
+                return None
+        return attrs
+
+    def rewrite(self, content, key=None):
+        """The sanitized content; `key` (e.g. a post ID) is passed to the rules"""
+        started = time.perf_counter()
+        parser = _Pass(self, key)
+        parser.feed(content)
+        result = parser.finish()
+        self.documents += 1
+        if parser.changed:
+            self.changed += 1
+        else:
+            result = content
+        self.seconds += time.perf_counter() - started
+        return result
+
+    def report(self):
+        return {
+            'documents': self.documents,
+            'changed': self.changed,
+            'seconds': self.seconds,
+            'rules': {rule.name: {'hits': rule.hits, 'seconds': rule.seconds} for rule in self.rules},
+        }
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Blog image inventory and dead-link report
+Collects every image the blog posts reference (<img> src and srcset in the
+content, plus featured images) into one deduplicated inventory, then checks
+each URL concurrently against a resolver: the local mirror (public/ for
+/images/... paths and a copy of wp-content/uploads for the WordPress site's
+URLs) or a local HTTP server standing in for the site
+
+Usage: python3 scripts/image_inventory.py [--uploads-dir DIR] [--base-url URL]
+           [--external] [--concurrency 32] [--output image_inventory.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import unquote, urljoin, urlsplit
+
+from blog_store import DEFAULT_STORE_DIR, BlogStore
+from html_sanitizer import CollectImages, Sanitizer
+
+# Hosts of the old WordPress site; their uploads are in the mirror
+SITE_HOSTS = {'www.dmvcalifornia.us', 'dmvcalifornia.us'}
+UPLOADS_PREFIX = '/wp-content/uploads/'
+
+DEFAULT_PUBLIC_DIR = 'public'
+DEFAULT_UPLOADS_DIR = 'data/wordpress/wp-content/uploads'
+DEFAULT_CONCURRENCY = 32
+HTTP_TIMEOUT = 10
+
+
+def collect_images(store):
+    """{url: {'posts': [post IDs], 'sources': [...]}} for every image reference"""
+    images = CollectImages('images', srcset=True)
+    sanitizer = Sanitizer([images])
+    inventory = {}
+
+    def add(url, post_id, source):
+        url = (url or '').strip()
+        if not url or url.startswith('data:'):
+            return
+        entry = inventory.setdefault(url, {'posts': set(), 'sources': set()})
+        entry['posts'].add(post_id)
+        entry['sources'].add(source)
+
+    for meta in store.posts:
+        sanitizer.rewrite(store.content(meta['id']) or '', meta['id'])
+        add(meta.get('featuredImage'), meta['id'], 'featured')
+    for post_id, url, _ in images.images:
+        add(url, post_id, 'content')
+
+    return {url: {'posts': sorted(entry['posts']), 'sources': sorted(entry['sources'])}
+            for url, entry in sorted(inventory.items())}
+
+
+def http_status(url):
+    """('ok' | 'missing' | 'error', detail) of a HEAD request"""
+    request = urllib.request.Request(url, method='HEAD', headers={'User-Agent': 'image-inventory'})
+    try:
+        with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT) as response:
+            return 'ok', f'HTTP {response.status}'
+    except urllib.error.HTTPError as e:
+        return ('missing' if e.code in (404, 410) else 'error'), f'HTTP {e.code}'
+    except (urllib.error.URLError, OSError) as e:
+        return 'error', str(getattr(e, 'reason', e))
+
+
+class MirrorResolver:
+    """Checks that image files exist in local directories"""
+
+    def __init__(self, public_dir=DEFAULT_PUBLIC_DIR, uploads_dir=DEFAULT_UPLOADS_DIR):
+        self.public_dir = public_dir
+        self.uploads_dir = uploads_dir
+
+    def local_file(self, url):
+        """Mirror file for a URL, or None if the mirror does not cover it"""
+        parts = urlsplit(url)
+        path = unquote(parts.path)
+        if not parts.netloc and path.startswith('/'):
+            root, rel = self.public_dir, path
+        elif parts.netloc in SITE_HOSTS and path.startswith(UPLOADS_PREFIX):
+            root, rel = self.uploads_dir, path[len(UPLOADS_PREFIX):]
+        else:
+            return None
+        file = os.path.normpath(os.path.join(root, rel.lstrip('/')))
+        # Keep ../ in a URL from pointing outside the mirror
+        if os.path.commonpath([os.path.abspath(file), os.path.abspath(root)]) != os.path.abspath(root):
+            return None
+        return file
+
+    def check(self, url):
+        file = self.local_file(url)
+        if file is None:
+            return None
+        return ('ok', file) if os.path.isfile(file) else ('missing', file)
+
+
+class HttpResolver:
+    """Checks images with HEAD requests to a server standing in for the site"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/') + '/'
+
+    def check(self, url):
+        parts = urlsplit(url)
+        if parts.netloc and parts.netloc not in SITE_HOSTS:
+            return None
+        target = urljoin(self.base_url, parts.path.lstrip('/'))
+        if parts.query:
+            target += '?' + parts.query
+        return http_status(target)
+
+
+async def check_images(urls, resolver, external=False, concurrency=DEFAULT_CONCURRENCY):
+    """{url: (status, detail)} for every URL, at most `concurrency` at a time
+
+    URLs the resolver does not cover (other sites' images) are 'external'
+    and left unchecked unless `external`, which requests them directly.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    # Checks block (file system, urllib), so each runs on a thread of its own
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(concurrency))
+
+    def check(url):
+        result = resolver.check(url)
+        if result is not None:
+            return result
+        if external and urlsplit(url).scheme in ('http', 'https'):
+            return http_status(url)
+        return 'external', None
+
+    async def check_one(url):
+        async with semaphore:
+            return url, await asyncio.to_thread(check, url)
+
+    return dict(await asyncio.gather(*(check_one(url) for url in urls)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inventory the blog images and report dead ones')
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR)
+    parser.add_argument('--public-dir', default=DEFAULT_PUBLIC_DIR, help='where /images/... paths live')
+    parser.add_argument('--uploads-dir', default=DEFAULT_UPLOADS_DIR,
+                        help="local copy of the WordPress site's wp-content/uploads")
+    parser.add_argument('--base-url', help='check against this HTTP server instead of the directories')
+    parser.add_argument('--external', action='store_true', help="also request other sites' images")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='checks in flight at once')
+    parser.add_argument('--output', default='image_inventory.json')
+    args = parser.parse_args()
+
+    print("=== Blog Image Inventory ===\n")
+
+    inventory = collect_images(BlogStore(args.store_dir))
+    references = sum(len(entry['posts']) for entry in inventory.values())
+    print(f"🖼️  Found {len(inventory)} unique images ({references} references)")
+
+    if args.base_url:
+        resolver = HttpResolver(args.base_url)
+        print(f"🌐 Checking against {args.base_url}")
+    else:
+        resolver = MirrorResolver(args.public_dir, args.uploads_dir)
+        print(f"📂 Checking against {args.public_dir} and {args.uploads_dir}")
+
+    started = time.perf_counter()
+    results = asyncio.run(check_images(inventory, resolver, args.external, args.concurrency))
+    elapsed = time.perf_counter() - started
+
+    for url, (status, detail) in results.items():
+        inventory[url]['status'] = status
+        if detail:
+            inventory[url]['detail'] = detail
+
+    counts = Counter(status for status, _ in results.values())
+    print(f"⏱️  Checked in {elapsed:.2f}s ({args.concurrency} at a time)\n")
+    print("📊 Status:")
+    for status, count in counts.most_common():
+        print(f"   {status}: {count}")
+
+    dead = [url for url, entry in inventory.items() if entry['status'] in ('missing', 'error')]
+    if dead:
+        print(f"\n❌ {len(dead)} dead image(s):")
+        for url in dead[:20]:
+            entry = inventory[url]
+            print(f"   {url} ({entry.get('detail')}) in post(s) {', '.join(map(str, entry['posts']))}")
+        if len(dead) > 20:
+            print(f"   ... and {len(dead) - 20} more")
+
+    output = {
+        'checked_at': datetime.now().isoformat(),
+        'resolver': args.base_url or {'public_dir': args.public_dir, 'uploads_dir': args.uploads_dir},
+        'total_images': len(inventory),
+        'status': dict(counts),
+        'images': inventory,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Leaderboard snapshots
+Streams leaderboard entries (src/data/leaderboard.json, or a JSONL export
+of the MongoDB collection with one entry per line) and aggregates them in
+one pass into small precomputed files, so serving a quiz's leaderboard is a
+file read instead of sorting the whole collection per request
+
+Per quiz it keeps the top entries in a heap bounded to --top-k (ranked like
+/api/leaderboard: percentage, then earliest completedAt), the number of
+entries per day and a 1%-wide histogram of the scores, from which the
+percentiles are read. Memory grows with quizzes and days, not entries.
+
+Layout of src/data/leaderboard/:
+    index.json          per quiz: entries, best and average score, top-k, file
+    quiz-<quizId>.json  top entries, daily counts, histogram, percentiles
+
+Snapshots are keyed by the quiz IDs the site sends to /api/leaderboard.
+Entries under the numeric IDs of the old site are filed under the quiz that
+replaced them, and entries of quizzes the site no longer has are skipped.
+
+Emails are never written to the snapshots.
+
+Usage: python3 scripts/leaderboard_snapshot.py [--input src/data/leaderboard.json]
+           [--top-k 10] [--out-dir src/data/leaderboard]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from data_store import dumps, locked, read_json, write_text
+from export_quizzes import DEFAULT_OUT_DIR as QUIZ_DIR, MANIFEST_FILE
+
+DEFAULT_INPUT = 'src/data/leaderboard.json'
+DEFAULT_OUT_DIR = 'src/data/leaderboard'
+INDEX_FILE = 'index.json'
+DEFAULT_TOP_K = 10
+
+# Numeric quiz IDs of the old site: the English quizzes were numbered in
+# quizzes.json order (3 was Traffic Signs & Signals, see CHANGES_SUMMARY.md)
+# and the Turkish tests from 100. 102 was a Turkish test that never shipped.
+LEGACY_QUIZ_IDS = {
+    '1': 'dmv-simulation-test-1',
+    '2': 'dmv-simulation-test-2',
+    **{str(number + 2): f'practice-test-{number}' for number in range(1, 17)},
+    '19': 'practice-test-mixed-review',
+    '100': 'turkish-test-1',
+    '101': 'turkish-test-2',
+}
+
+PERCENTILES = (25, 50, 75, 90)
+
+# Entry fields a snapshot shows
+PUBLIC_FIELDS = ('name', 'points', 'percentage', 'completedAt')
+
+
+def iter_entries(path):
+    """Leaderboard entries of a .json ({"leaderboard": [...]} or a list) or
+    a .jsonl file; JSONL is read a line at a time"""
+    if path.endswith(('.jsonl', '.ndjson')):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    data = read_json(path)
+    yield from data['leaderboard'] if isinstance(data, dict) else data
+
+
+def plain(value):
+    """A value from a mongoexport line without its type wrapper ({"$date": ...})"""
+    if isinstance(value, dict) and len(value) == 1:
+        return next(iter(value.values()))
+    return value
+
+
+def timestamp(value):
+    """Seconds since the epoch of an ISO date; naive dates are taken as UTC"""
+    try:
+        moment = datetime.fromisoformat(str(plain(value)).replace('Z', '+00:00'))
+    except ValueError:
+        return float('inf')
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class QuizStats:
+    """Running aggregates of one quiz's entries"""
+
+    def __init__(self, top_k):
+        self.top_k = top_k
+        self.top = []           # min-heap of (percentage, -time, -seq, entry)
+        self.daily = Counter()
+        self.histogram = [0] * 101
+        self.entries = 0
+        self.total = 0.0
+        self.latest = None
+
+    def add(self, seq, entry):
+        percentage = float(plain(entry.get('percentage')) or 0)
+        completed = plain(entry.get('completedAt') or entry.get('date'))
+
+        self.entries += 1
+        self.total += percentage
+        self.histogram[min(100, max(0, int(percentage)))] += 1
+        if completed:
+            self.daily[str(completed)[:10]] += 1
+            if self.latest is None or timestamp(completed) > timestamp(self.latest):
+                self.latest = completed
+
+        # Better is a higher score, then an earlier finish, then earlier in the input
+        item = (percentage, -timestamp(completed), -seq,
+                {field: plain(entry.get(field)) for field in PUBLIC_FIELDS})
+        if len(self.top) < self.top_k:
+            heapq.heappush(self.top, item)
+        elif item > self.top[0]:
+            heapq.heapreplace(self.top, item)
+
+    def percentile(self, p):
+        """Lowest whole percentage at or below which p% of the scores are"""
+        rank = max(1, -(-self.entries * p // 100))
+        seen = 0
+        for score, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank:
+                return score
+        return 100
+
+    def snapshot(self, quiz_id):
+        ranked = sorted(self.top, reverse=True)
+        deciles = {f'{low}-{low + 9}': sum(self.histogram[low:low + 10]) for low in range(0, 100, 10)}
+        deciles['100'] = self.histogram[100]
+        return {
+            'quizId': quiz_id,
+            'topK': self.top_k,
+            'entries': self.entries,
+            'through': self.latest,
+            'average': round(self.total / self.entries, 1),
+            'percentiles': {f'p{p}': self.percentile(p) for p in PERCENTILES},
+            'top': [dict(entry, rank=rank) for rank, (*_, entry) in enumerate(ranked, 1)],
+            'histogram': deciles,
+            'daily': dict(sorted(self.daily.items())),
+        }
+
+
+def site_quiz_ids(quiz_dir=QUIZ_DIR):
+    """IDs of the quizzes the site serves, from the quiz export's manifest"""
+    return {quiz['id'] for quiz in read_json(os.path.join(quiz_dir, MANIFEST_FILE))['quizzes']}
+
+
+def aggregate(entries, top_k=DEFAULT_TOP_K, quiz_ids=None):
+    """{site quiz ID: QuizStats} over the entries, in one pass, plus a
+    Counter of the entries skipped per quiz ID that is not in `quiz_ids`"""
+    quizzes = defaultdict(lambda: QuizStats(top_k))
+    skipped = Counter()
+    for seq, entry in enumerate(entries):
+        quiz_id = plain(entry.get('quizId'))
+        if quiz_id is None:
+            continue
+        quiz_id = LEGACY_QUIZ_IDS.get(str(quiz_id), str(quiz_id))
+        if quiz_ids is not None and quiz_id not in quiz_ids:
+            skipped[quiz_id] += 1
+            continue
+        quizzes[quiz_id].add(seq, entry)
+    return quizzes, skipped
+
+
+def quiz_file(quiz_id):
+    return 'quiz-' + re.sub(r'[^\w.-]+', '-', quiz_id) + '.json'
+
+
+def write_snapshots(quizzes, out_dir=DEFAULT_OUT_DIR):
+    """Write index.json and one file per quiz; returns the index"""
+    os.makedirs(out_dir, exist_ok=True)
+    index_path = os.path.join(out_dir, INDEX_FILE)
+    with locked(out_dir):
+        previous = read_json(index_path)['quizzes'] if os.path.exists(index_path) else {}
+
+        index = {'entries': 0, 'quizzes': {}}
+        for quiz_id in sorted(quizzes):
+            snapshot = quizzes[quiz_id].snapshot(quiz_id)
+            name = quiz_file(quiz_id)
+            write_text(os.path.join(out_dir, name), dumps(snapshot))
+            index['entries'] += snapshot['entries']
+            index['quizzes'][quiz_id] = {
+                'entries': snapshot['entries'],
+                'best': snapshot['top'][0]['percentage'],
+                'average': snapshot['average'],
+                'through': snapshot['through'],
+                'topK': snapshot['topK'],
+                'file': name,
+            }
+        write_text(index_path, dumps(index))
+
+        # Quizzes that have no entries any more
+        for quiz_id, entry in previous.items():
+            path = os.path.join(out_dir, entry['file'])
+            if quiz_id not in index['quizzes'] and os.path.exists(path):
+                os.remove(path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute the leaderboard snapshots')
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='leaderboard .json or .jsonl export')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, help='entries kept per quiz')
+    parser.add_argument('--out-dir', default=DEFAULT_OUT_DIR)
+    args = parser.parse_args()
+
+    print("=== Leaderboard Snapshots ===\n")
+    print(f"📂 Reading: {args.input}")
+
+    started = time.perf_counter()
+    quizzes, skipped = aggregate(iter_entries(args.input), args.top_k, site_quiz_ids())
+    aggregated = time.perf_counter()
+    index = write_snapshots(quizzes, args.out_dir)
+    written = time.perf_counter()
+
+    print(f"📊 {index['entries']} entries for {len(index['quizzes'])} quizzes, "
+          f"aggregated in {aggregated - started:.3f}s")
+    for quiz_id, entry in index['quizzes'].items():
+        print(f"   quiz {quiz_id}: {entry['entries']} entries, best {entry['best']}%, "
+              f"average {entry['average']}%")
+    for quiz_id, count in skipped.items():
+        print(f"   ⏭️  quiz {quiz_id}: {count} entries skipped, the site has no such quiz")
+    print(f"\n💾 Saved to: {args.out_dir} in {written - aggregated:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
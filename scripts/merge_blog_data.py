@@ -35,6 +35,10 @@ for old_post in old_data['posts']:
             'publishedAt': old_post['publishedAt'],
             'author': old_post['author']
         }
+        # Keep the image and what --incremental compares against
+        for key in ('featuredImage', 'modifiedAt', 'sourceHash'):
+            if key in new_post:
+                merged_post[key] = new_post[key]
 
         merged_posts.append(merged_post)
         print(f"✓ Merged: {merged_post['title'][:50]} ({len(merged_post['content'])} chars)")
@@ -3,7 +3,9 @@
 
 require('dotenv').config({ path: '.env' });
 const { MongoClient } = require('mongodb');
-const blogPostsData = require('../src/data/blog_posts.json');
+const { loadBlogData } = require('./blog_store');
+
+const blogPostsData = loadBlogData({ content: false });
 
 async function migrateBlogViews() {
   if (!process.env.MONGODB_URI) {
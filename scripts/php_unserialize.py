@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+PHP unserialize() for values read from the dump
+Decodes PHP's serialize() format straight from the str that wp_dump
+returns. String lengths in that format count UTF-8 bytes, so strings are
+sliced by characters and only measured again when they hold non-ASCII text;
+the value is never encoded back to bytes as a whole.
+
+Arrays become lists when their keys are 0..n-1 and dicts otherwise; objects
+become PhpObject dicts of their properties, named without PHP's private and
+protected markers ('\\0*\\0_answer' -> '_answer').
+"""
+
+import re
+import sys
+
+
+class PhpSerializeError(ValueError):
+    pass
+
+
+class PhpObject(dict):
+    """Properties of an unserialized PHP object; the class is in class_name"""
+
+    __slots__ = ('class_name',)
+
+    def __init__(self, class_name):
+        super().__init__()
+        self.class_name = class_name
+
+
+# Class and property names as written -> interned names without markers.
+# A dump repeats the same few (e.g. WpProQuiz_Model_AnswerTypes) in every row
+_names = {}
+
+
+def _name(raw):
+    name = _names.get(raw)
+    if name is None:
+        name = _names[raw] = sys.intern(raw.rpartition('\0')[2])
+    return name
+
+
+def _string_end(text, start, size):
+    """Index `size` UTF-8 bytes after `start`, or -1 if no character ends there"""
+    i, length = start, 0
+    while length < size and i < len(text):
+        c = ord(text[i])
+        length += 1 if c < 0x80 else 2 if c < 0x800 else 3 if c < 0x10000 else 4
+        i += 1
+    return i if length == size else -1
+
+
+# One value's header: the group that matched tells the type
+TOKEN_RE = re.compile(
+    r's:(\d+):"|i:([-+]?\d+);|b:([01]);|(N);|a:(\d+):\{|d:([^;]*);|O:\d+:"([^"]*)":(\d+):\{'
+)
+STRING, INT, BOOL, NULL, ARRAY, FLOAT, CLASS, PROPERTIES = range(1, 9)
+
+FLOATS = {'INF': float('inf'), '-INF': float('-inf'), 'NAN': float('nan')}
+
+
+class _Reader:
+    def __init__(self, text, repair):
+        self.text = text
+        self.repair = repair
+        self.repaired = 0
+
+    def error(self, pos, message):
+        return PhpSerializeError(f"{message} at offset {pos}")
+
+    def close(self, pos):
+        """Skip the '}' that ends an array or object"""
+        if not self.text.startswith('}', pos):
+            raise self.error(pos, "expected '}'")
+        return pos + 1
+
+    def string(self, start, size):
+        """The string of `size` bytes at start, and the position after '";'"""
+        text = self.text
+        end = start + size
+        if not text[start:end].isascii():
+            end = _string_end(text, start, size)
+        if end < 0 or not text.startswith('";', end):
+            # The dump was re-encoded after serializing, so the byte count
+            # is off; take the string up to its closing '";' instead
+            end = text.find('";', start)
+            if not self.repair or end < 0:
+                raise self.error(start, f'string of {size} bytes does not end there')
+            self.repaired += 1
+        return text[start:end], end + 2
+
+    def value(self, pos):
+        """Decode the value at pos; returns (value, position after it)"""
+        m = TOKEN_RE.match(self.text, pos)
+        if m is None:
+            raise self.error(pos, f"unsupported value {self.text[pos:pos + 1]!r}")
+        kind = m.lastindex
+        pos = m.end()
+        if kind == STRING:
+            return self.string(pos, int(m.group(STRING)))
+        if kind == INT:
+            return int(m.group(INT)), pos
+        if kind == BOOL:
+            return m.group(BOOL) == '1', pos
+        if kind == NULL:
+            return None, pos
+        if kind == FLOAT:
+            raw = m.group(FLOAT)
+            return FLOATS[raw] if raw in FLOATS else float(raw), pos
+        if kind == ARRAY:
+            items = {}
+            for _ in range(int(m.group(ARRAY))):
+                key, pos = self.value(pos)
+                items[key], pos = self.value(pos)
+            pos = self.close(pos)
+            if all(key == i for i, key in enumerate(items)):
+                return list(items.values()), pos
+            return items, pos
+
+        # Object: its properties follow like an array's items
+        obj = PhpObject(_name(m.group(CLASS)))
+        for _ in range(int(m.group(PROPERTIES))):
+            key, pos = self.value(pos)
+            obj[_name(key) if isinstance(key, str) else key], pos = self.value(pos)
+        return obj, self.close(pos)
+
+
+def loads(text, repair=True):
+    """Unserialize a PHP serialize() string
+
+    With `repair`, strings whose byte count does not match (a common result
+    of a database converted to another charset after the data was written)
+    are read up to their closing quote instead of failing.
+    """
+    value, _ = loads_counted(text, repair)
+    return value
+
+
+def loads_counted(text, repair=True):
+    """loads(), plus the number of strings whose length had to be repaired"""
+    reader = _Reader(text, repair)
+    value, pos = reader.value(0)
+    if pos != len(text.rstrip()):
+        raise reader.error(pos, 'trailing data')
+    return value, reader.repaired
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Shared question bank for the quiz files
+Reads every quiz file under src/data in one pass and folds their questions
+into one canonical store: questions that are the same once normalized
+(case, punctuation, whitespace, option order) are merged by hash, and
+near-duplicates (reworded questions with the same image and the same
+correct answer) are found with MinHash signatures bucketed by LSH and
+merged as well. Each quiz then lists the IDs of its questions.
+
+Question IDs are hashes of the normalized question, so they stay the same
+from one build to the next as long as the question does.
+
+Usage: python3 scripts/quiz_bank.py [FILE ...] [--threshold 0.8]
+           [--output src/data/question-bank.json] [--report]
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import struct
+import time
+import unicodedata
+from collections import defaultdict
+
+from data_store import dumps, read_json, write_json
+
+DEFAULT_BANK_FILES = [
+    'src/data/quizzes.json',
+    'src/data/quizzes_temp.json',
+    'src/data/quizzes_with_425.json',
+    'src/data/quizzes.json.backup',
+    'src/data/turkish-quizzes.json',
+    'src/data/chinese-quizzes.json',
+    'src/data/spanish-sign-test.json',
+    'src/data/turkish-sign-test.json',
+]
+DEFAULT_OUTPUT = 'src/data/question-bank.json'
+
+# Jaccard similarity of the question texts' shingles for a near-duplicate
+DEFAULT_THRESHOLD = 0.8
+
+# ... and of their correct answers' ("Parking for a disabled person with a
+# placard" / "Parking is for disabled persons with a placard" is 0.62);
+# answers that differ in a number are never the same
+ANSWER_THRESHOLD = 0.6
+
+# Characters per shingle; character shingles work for Chinese, which has no
+# spaces between words, as well as for the other languages
+SHINGLE_SIZE = 4
+
+# MinHash signature of BANDS * ROWS values; two questions become candidates
+# when all ROWS values of any band agree. With 16 x 4 a pair at 0.8
+# similarity is a candidate with probability 0.9998 and one at 0.3 with 0.12
+BANDS = 16
+ROWS = 4
+
+# One SHAKE-128 digest per shingle gives all of its BANDS * ROWS 32-bit
+# hash values at once, which is ~4x faster than (a*x + b) % p per value
+SIGNATURE = struct.Struct(f'<{BANDS * ROWS}I')
+
+# Per-quiz fields; the rest of a question goes into the bank
+QUESTION_NUMBER = 'id'
+
+
+def normalize(text):
+    """Text as compared: entities decoded, NFKC, case-folded, punctuation and
+    extra whitespace removed"""
+    text = unicodedata.normalize('NFKC', html.unescape(text or '')).casefold()
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text).split())
+
+
+def exact_key(question):
+    """Hash of what makes two questions the same question"""
+    options = [normalize(option) for option in question.get('options', [])]
+    correct = question.get('correctAnswer')
+    answer = options[correct] if isinstance(correct, int) and 0 <= correct < len(options) else None
+    key = [normalize(question.get('question')), sorted(options), answer, question.get('image')]
+    return hashlib.sha1(json.dumps(key, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def correct_text(question):
+    options = question.get('options', [])
+    correct = question.get('correctAnswer')
+    if isinstance(correct, int) and 0 <= correct < len(options):
+        return normalize(options[correct])
+    return ''
+
+
+def same_answer(a, b):
+    """Whether two normalized correct answers say the same thing"""
+    if a == b:
+        return True
+    if re.findall(r'\d+', a) != re.findall(r'\d+', b):
+        return False
+    return jaccard(shingles(a), shingles(b)) >= ANSWER_THRESHOLD
+
+
+def shingles(text):
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set):
+    """MinHash signature of a set of shingles: per hash function, the
+    smallest value any shingle gets"""
+    size = SIGNATURE.size
+    rows = [SIGNATURE.unpack(hashlib.shake_128(shingle.encode('utf-8')).digest(size))
+            for shingle in shingle_set]
+    return list(map(min, zip(*rows)))
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def load_quizzes(path):
+    """The quizzes of a file: {"quizzes": [...]} or a single {"quiz": {...}}"""
+    data = read_json(path)
+    if 'quizzes' in data:
+        return data['quizzes']
+    return [data['quiz']]
+
+
+class _Clusters:
+    """Union-find over question indexes; the earliest index leads a cluster"""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)
+
+
+def build_bank(paths, threshold=DEFAULT_THRESHOLD):
+    """Fold the quizzes of `paths` into one question bank
+
+    Returns (bank, report). bank is {'questions': {id: question},
+    'quizzes': [quiz metadata + 'source' + 'questions': [ids]]}; report
+    lists the merged near-duplicates and the similar questions that were
+    kept apart because their correct answers differ; questions with
+    different images are never compared.
+    """
+    quizzes = []
+    unique = []          # first occurrence of every distinct question
+    unique_keys = []
+    index_of_key = {}
+    quiz_refs = []       # per quiz, indexes into unique
+    total = 0
+
+    for path in paths:
+        source = os.path.basename(path)
+        for quiz in load_quizzes(path):
+            refs = []
+            for question in quiz.get('questions', []):
+                total += 1
+                key = exact_key(question)
+                if key not in index_of_key:
+                    index_of_key[key] = len(unique)
+                    unique.append(question)
+                    unique_keys.append(key)
+                refs.append(index_of_key[key])
+            meta = {k: v for k, v in quiz.items() if k != 'questions'}
+            meta['source'] = source
+            quizzes.append(meta)
+            quiz_refs.append(refs)
+
+    # Near-duplicates: candidates from LSH buckets, confirmed on the shingles
+    texts = [shingles(normalize(question.get('question'))) for question in unique]
+    answers = [correct_text(question) for question in unique]
+    buckets = defaultdict(list)
+    for i, question in enumerate(unique):
+        signature = minhash(texts[i])
+        for band in range(BANDS):
+            rows = tuple(signature[band * ROWS:(band + 1) * ROWS])
+            buckets[(question.get('image'), band, rows)].append(i)
+
+    clusters = _Clusters(len(unique))
+    compared = set()
+    merged = []
+    similar = []
+    for members in buckets.values():
+        for n, i in enumerate(members):
+            for j in members[n + 1:]:
+                if (i, j) in compared:
+                    continue
+                compared.add((i, j))
+                similarity = jaccard(texts[i], texts[j])
+                if similarity < threshold:
+                    continue
+                pair = (i, j, round(similarity, 3))
+                if same_answer(answers[i], answers[j]):
+                    clusters.union(i, j)
+                    merged.append(pair)
+                else:
+                    similar.append(pair)
+
+    question_id = {}
+    questions = {}
+    for i, question in enumerate(unique):
+        leader = clusters.find(i)
+        if leader not in question_id:
+            question_id[leader] = 'q' + unique_keys[leader][:12]
+            questions[question_id[leader]] = {k: v for k, v in unique[leader].items()
+                                              if k != QUESTION_NUMBER}
+        question_id[i] = question_id[leader]
+
+    for meta, refs in zip(quizzes, quiz_refs):
+        meta['questions'] = [question_id[i] for i in refs]
+
+    def describe(pairs):
+        return [{'kept': question_id[i], 'question': unique[i].get('question'),
+                 'other': unique[j].get('question'), 'similarity': similarity}
+                for i, j, similarity in pairs]
+
+    report = {
+        'questions': total,
+        'distinct': len(unique),
+        'canonical': len(questions),
+        'candidate_pairs': len(compared),
+        'merged': describe(merged),
+        'similar': describe(similar),
+    }
+    return {'questions': questions, 'quizzes': quizzes}, report
+
+
+def quiz_questions(bank, quiz):
+    """A bank quiz's questions as the quiz files hold them, numbered from 1"""
+    return [dict(bank['questions'][question_id], id=number)
+            for number, question_id in enumerate(quiz['questions'], 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build one deduplicated question bank from the quiz files')
+    parser.add_argument('files', nargs='*', help='quiz files (default: the ones under src/data)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='question text similarity (0-1) of a near-duplicate')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--report', action='store_true', help='list the near-duplicates found')
+    args = parser.parse_args()
+
+    print("=== Quiz Question Bank ===\n")
+
+    paths = args.files or [path for path in DEFAULT_BANK_FILES if os.path.exists(path)]
+    for path in paths:
+        print(f"📂 {path}")
+
+    started = time.perf_counter()
+    bank, report = build_bank(paths, args.threshold)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n📊 {report['questions']} questions in {len(bank['quizzes'])} quizzes")
+    print(f"   {report['distinct']} distinct after exact matching")
+    print(f"   {report['canonical']} after merging {len(report['merged'])} near-duplicate(s) "
+          f"({report['candidate_pairs']} candidate pairs compared)")
+    print(f"   {len(report['similar'])} similar question pair(s) kept apart (different answers)")
+    print(f"⏱️  Built in {elapsed:.2f}s")
+
+    if args.report:
+        for title, pairs in (('Merged', report['merged']), ('Kept apart', report['similar'])):
+            if pairs:
+                print(f"\n{title}:")
+            for pair in pairs:
+                print(f"   [{pair['similarity']}] {pair['question']}\n"
+                      f"           {pair['other']}")
+
+    before = sum(os.path.getsize(path) for path in paths)
+    write_json(args.output, bank)
+    print(f"\n💾 Saved to: {args.output} ({len(dumps(bank).encode('utf-8')) / 1024:.0f} KB, "
+          f"the quiz files hold {before / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
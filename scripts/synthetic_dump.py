@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Synthetic WordPress dump generator
+Writes a mysqldump-style SQL file with wp_posts, wp_postmeta, term and
+WP Pro Quiz tables, so the extractors can be measured without the real dump
+
+Usage: python3 scripts/synthetic_dump.py output.sql [--posts 1000] [--body-size 20000]
+           [--meta-per-post 4] [--rows-per-insert 100] [--escapes] [--seed 1]
+"""
+
+import argparse
+import os
+import random
+
+from wp_dump import COLUMNS
+
+# Columns of wp_wp_pro_quiz_master that build_quiz() reads (id, name, text)
+# plus the result text that follows them in the real table
+QUIZ_MASTER_COLUMNS = ('id', 'name', 'text', 'result_text')
+
+# mysqldump escapes these bytes inside string literals
+SQL_ESCAPES = str.maketrans({
+    '\\': '\\\\', "'": "\\'", '"': '\\"', '\n': '\\n', '\r': '\\r',
+    '\0': '\\0', '\x1a': '\\Z',
+})
+
+WORDS = (
+    'california', 'dmv', 'permit', 'test', 'license', 'driving', 'road', 'sign',
+    'lane', 'speed', 'limit', 'vehicle', 'insurance', 'registration', 'office',
+    'appointment', 'written', 'exam', 'practice', 'question', 'answer', 'rules'
+)
+
+# Content that trips naive parsers: quotes, backslash runs, row and statement
+# separators, comment markers, control bytes and multi-byte characters
+PATHOLOGICAL = (
+    "Don't say \"never\"", 'C:\\path\\to\\n\\file', '),(', "');", '-- not a comment',
+    '\\\\\\', "''", '\0', '\x1a', '\r\n', '\t', 'é ü ñ 中文 🚗', '\\%_', 'a;b;c'
+)
+
+
+def sql_string(value):
+    return "'" + value.translate(SQL_ESCAPES) + "'"
+
+
+def sql_value(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, int):
+        return str(value)
+    return sql_string(value)
+
+
+def make_body(rng, size, escapes):
+    """HTML post content of about `size` characters"""
+    parts = []
+    length = 0
+    while length < size:
+        words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))
+        if escapes:
+            words += ' ' + rng.choice(PATHOLOGICAL)
+        paragraph = f'<p>{words}.</p>\r\n'
+        if rng.random() < 0.2:
+            paragraph += f'<img src="https://www.dmvcalifornia.us/wp-content/uploads/{rng.randint(1, 999)}.jpg">\r\n'
+        parts.append(paragraph)
+        length += len(paragraph)
+    return ''.join(parts)
+
+
+def php_string(value):
+    return f's:{len(value.encode("utf-8"))}:"{value}";'
+
+
+def answer_data(rng, answers):
+    """Serialized PHP array of WpProQuiz_Model_AnswerTypes objects"""
+    correct = rng.randrange(len(answers))
+    items = []
+    for i, answer in enumerate(answers):
+        props = [
+            ('_answer', php_string(answer)),
+            ('_html', 'b:0;'),
+            ('_points', 'i:1;'),
+            ('_correct', f'b:{int(i == correct)};'),
+            ('_sortString', php_string('')),
+            ('_sortStringHtml', 'b:0;'),
+            ('_mapper', 'N;'),
+        ]
+        body = ''.join(php_string(f'\0*\0{name}') + value for name, value in props)
+        items.append(f'i:{i};O:27:"WpProQuiz_Model_AnswerTypes":{len(props)}:{{{body}}}')
+    return f'a:{len(answers)}:{{{"".join(items)}}}'
+
+
+class DumpWriter:
+    """Writes tables the way mysqldump does, `rows_per_insert` rows per INSERT"""
+
+    def __init__(self, f, rows_per_insert):
+        self.f = f
+        self.rows_per_insert = max(1, rows_per_insert)
+        self.counts = {}
+
+    def table(self, name, columns, rows):
+        f = self.f
+        f.write(f'\n--\n-- Table structure for table `{name}`\n--\n\n')
+        f.write(f'DROP TABLE IF EXISTS `{name}`;\n')
+        definitions = ',\n'.join(f'  `{column}` longtext' for column in columns)
+        f.write(f"CREATE TABLE `{name}` (\n{definitions}\n) ENGINE=InnoDB "
+                f"COMMENT='synthetic; not real data';\n\n")
+        f.write(f'LOCK TABLES `{name}` WRITE;\n')
+        f.write(f'/*!40000 ALTER TABLE `{name}` DISABLE KEYS */;\n')
+
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append('(' + ','.join(sql_value(value) for value in row) + ')')
+            count += 1
+            if len(batch) == self.rows_per_insert:
+                f.write(f"INSERT INTO `{name}` VALUES {','.join(batch)};\n")
+                batch = []
+        if batch:
+            f.write(f"INSERT INTO `{name}` VALUES {','.join(batch)};\n")
+
+        f.write(f'/*!40000 ALTER TABLE `{name}` ENABLE KEYS */;\nUNLOCK TABLES;\n')
+        self.counts[name] = count
+
+
+def generate_dump(path, posts=1000, body_size=20000, meta_per_post=4,
+                  rows_per_insert=100, escapes=False, tags=50, quizzes=4,
+                  questions_per_quiz=40, seed=1):
+    """Write a synthetic dump to `path` and return a summary of what is in it
+
+    Post IDs run from 1 to `posts`; each post has an attachment (its featured
+    image) with ID `posts` + its own ID. About 70% of the posts are published
+    posts, the rest pages, drafts and revisions. `meta_per_post` is the number
+    of wp_postmeta rows per post (at least the _thumbnail_id and focus
+    keyword rows). `rows_per_insert` of 1 gives single-row INSERTs.
+    """
+    rng = random.Random(seed)
+    date = '2023-05-01 10:00:00'
+
+    def post_rows():
+        for post_id in range(1, posts + 1):
+            roll = rng.random()
+            if roll < 0.7:
+                post_type, status, name = 'post', 'publish', f'post-{post_id}'
+            elif roll < 0.8:
+                post_type, status, name = 'page', 'publish', f'page-{post_id}'
+            elif roll < 0.9:
+                post_type, status, name = 'post', 'draft', f'draft-{post_id}'
+            else:
+                post_type, status, name = 'revision', 'inherit', f'{post_id}-revision-v1'
+            title = f'{rng.choice(WORDS).title()} {rng.choice(WORDS)} guide {post_id}'
+            if escapes:
+                title += " - Don't \"panic\""
+            size = rng.randint(body_size // 2, body_size * 3 // 2)
+            yield (
+                post_id, 1, date, date, make_body(rng, size, escapes), title, '',
+                status, 'open', 'open', '', name, '', '', date, date, '', 0,
+                f'https://www.dmvcalifornia.us/?p={post_id}', 0, post_type, '', 0
+            )
+        for post_id in range(1, posts + 1):
+            attachment_id = posts + post_id
+            url = f'https://www.dmvcalifornia.us/wp-content/uploads/2023/05/image-{post_id}.jpg'
+            if post_id % 5 == 0:
+                # Some attachments only have an ?attachment_id= guid
+                url = f'https://www.dmvcalifornia.us/?attachment_id={attachment_id}'
+            yield (
+                attachment_id, 1, date, date, '', f'image-{post_id}', '', 'inherit',
+                'open', 'closed', '', f'image-{post_id}', '', '', date, date, '',
+                post_id, url, 0, 'attachment', 'image/jpeg', 0
+            )
+
+    def meta_rows():
+        meta_id = 0
+        for post_id in range(1, posts + 1):
+            meta = [('_thumbnail_id', str(posts + post_id)),
+                    ('rank_math_focus_keyword', f'{rng.choice(WORDS)}, {rng.choice(WORDS)} test')]
+            for i in range(max(0, meta_per_post - len(meta))):
+                meta.append((f'_edit_lock_{i}', f'{1700000000 + post_id}:1'))
+            for key, value in meta:
+                meta_id += 1
+                yield meta_id, post_id, key, value
+        for post_id in range(1, posts + 1):
+            meta_id += 1
+            yield meta_id, posts + post_id, '_wp_attached_file', f'2023/05/image-{post_id}.jpg'
+
+    def term_rows():
+        for term_id in range(1, tags + 1):
+            yield term_id, f'{WORDS[term_id % len(WORDS)]} {term_id}', f'tag-{term_id}', 0
+
+    def taxonomy_rows():
+        for term_id in range(1, tags + 1):
+            taxonomy = 'category' if term_id % 10 == 0 else 'post_tag'
+            yield term_id, term_id, taxonomy, '', 0, 0
+
+    def relationship_rows():
+        for post_id in range(1, posts + 1):
+            for term_id in rng.sample(range(1, tags + 1), min(tags, rng.randint(0, 3))):
+                yield post_id, term_id, 0
+
+    def quiz_rows():
+        for quiz_id in range(1, quizzes + 1):
+            yield quiz_id, f'DMV Practice Test {quiz_id}', "Answer each question. It's timed.", ''
+
+    def question_rows():
+        question_id = 0
+        for quiz_id in range(1, quizzes + 1):
+            for sort in range(1, questions_per_quiz + 1):
+                question_id += 1
+                answers = [f'{rng.choice(WORDS)} {rng.choice(WORDS)}' for _ in range(3)]
+                yield (
+                    question_id, quiz_id, 1, sort, f'Question {question_id}', 1,
+                    f"What's the {rng.choice(WORDS)} rule for {rng.choice(WORDS)}?",
+                    'Correct!', 'Incorrect.', 0, 0, '', 'single', 0, 0,
+                    answer_data(rng, answers), 0, 0, 0, 20
+                )
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('-- MySQL dump 10.13  Distrib 8.0.33\n--\n-- Host: localhost    Database: synthetic\n')
+        f.write('/*!40101 SET NAMES utf8mb4 */;\n')
+        writer = DumpWriter(f, rows_per_insert)
+        writer.table('wp_posts', COLUMNS['wp_posts'], post_rows())
+        writer.table('wp_postmeta', COLUMNS['wp_postmeta'], meta_rows())
+        writer.table('wp_terms', COLUMNS['wp_terms'], term_rows())
+        writer.table('wp_term_taxonomy', COLUMNS['wp_term_taxonomy'], taxonomy_rows())
+        writer.table('wp_term_relationships', COLUMNS['wp_term_relationships'], relationship_rows())
+        writer.table('wp_wp_pro_quiz_master', QUIZ_MASTER_COLUMNS, quiz_rows())
+        writer.table('wp_wp_pro_quiz_question', COLUMNS['wp_wp_pro_quiz_question'], question_rows())
+        f.write('\n-- Dump completed\n')
+
+    return {
+        'path': path,
+        'bytes': os.path.getsize(path),
+        'posts': posts,
+        'body_size': body_size,
+        'meta_per_post': meta_per_post,
+        'rows_per_insert': rows_per_insert,
+        'escapes': escapes,
+        'seed': seed,
+        'rows': writer.counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic WordPress SQL dump')
+    parser.add_argument('output')
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--body-size', type=int, default=20000, help='average post_content characters')
+    parser.add_argument('--meta-per-post', type=int, default=4)
+    parser.add_argument('--rows-per-insert', type=int, default=100, help='1 for single-row INSERTs')
+    parser.add_argument('--escapes', action='store_true', help='add pathological escapes to posts')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print("=== Synthetic WordPress Dump ===\n")
+    info = generate_dump(args.output, posts=args.posts, body_size=args.body_size,
+                         meta_per_post=args.meta_per_post,
+                         rows_per_insert=args.rows_per_insert,
+                         escapes=args.escapes, seed=args.seed)
+    for table, count in info['rows'].items():
+        print(f"   {table}: {count:,} rows")
+    print(f"\n💾 Wrote {info['bytes'] / 1024 / 1024:.1f} MB to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@
 Add additional content to the traffic laws post
 """
 
-import json
+from blog_store import transaction
 
 additional_content = '''
 <h2>Other Notable Changes Affecting Drivers</h2>
@@ -32,30 +32,45 @@ additional_content = '''
 </ul>
 '''
 
-print("=== Updating Traffic Laws Post ===\n")
-
-# Load existing blog data
-with open('src/data/blog_posts.json', 'r', encoding='utf-8') as f:
-    blog_data = json.load(f)
-
-# Find and update the post
-for post in blog_data['posts']:
-    if post['slug'] == 'new-traffic-laws-for-california-drivers-in-2025':
-        old_length = len(post['content'])
-        post['content'] += additional_content
-        new_length = len(post['content'])
-        
-        print(f"✓ Updated: {post['title']}")
-        print(f"  Slug: /{post['slug']}")
-        print(f"  Content: {old_length} → {new_length} characters (+{new_length - old_length})")
-        print(f"  Added sections: Other Notable Changes, Summary, Sources")
-        break
-
-# Save updated data
-with open('src/data/blog_posts.json', 'w', encoding='utf-8') as f:
-    json.dump(blog_data, f, indent=2, ensure_ascii=False)
-
-print("\n✅ Post updated successfully")
-print("💾 Saved updated blog_posts.json")
-print("\nView the updated article at:")
-print("  • http://localhost:3001/new-traffic-laws-for-california-drivers-in-2025/")
+TRAFFIC_LAWS_SLUG = 'new-traffic-laws-for-california-drivers-in-2025'
+
+# First heading of additional_content; the post has the sections once it is there
+ADDED_HEADING = '<h2>Other Notable Changes Affecting Drivers</h2>'
+
+# Bump when additional_content changes so the stage looks at the post again
+VERSION = 1
+
+def extend_traffic_laws_post(post):
+    """Append the additional sections to the traffic laws post, once"""
+    if post['slug'] != TRAFFIC_LAWS_SLUG or ADDED_HEADING in post['content']:
+        return False
+    post['content'] += additional_content
+    return True
+
+def main():
+    print("=== Updating Traffic Laws Post ===\n")
+
+    # Update the blog data in one transaction
+    with transaction() as blog_data:
+        # Find and update the post
+        for post in blog_data['posts']:
+            if post['slug'] == TRAFFIC_LAWS_SLUG:
+                old_length = len(post['content'])
+                if not extend_traffic_laws_post(post):
+                    print(f"⏭️  Already updated: {post['title']}")
+                    break
+                new_length = len(post['content'])
+
+                print(f"✓ Updated: {post['title']}")
+                print(f"  Slug: /{post['slug']}")
+                print(f"  Content: {old_length} → {new_length} characters (+{new_length - old_length})")
+                print(f"  Added sections: Other Notable Changes, Summary, Sources")
+                break
+
+    print("\n✅ Post updated successfully")
+    print("💾 Saved updated blog post store")
+    print("\nView the updated article at:")
+    print(f"  • http://localhost:3001/{TRAFFIC_LAWS_SLUG}/")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+WordPress dump cache
+Parses the SQL dump once into an indexed SQLite file so extractors can look
+up posts, postmeta and terms without rescanning the dump
+
+Usage: python3 scripts/wp_cache.py [sql_file] [--force]
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+
+from wp_dump import COLUMNS, iter_rows
+
+DEFAULT_SQL_FILE = 'data/wordpress/dmvcali2.sql'
+
+# Bump when the stored layout or value format changes to force a rebuild
+CACHE_VERSION = 2
+
+KEY_COLUMNS = {
+    'wp_posts': 'ID',
+    'wp_postmeta': 'meta_id',
+    'wp_terms': 'term_id',
+    'wp_term_taxonomy': 'term_taxonomy_id',
+}
+
+INDEXES = [
+    'CREATE INDEX wp_posts_name ON wp_posts (post_name)',
+    'CREATE INDEX wp_posts_type_status ON wp_posts (post_type, post_status)',
+    'CREATE INDEX wp_postmeta_post_key ON wp_postmeta (post_id, meta_key)',
+    'CREATE INDEX wp_term_taxonomy_term ON wp_term_taxonomy (term_id)',
+    'CREATE INDEX wp_term_relationships_object ON wp_term_relationships (object_id)',
+]
+
+CACHE_TABLES = [
+    'wp_posts', 'wp_postmeta', 'wp_terms', 'wp_term_taxonomy', 'wp_term_relationships'
+]
+
+# Columns holding numeric IDs we join or filter on
+INTEGER_COLUMNS = {'post_id', 'term_id', 'object_id', 'term_taxonomy_id', 'post_parent'}
+
+
+def default_cache_file(sql_file):
+    return sql_file + '.cache.sqlite'
+
+
+def file_hash(path):
+    """SHA-256 of a file, read in 1MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dump_stamp(sql_file):
+    stat = os.stat(sql_file)
+    return {'size': str(stat.st_size), 'mtime_ns': str(stat.st_mtime_ns)}
+
+
+def build_info(sql_file, version):
+    """dump_info entries identifying the dump a cache or index was built from"""
+    info = dump_stamp(sql_file)
+    info['sha256'] = file_hash(sql_file)
+    info['version'] = str(version)
+    info['built_at'] = str(time.time())
+    return info
+
+
+def _create_schema(conn):
+    for table in CACHE_TABLES:
+        columns = []
+        for column in COLUMNS[table]:
+            if column == KEY_COLUMNS.get(table):
+                columns.append(f'{column} INTEGER PRIMARY KEY')
+            elif column in INTEGER_COLUMNS:
+                columns.append(f'{column} INTEGER')
+            else:
+                columns.append(column)
+        conn.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+    conn.execute('CREATE TABLE dump_info (key TEXT PRIMARY KEY, value TEXT)')
+
+
+def ingest(sql_file, cache_file=None):
+    """Parse the dump into a fresh cache file and return its path
+
+    The cache is built under a temporary name and moved into place, so a
+    crash never leaves a half-written cache behind.
+    """
+    cache_file = cache_file or default_cache_file(sql_file)
+    tmp_file = cache_file + '.tmp'
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    conn = sqlite3.connect(tmp_file)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        _create_schema(conn)
+
+        inserts = {}
+        widths = {}
+        for table in CACHE_TABLES:
+            widths[table] = len(COLUMNS[table])
+            placeholders = ', '.join('?' * widths[table])
+            inserts[table] = f'INSERT OR REPLACE INTO {table} VALUES ({placeholders})'
+
+        counts = {table: 0 for table in CACHE_TABLES}
+        for table, row in iter_rows(sql_file, tables=CACHE_TABLES):
+            width = widths[table]
+            if len(row) != width:
+                row = (row + (None,) * width)[:width]
+            conn.execute(inserts[table], row)
+            counts[table] += 1
+
+        # Indexes are cheaper to build once the data is loaded
+        for statement in INDEXES:
+            conn.execute(statement)
+
+        info = build_info(sql_file, CACHE_VERSION)
+        for table, count in counts.items():
+            info[f'rows.{table}'] = str(count)
+        conn.executemany('INSERT INTO dump_info VALUES (?, ?)', info.items())
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_file, cache_file)
+    return cache_file
+
+
+def dump_info(conn):
+    """Return the dump_info table as a dict (empty for a broken cache file)"""
+    try:
+        return dict(conn.execute('SELECT key, value FROM dump_info'))
+    except sqlite3.DatabaseError:
+        return {}
+
+
+def is_fresh(conn, sql_file, version=CACHE_VERSION):
+    """Check that a cache matches the dump it was built from
+
+    Size and mtime are compared first; when they differ the dump is hashed,
+    so a touched but unchanged dump keeps its cache.
+    """
+    info = dump_info(conn)
+    if info.get('version') != str(version):
+        return False
+
+    stamp = dump_stamp(sql_file)
+    if info.get('size') == stamp['size'] and info.get('mtime_ns') == stamp['mtime_ns']:
+        return True
+
+    if info.get('size') != stamp['size'] or info.get('sha256') != file_hash(sql_file):
+        return False
+
+    conn.executemany('UPDATE dump_info SET value = ? WHERE key = ?',
+                     [(value, key) for key, value in stamp.items()])
+    conn.commit()
+    return True
+
+
+def open_cache(sql_file=DEFAULT_SQL_FILE, cache_file=None, force=False):
+    """Return a connection to an up-to-date cache of the dump
+
+    The dump is (re)ingested when there is no cache yet, when it is stale,
+    or when `force` is set. Rows come back as sqlite3.Row objects.
+    """
+    cache_file = cache_file or default_cache_file(sql_file)
+
+    if not force and os.path.exists(cache_file):
+        conn = sqlite3.connect(cache_file)
+        if is_fresh(conn, sql_file):
+            conn.row_factory = sqlite3.Row
+            return conn
+        conn.close()
+
+    ingest(sql_file, cache_file)
+    conn = sqlite3.connect(cache_file)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def get_post(conn, post_id):
+    """Return the wp_posts row with this ID as a dict, or None"""
+    row = conn.execute('SELECT * FROM wp_posts WHERE ID = ?', (post_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def get_post_by_slug(conn, slug, post_status='publish'):
+    """Return the post with this post_name (and status) as a dict, or None"""
+    row = conn.execute(
+        'SELECT * FROM wp_posts WHERE post_name = ? AND post_status = ? ORDER BY ID LIMIT 1',
+        (slug, post_status)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def get_posts(conn, post_type='post', post_status='publish'):
+    """Yield all posts of a type and status as dicts, in ID order"""
+    cursor = conn.execute(
+        'SELECT * FROM wp_posts WHERE post_type = ? AND post_status = ? ORDER BY ID',
+        (post_type, post_status)
+    )
+    for row in cursor:
+        yield dict(row)
+
+
+def get_meta(conn, post_id, meta_key):
+    """Return the first meta_value stored for (post_id, meta_key), or None"""
+    row = conn.execute(
+        'SELECT meta_value FROM wp_postmeta WHERE post_id = ? AND meta_key = ? ORDER BY meta_id LIMIT 1',
+        (post_id, meta_key)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the indexed cache of a WordPress SQL dump')
+    parser.add_argument('sql_file', nargs='?', default=DEFAULT_SQL_FILE)
+    parser.add_argument('--cache-file', help='defaults to <sql_file>.cache.sqlite')
+    parser.add_argument('--force', action='store_true', help='rebuild even if the cache is fresh')
+    args = parser.parse_args()
+
+    print("=== WordPress Dump Cache ===\n")
+    print(f"📂 Dump: {args.sql_file}")
+
+    started = time.time()
+    conn = open_cache(args.sql_file, args.cache_file, force=args.force)
+    info = dump_info(conn)
+    conn.close()
+
+    print(f"💾 Cache: {args.cache_file or default_cache_file(args.sql_file)}")
+    for table in CACHE_TABLES:
+        print(f"   {table}: {int(info.get(f'rows.{table}', 0)):,} rows")
+    print(f"\n✅ Ready in {time.time() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Extraction checkpoints
+Periodically saves how far a streaming extractor got through the dump (the
+table and byte offset after the last row it handled, and how many rows that
+was) together with its partial output, so a crashed run can continue from
+there with --resume instead of re-parsing the whole dump
+
+Extractors feed their rows through run_rows(), which records progress after
+each row and saves a checkpoint when the run fails between rows.
+"""
+
+import os
+import pickle
+import time
+
+from wp_cache import dump_stamp
+
+# Bump when the checkpoint layout changes; older checkpoints are then ignored
+CHECKPOINT_VERSION = 1
+
+# Seconds between checkpoints
+DEFAULT_INTERVAL = 30
+
+
+def default_checkpoint_file(sql_file, name):
+    return f'{sql_file}.{name}.checkpoint'
+
+
+class Checkpoint:
+    """Progress of one extractor (`name`) over one dump
+
+    The extractor calls update() after handling each row from
+    iter_row_spans() and passes `position` as that function's `resume`
+    argument. `state` is the extractor's partial output; it is pickled as is,
+    so it may hold any picklable objects and must be updated in place.
+    """
+
+    def __init__(self, sql_file, name, path=None, interval=DEFAULT_INTERVAL):
+        self.sql_file = sql_file
+        self.name = name
+        self.path = path or default_checkpoint_file(sql_file, name)
+        self.interval = interval
+        self.table = None
+        self.offset = None
+        self.rows = 0
+        self._saved_at = time.monotonic()
+
+    @property
+    def position(self):
+        """(table, offset) to resume from, or None to start at the top"""
+        return (self.table, self.offset) if self.table is not None else None
+
+    def load(self):
+        """Restore the saved position and return the saved state
+
+        Returns None (and starts from the top) when there is no checkpoint,
+        or when it belongs to another extractor, version or dump.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as f:
+            saved = pickle.load(f)
+        if (saved.get('version') != CHECKPOINT_VERSION or saved.get('name') != self.name
+                or saved.get('dump') != dump_stamp(self.sql_file)):
+            print(f"⚠️  Ignoring checkpoint {self.path}: it is for another dump or version")
+            return None
+        self.table = saved['table']
+        self.offset = saved['offset']
+        self.rows = saved['rows']
+        return saved['state']
+
+    def update(self, table, offset, state):
+        """Record that the row ending at `offset` in `table` has been handled,
+        saving a checkpoint when the interval has passed"""
+        self.table = table
+        self.offset = offset
+        self.rows += 1
+        if time.monotonic() - self._saved_at >= self.interval:
+            self.save(state)
+
+    def save(self, state):
+        """Write the checkpoint now (atomically, via a temporary file)"""
+        tmp_file = self.path + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({
+                'version': CHECKPOINT_VERSION,
+                'name': self.name,
+                'dump': dump_stamp(self.sql_file),
+                'table': self.table,
+                'offset': self.offset,
+                'rows': self.rows,
+                'state': state,
+                'saved_at': time.time(),
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, self.path)
+        self._saved_at = time.monotonic()
+
+    def clear(self):
+        """Remove the checkpoint once the run has finished"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def describe(self):
+        if self.table is None:
+            return "the start of the dump"
+        return f"byte {self.offset:,} in `{self.table}` ({self.rows:,} rows)"
+
+
+def run_rows(spans, handle_row, state, checkpoint=None):
+    """Call handle_row(state, table, row) for every row of `spans` (from
+    iter_row_spans()), recording each handled row in `checkpoint`
+
+    When the run fails between rows the checkpoint is saved, so --resume
+    continues after the last handled row. When handle_row() itself fails,
+    `state` may hold part of that row, which the position does not cover;
+    saving it would count the row twice on resume, so the last checkpoint
+    is kept instead. The checkpoint is removed once all rows are handled.
+    """
+    # True while a row is handled: state may then hold part of a row that the
+    # checkpoint position does not cover yet
+    in_step = False
+    try:
+        for table, row, offset, length in spans:
+            in_step = True
+            handle_row(state, table, row)
+            if checkpoint is not None:
+                checkpoint.update(table, offset + length, state)
+            in_step = False
+    except BaseException:
+        if checkpoint is not None and not in_step:
+            checkpoint.save(state)
+            print(f"\n💾 Checkpoint saved at {checkpoint.describe()}; rerun with --resume")
+        elif checkpoint is not None and os.path.exists(checkpoint.path):
+            print("\n💾 Failed inside a row; --resume continues from the last checkpoint")
+        raise
+
+    if checkpoint is not None:
+        checkpoint.clear()
@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+"""
+Streaming mysqldump reader
+Yields (table, row) records from the INSERT statements of a WordPress SQL dump
+without loading the whole file into memory
+"""
+
+import mmap
+import os
+import re
+from multiprocessing import Pool
+
+CHUNK_SIZE = 1024 * 1024
+# Target size of the byte ranges handed to each worker by iter_rows_parallel()
+RANGE_SIZE = 1024 * 1024
+
+# Column order of the WordPress tables we read (mysqldump writes rows in this order)
+COLUMNS = {
+    'wp_posts': (
+        'ID', 'post_author', 'post_date', 'post_date_gmt', 'post_content',
+        'post_title', 'post_excerpt', 'post_status', 'comment_status',
+        'ping_status', 'post_password', 'post_name', 'to_ping', 'pinged',
+        'post_modified', 'post_modified_gmt', 'post_content_filtered',
+        'post_parent', 'guid', 'menu_order', 'post_type', 'post_mime_type',
+        'comment_count'
+    ),
+    'wp_postmeta': ('meta_id', 'post_id', 'meta_key', 'meta_value'),
+    'wp_terms': ('term_id', 'name', 'slug', 'term_group'),
+    'wp_term_taxonomy': (
+        'term_taxonomy_id', 'term_id', 'taxonomy', 'description', 'parent', 'count'
+    ),
+    'wp_term_relationships': ('object_id', 'term_taxonomy_id', 'term_order'),
+    'wp_wp_pro_quiz_question': (
+        'id', 'quiz_id', 'online', 'sort', 'title', 'points', 'question',
+        'correct_msg', 'incorrect_msg', 'correct_same_text', 'tip_enabled',
+        'tip_msg', 'answer_type', 'show_points_in_box',
+        'answer_points_activated', 'answer_data', 'category_id',
+        'answer_points_diff_modus_activated', 'disable_correct',
+        'matrix_sort_answer_criteria_width'
+    ),
+}
+
+INSERT_RE = re.compile(
+    rb"INSERT\s+INTO\s+`?([^`\s(]+)`?\s*(?:\([^)]*\)\s*)?VALUES\s*",
+    re.IGNORECASE
+)
+# Whitespace and line comments between statements
+GAP_RE = re.compile(rb"(?:\s+|--[^\n]*\n|#[^\n]*\n)*")
+# One complete quoted string
+STRING_RE = re.compile(rb"'[^'\\]*(?:\\.[^'\\]*)*'", re.DOTALL)
+# Longest run of bytes that holds no ';' outside a complete quoted string
+SKIP_RE = re.compile(rb"[^';]*(?:'[^'\\]*(?:\\.[^'\\]*)*'[^';]*)*", re.DOTALL)
+# One field of a row tuple and the ',' or ')' after it: either a string
+# literal (with any '' continuations) or a bare token such as a number or NULL
+FIELD_RE = re.compile(
+    rb"\s*(?:((?:'[^'\\]*(?:\\.[^'\\]*)*')+)|([^',)]*?))\s*[,)]", re.DOTALL
+)
+# The same without the separator, to tell a cut-off row from a malformed one
+VALUE_RE = re.compile(rb"\s*(?:(?:'[^'\\]*(?:\\.[^'\\]*)*')+|[^',)]*)\s*", re.DOTALL)
+# One complete '(...)' row tuple; outside quotes, values never contain parentheses
+_ROW = rb"\([^'()]*(?:'[^'\\]*(?:\\.[^'\\]*)*'[^'()]*)*\)"
+ROW_RE = re.compile(_ROW, re.DOTALL)
+# As many complete rows (and the commas between them) as fit before `endpos`
+ROWS_RE = re.compile(_ROW + rb"(?:\s*,\s*" + _ROW + rb")*", re.DOTALL)
+# What may follow a row: another row or the end of the statement
+ROW_SEP_RE = re.compile(rb"\s*([,;])\s*")
+
+# What each byte after a backslash in a string literal stands for: the
+# mysqldump escapes, \% and \_ (which keep their backslash, as in MySQL),
+# and any other byte for itself
+UNESCAPED = [bytes([c]) for c in range(256)]
+for _char, _value in zip(b"0bnrtZ%_", (b"\0", b"\b", b"\n", b"\r", b"\t", b"\x1a", b"\\%", b"\\_")):
+    UNESCAPED[_char] = _value
+
+# Longest INSERT ... VALUES head we expect (covers --complete-insert column lists)
+MAX_HEAD = 64 * 1024
+
+QUOTE = ord("'")
+COMMA = ord(',')
+OPEN = ord('(')
+CLOSE = ord(')')
+SEMICOLON = ord(';')
+SPACE = frozenset(b' \t\r\n')
+
+
+class DumpWindow:
+    """Sliding window over a dump file, refilled in fixed-size chunks
+
+    `data` holds the unread part of the file, starting at absolute byte
+    `offset`. Parsers work on positions inside `data` and call more() when
+    they run out of bytes; more() drops everything before the given position,
+    so memory stays bounded by the chunk size plus the largest single row.
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.data = b''
+        self.offset = 0
+        self.eof = False
+
+    def more(self, keep):
+        """Discard data before `keep` and read the next chunk
+
+        Returns the new position of `keep` (always 0), or None at end of file.
+        Reads grow with the data kept, so a row larger than a chunk is
+        re-scanned a logarithmic rather than linear number of times.
+        """
+        chunk = self.f.read(max(self.chunk_size, len(self.data) - keep))
+        if not chunk:
+            self.eof = True
+            return None
+        self.offset += keep
+        self.data = self.data[keep:] + chunk
+        return 0
+
+
+class BufferWindow(DumpWindow):
+    """Bytes that are already fully available, starting at absolute `offset`"""
+
+    def __init__(self, data, offset=0):
+        self.f = None
+        self.data = data
+        self.offset = offset
+        self.eof = True
+
+    def more(self, keep):
+        return None
+
+
+class MappedWindow(BufferWindow):
+    """The whole dump as a read-only mmap
+
+    Rows are located on the mapped bytes directly and only the fields that
+    are asked for get copied out and decoded; the OS page cache does the
+    buffering.
+    """
+
+    def __init__(self, f):
+        super().__init__(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        self.f = f
+
+    def close(self):
+        self.data.close()
+
+
+def _open_window(f, chunk_size, use_mmap):
+    """mmap the dump when possible, otherwise fall back to chunked reads"""
+    if use_mmap:
+        try:
+            return MappedWindow(f)
+        except (ValueError, OSError):
+            # Empty files and pipes cannot be mapped
+            pass
+    return DumpWindow(f, chunk_size)
+
+
+def _decode(raw):
+    return raw.decode('utf-8', errors='ignore')
+
+
+def _unescape_run(run, quotes):
+    """Resolve the escapes of a stretch of a literal with no escaped backslash
+
+    Every backslash in `run` starts an escape, so after splitting on it each
+    piece but the first begins with the escaped byte.
+    """
+    pieces = run.split(b'\\')
+    if quotes:
+        pieces = [pieces[0].replace(b"''", b"'")] + [
+            UNESCAPED[p[0]] + p[1:].replace(b"''", b"'") for p in pieces[1:] if p
+        ]
+        return b''.join(pieces)
+    return pieces[0] + b''.join([UNESCAPED[p[0]] + p[1:] for p in pieces[1:] if p])
+
+
+def unescape(raw):
+    """Decode the body of a quoted string literal from the dump to str
+
+    `raw` is the bytes between the outer quotes. Escapes are resolved the way
+    MySQL reads them, left to right: escaped backslashes are split off first
+    (so an escaped backslash followed by 'n' stays a backslash and an 'n'),
+    then each remaining escape is looked up in UNESCAPED; '' continuations
+    become a single quote. The splits and joins run in C, leaving one short
+    Python step per escape.
+    """
+    quotes = b"''" in raw
+    if b'\\' in raw:
+        raw = b'\\'.join([_unescape_run(run, quotes) for run in raw.split(b'\\\\')])
+    elif quotes:
+        raw = raw.replace(b"''", b"'")
+    return _decode(raw)
+
+
+def _fill(window, pos, size):
+    """Read ahead until `size` bytes are buffered after `pos` (or end of file)
+
+    Returns the new position, which moves when the window is refilled.
+    """
+    while len(window.data) - pos < size and not window.eof:
+        new_pos = window.more(pos)
+        if new_pos is None:
+            break
+        pos = new_pos
+    return pos
+
+
+def _skip_statement(window, pos):
+    """Skip to just past the next ';' that is not inside a quoted string
+
+    The scan is a single compiled regex over the raw bytes, so statements we
+    do not care about are never split into rows or fields.
+    """
+    while True:
+        data = window.data
+        end = SKIP_RE.match(data, pos).end()
+        if end < len(data) and data[end] == SEMICOLON:
+            return end + 1
+        # Either the buffer ran out or a quoted string is cut off; `end` is
+        # always outside quotes, so everything before it can be dropped
+        new_pos = window.more(end)
+        if new_pos is None:
+            return len(window.data)
+        pos = new_pos
+
+
+def _incomplete(data, i):
+    """Explain why FIELD_RE failed at `i`: return None if the row is merely
+    cut off by the end of `data`, raise ValueError if it is malformed"""
+    end = VALUE_RE.match(data, i).end()
+    if end >= len(data):
+        return None
+    if data[end] == QUOTE and STRING_RE.match(data, end) is None:
+        # An unterminated string literal runs to the end of the buffer
+        return None
+    raise ValueError(f"Unexpected {chr(data[end])!r} after a value")
+
+
+def _parse_row(data, pos, keep=None):
+    """Parse one (value, value, ...) tuple starting at data[pos] == '('
+
+    Quoted values are returned as decoded str (see unescape()), NULL as None
+    and anything else (numbers) as the literal text. When `keep` is a set of field indexes, other fields are
+    stepped over without being copied or decoded and come back as None.
+    Returns (row, end) or None when the tuple runs past the end of `data`.
+
+    Each field is matched by one compiled regex, which jumps over a whole
+    string literal in C, and wanted values are copied out as a single slice.
+    """
+    i = pos + 1
+    n = len(data)
+    while i < n and data[i] in SPACE:
+        i += 1
+    if i >= n:
+        return None
+    if data[i] == CLOSE:
+        return (), i + 1
+
+    fields = []
+    match = FIELD_RE.match
+    while True:
+        m = match(data, i)
+        if m is None:
+            return _incomplete(data, i)
+        if keep is None or len(fields) in keep:
+            if m.start(1) >= 0:
+                fields.append(unescape(data[m.start(1) + 1:m.end(1) - 1]))
+            else:
+                token = m.group(2)
+                fields.append(None if token.upper() == b'NULL' else _decode(token))
+        else:
+            fields.append(None)
+        i = m.end()
+        if data[i - 1] == CLOSE:
+            return tuple(fields), i
+
+
+def _parse_buffered(window, pos, table, keep):
+    """Parse the row at `pos`, refilling the window until it is complete
+
+    Returns (row, pos, end); `pos` moves if the window was refilled.
+    """
+    try:
+        parsed = _parse_row(window.data, pos, keep)
+        while parsed is None:
+            new_pos = window.more(pos)
+            if new_pos is None:
+                raise ValueError("Row is cut off by the end of the file")
+            pos = new_pos
+            parsed = _parse_row(window.data, pos, keep)
+    except ValueError as e:
+        raise ValueError(
+            f"Bad row in INSERT INTO `{table}` at byte {window.offset + pos}: {e}"
+        ) from None
+    row, end = parsed
+    return row, pos, end
+
+
+def _iter_values(window, pos, table, keep=None, test=None):
+    """Yield (table, row, offset, length) for one INSERT statement
+
+    `offset` and `length` give the absolute byte span of the row's tuple in
+    the file. `test` is an optional (indexes, conditions) pair: the row is
+    first parsed for those fields only, and dropped unless every
+    (index, allowed values) condition holds. Returns the position after the
+    statement.
+    """
+    while True:
+        data = window.data
+        n = len(data)
+        while pos < n and data[pos] in SPACE:
+            pos += 1
+        if pos >= n:
+            pos = window.more(pos)
+            if pos is None:
+                raise ValueError(f"Truncated INSERT INTO `{table}` at end of file")
+            continue
+
+        c = data[pos]
+        if c == SEMICOLON:
+            return pos + 1
+        if c == COMMA:
+            pos += 1
+            continue
+        if c != OPEN:
+            raise ValueError(
+                f"Expected '(' in INSERT INTO `{table}` at byte {window.offset + pos}"
+            )
+
+        if test is not None:
+            test_keep, conditions = test
+            row, pos, end = _parse_buffered(window, pos, table, test_keep)
+            if not all(i < len(row) and row[i] in allowed for i, allowed in conditions):
+                pos = end
+                continue
+            if keep != test_keep:
+                row, pos, end = _parse_buffered(window, pos, table, keep)
+        else:
+            row, pos, end = _parse_buffered(window, pos, table, keep)
+
+        yield table, row, window.offset + pos, end - pos
+        pos = end
+
+
+def iter_rows(sql_file, tables=None, columns=None, where=None,
+              chunk_size=CHUNK_SIZE, use_mmap=True):
+    """Yield (table, row) for every row of every INSERT statement in the dump
+
+    The dump is memory-mapped (or, when that is not possible or `use_mmap`
+    is False, read in `chunk_size` pieces), so memory use does not grow with
+    the size of the dump. Extended (multi-row) and multi-line INSERTs are
+    supported; rows come out in file order.
+
+    When `tables` is given, INSERTs into any other table are skipped with a
+    byte-level scan for their terminating ';' instead of being tokenized.
+
+    When `columns` is given (column names from COLUMNS), only those fields
+    are decoded; the others are skipped on the raw bytes and come back as
+    None. Tables not listed in COLUMNS are always decoded in full.
+
+    `where` maps column names to a value or a collection of accepted values,
+    e.g. {'post_status': 'publish', 'meta_key': '_thumbnail_id'}. Each
+    condition applies to the tables that have that column; rows failing it
+    are rejected after decoding only the tested fields.
+    """
+    spans = iter_row_spans(sql_file, tables, columns, where, chunk_size, use_mmap)
+    for table, row, _, _ in spans:
+        yield table, row
+
+
+def _field_indexes(table, columns):
+    if columns is None or table not in COLUMNS:
+        return None
+    return {i for i, name in enumerate(COLUMNS[table]) if name in columns}
+
+
+def _row_test(table, where):
+    """Turn `where` into (indexes, conditions) for _iter_values(), or None"""
+    if not where or table not in COLUMNS:
+        return None
+    conditions = []
+    for i, name in enumerate(COLUMNS[table]):
+        if name in where:
+            allowed = where[name]
+            if isinstance(allowed, str):
+                allowed = {allowed}
+            conditions.append((i, frozenset(allowed)))
+    if not conditions:
+        return None
+    return {i for i, _ in conditions}, conditions
+
+
+def _plan(plans, table, columns, where):
+    """(keep, test) for a table, computed once per table"""
+    if table not in plans:
+        plans[table] = (_field_indexes(table, columns), _row_test(table, where))
+    return plans[table]
+
+
+def iter_row_spans(sql_file, tables=None, columns=None, where=None,
+                   chunk_size=CHUNK_SIZE, use_mmap=True, resume=None):
+    """Like iter_rows(), but yield (table, row, offset, length)
+
+    `offset` and `length` locate the row's '(...)' tuple in the file, so it
+    can be re-read later with parse_row_at() without scanning the dump.
+
+    `resume` is a (table, offset) pair where offset is the end of a row
+    yielded by an earlier run (offset + length); reading continues with the
+    next row of that INSERT, as if the earlier run had not stopped.
+    """
+    if tables is not None:
+        tables = set(tables)
+    if columns is not None:
+        columns = set(columns)
+    plans = {}
+
+    with open(sql_file, 'rb') as f:
+        window = _open_window(f, chunk_size, use_mmap)
+        try:
+            pos = 0
+            if resume is not None:
+                table, pos = resume
+                if not isinstance(window, MappedWindow):
+                    f.seek(pos)
+                    window.offset = pos
+                    pos = 0
+                if tables is not None and table not in tables:
+                    pos = _skip_statement(window, pos)
+                else:
+                    keep, test = _plan(plans, table, columns, where)
+                    pos = yield from _iter_values(window, pos, table, keep, test)
+
+            while True:
+                # Make sure a whole statement head is buffered before matching it
+                pos = _fill(window, pos, MAX_HEAD)
+                data = window.data
+                if pos >= len(data):
+                    return
+
+                gap = GAP_RE.match(data, pos).end()
+                if gap != pos:
+                    pos = gap
+                    continue
+
+                m = INSERT_RE.match(data, pos)
+                if m is None:
+                    pos = _skip_statement(window, pos)
+                    continue
+
+                table = m.group(1).decode('utf-8')
+                if tables is not None and table not in tables:
+                    pos = _skip_statement(window, m.end())
+                    continue
+
+                keep, test = _plan(plans, table, columns, where)
+                pos = yield from _iter_values(window, m.end(), table, keep, test)
+        finally:
+            if isinstance(window, MappedWindow):
+                window.close()
+
+
+def _split_rows(data, table, pos, range_size, ranges, after_row=False):
+    """Append the ranges of one INSERT's rows from `pos` on to `ranges`
+
+    `pos` is at a row's '(' or, with `after_row`, just after a row's ')'.
+    Returns the position after the statement's ';'.
+    """
+    while True:
+        if after_row:
+            sep = ROW_SEP_RE.match(data, pos)
+            if sep is None:
+                raise ValueError(f"Expected ',' or ';' in INSERT INTO `{table}` at byte {pos}")
+            pos = sep.end()
+            if sep.group(1) == b';':
+                return pos
+        rows = ROWS_RE.match(data, pos, pos + range_size) or ROW_RE.match(data, pos)
+        if rows is None:
+            raise ValueError(f"Bad row in INSERT INTO `{table}` at byte {pos}")
+        ranges.append((table, pos, rows.end()))
+        pos = rows.end()
+        after_row = True
+
+
+def split_values(data, tables, range_size=RANGE_SIZE, resume=None):
+    """Cut the VALUES of the INSERTs into `tables` into row-aligned byte ranges
+
+    Returns [(table, start, end), ...] in file order; each range starts at a
+    row's '(' and ends just after a row's ')', so it holds whole rows only.
+    Split points are found with compiled regexes that step over quoted
+    strings, so a '),(' inside a post body never splits a row. Ranges are
+    about `range_size` bytes; a single bigger row gets a range of its own.
+    `resume` is a (table, offset) pair as for iter_row_spans().
+    """
+    tables = set(tables)
+    ranges = []
+    n = len(data)
+    pos = 0
+    if resume is not None:
+        table, pos = resume
+        if table in tables:
+            pos = _split_rows(data, table, pos, range_size, ranges, after_row=True)
+        else:
+            pos = SKIP_RE.match(data, pos).end() + 1
+
+    while True:
+        pos = GAP_RE.match(data, pos).end()
+        if pos >= n:
+            return ranges
+
+        m = INSERT_RE.match(data, pos)
+        if m is None or m.group(1).decode('utf-8') not in tables:
+            end = SKIP_RE.match(data, m.end() if m else pos).end()
+            pos = end + 1
+            continue
+
+        pos = _split_rows(data, m.group(1).decode('utf-8'), m.end(), range_size, ranges)
+
+
+_worker_file = None
+_worker_data = None
+
+
+def _init_worker(sql_file):
+    """Map the dump once per worker process"""
+    global _worker_file, _worker_data
+    _worker_file = open(sql_file, 'rb')
+    _worker_data = mmap.mmap(_worker_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_range(task):
+    """Parse the rows of one range from split_values() inside a worker
+
+    Returns [(row, offset, length), ...] with absolute byte spans.
+    """
+    table, start, end, keep, test = task
+    window = BufferWindow(_worker_data[start:end] + b';', start)
+    return [span[1:] for span in _iter_values(window, 0, table, keep, test)]
+
+
+def iter_rows_parallel(sql_file, tables, columns=None, where=None,
+                       workers=None, range_size=RANGE_SIZE):
+    """Like iter_rows(), but parse the rows on a pool of worker processes
+
+    The parent maps the dump and splits the VALUES of the wanted tables into
+    row-aligned ranges (see split_values()); workers parse the ranges with
+    the same `columns` and `where` handling as iter_rows(), and rows come
+    back in file order. `workers` defaults to the number of CPU cores.
+
+    Worker processes re-import the calling script on platforms that spawn
+    them (macOS, Windows), so callers must keep their top-level code under
+    `if __name__ == "__main__":`. Falls back to iter_rows() for a single
+    worker, a dump that cannot be mapped, or a dump with one range only.
+    """
+    spans = iter_row_spans_parallel(sql_file, tables, columns, where, workers, range_size)
+    for table, row, _, _ in spans:
+        yield table, row
+
+
+def iter_row_spans_parallel(sql_file, tables, columns=None, where=None,
+                            workers=None, range_size=RANGE_SIZE, resume=None):
+    """Like iter_rows_parallel(), but yield (table, row, offset, length)
+
+    `resume` continues after a row of an earlier run, as for iter_row_spans().
+    """
+    workers = workers or os.cpu_count() or 1
+    if columns is not None:
+        columns = set(columns)
+
+    ranges = []
+    if workers > 1:
+        with open(sql_file, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                data = None
+            if data is not None:
+                try:
+                    ranges = split_values(data, tables, range_size, resume)
+                finally:
+                    data.close()
+
+    if len(ranges) < 2:
+        yield from iter_row_spans(sql_file, tables, columns, where, resume=resume)
+        return
+
+    plans = {}
+    tasks = [(table, start, end) + _plan(plans, table, columns, where)
+             for table, start, end in ranges]
+
+    with Pool(min(workers, len(tasks)), _init_worker, (sql_file,)) as pool:
+        for task, spans in zip(tasks, pool.imap(_parse_range, tasks)):
+            table = task[0]
+            for row, offset, length in spans:
+                yield table, row, offset, length
+
+
+def parse_row_at(data, offset):
+    """Parse the row tuple that starts at `offset` of a bytes-like object
+
+    `data` is typically an mmap of the dump and `offset` a value recorded by
+    iter_row_spans().
+    """
+    if data[offset] != OPEN:
+        raise ValueError(f"No row starts at byte {offset}")
+    parsed = _parse_row(data, offset)
+    if parsed is None:
+        raise ValueError(f"Row at byte {offset} is cut off by the end of the file")
+    return parsed[0]
+
+
+def read_tables(sql_file, tables, chunk_size=CHUNK_SIZE, use_mmap=True):
+    """Collect the rows of several tables in a single pass over the dump
+
+    Returns {table: [row, ...]} with an entry (possibly empty) for every
+    requested table. Meant for small tables that are joined afterwards, such
+    as the term tables; stream big ones with iter_rows() instead.
+    """
+    result = {table: [] for table in tables}
+    rows = iter_rows(sql_file, tables=result.keys(), chunk_size=chunk_size, use_mmap=use_mmap)
+    for table, row in rows:
+        result[table].append(row)
+    return result
+
+
+def row_dict(table, row):
+    """Map a row from iter_rows() to a dict keyed by column name"""
+    return dict(zip(COLUMNS[table], row))
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+WordPress post offset index
+Maps wp_posts IDs and slugs to the byte span of their row in the SQL dump,
+so individual posts are read straight from an mmap of the dump
+
+Usage: python3 scripts/wp_index.py [sql_file] [--force]
+"""
+
+import argparse
+import mmap
+import os
+import sqlite3
+import time
+
+from wp_cache import DEFAULT_SQL_FILE, build_info, dump_info, is_fresh
+from wp_dump import iter_row_spans, parse_row_at, row_dict
+
+# Bump when the index layout or value format changes to force a rebuild
+INDEX_VERSION = 2
+
+
+def default_index_file(sql_file):
+    return sql_file + '.index.sqlite'
+
+
+def build_index(sql_file, index_file=None):
+    """Record the offset and length of every wp_posts row; returns the index path
+
+    Only IDs, slugs, status/type and byte spans are stored, so the index is
+    a small fraction of the dump. Like the cache, it is written to a
+    temporary file and renamed into place.
+    """
+    index_file = index_file or default_index_file(sql_file)
+    tmp_file = index_file + '.tmp'
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    conn = sqlite3.connect(tmp_file)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute(
+            'CREATE TABLE post_rows (ID INTEGER PRIMARY KEY, post_name, post_status, '
+            'post_type, offset INTEGER, length INTEGER)'
+        )
+        conn.execute('CREATE TABLE dump_info (key TEXT PRIMARY KEY, value TEXT)')
+
+        count = 0
+        spans = iter_row_spans(sql_file, tables={'wp_posts'},
+                               columns={'ID', 'post_name', 'post_status', 'post_type'})
+        for table, row, offset, length in spans:
+            post = row_dict(table, row)
+            conn.execute(
+                'INSERT OR REPLACE INTO post_rows VALUES (?, ?, ?, ?, ?, ?)',
+                (post['ID'], post['post_name'], post['post_status'],
+                 post['post_type'], offset, length)
+            )
+            count += 1
+
+        conn.execute('CREATE INDEX post_rows_name ON post_rows (post_name, post_status)')
+
+        info = build_info(sql_file, INDEX_VERSION)
+        info['rows.wp_posts'] = str(count)
+        conn.executemany('INSERT INTO dump_info VALUES (?, ?)', info.items())
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_file, index_file)
+    return index_file
+
+
+class PostIndex:
+    """Random access to wp_posts rows of a dump through the offset index
+
+    Opening it (re)builds the index when missing or stale. Lookups cost one
+    indexed query plus parsing the requested rows, independent of dump size.
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self, sql_file=DEFAULT_SQL_FILE, index_file=None, force=False):
+        index_file = index_file or default_index_file(sql_file)
+
+        conn = None
+        if not force and os.path.exists(index_file):
+            conn = sqlite3.connect(index_file)
+            if not is_fresh(conn, sql_file, INDEX_VERSION):
+                conn.close()
+                conn = None
+        if conn is None:
+            build_index(sql_file, index_file)
+            conn = sqlite3.connect(index_file)
+
+        self.conn = conn
+        self.info = dump_info(conn)
+        self._file = open(sql_file, 'rb')
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self.data.close()
+        self._file.close()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, offset, length):
+        """Parse the row stored at a recorded byte span as a wp_posts dict"""
+        row = parse_row_at(self.data[offset:offset + length], 0)
+        return row_dict('wp_posts', row)
+
+    def get_post(self, post_id):
+        """Return the post with this ID as a dict, or None"""
+        span = self.conn.execute(
+            'SELECT offset, length FROM post_rows WHERE ID = ?', (post_id,)
+        ).fetchone()
+        return self.read(*span) if span else None
+
+    def get_post_by_slug(self, slug, post_status='publish'):
+        """Return the post with this post_name (and status) as a dict, or None"""
+        return self.get_posts_by_slug([slug], post_status).get(slug)
+
+    def get_posts_by_slug(self, slugs, post_status='publish'):
+        """Return {slug: post} for the slugs that exist with this status
+
+        All spans come from one query and are read in file order, so a batch
+        costs one pass over the requested rows only.
+        """
+        slugs = list(slugs)
+        if not slugs:
+            return {}
+        placeholders = ', '.join('?' * len(slugs))
+        spans = self.conn.execute(
+            f'SELECT post_name, offset, length FROM post_rows '
+            f'WHERE post_status = ? AND post_name IN ({placeholders}) ORDER BY offset',
+            [post_status] + slugs
+        ).fetchall()
+
+        posts = {}
+        for slug, offset, length in spans:
+            if slug not in posts:
+                posts[slug] = self.read(offset, length)
+        return posts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the wp_posts offset index of a WordPress SQL dump')
+    parser.add_argument('sql_file', nargs='?', default=DEFAULT_SQL_FILE)
+    parser.add_argument('--index-file', help='defaults to <sql_file>.index.sqlite')
+    parser.add_argument('--force', action='store_true', help='rebuild even if the index is fresh')
+    args = parser.parse_args()
+
+    print("=== WordPress Post Offset Index ===\n")
+    print(f"📂 Dump: {args.sql_file}")
+
+    started = time.time()
+    with PostIndex(args.sql_file, args.index_file, force=args.force) as index:
+        rows = int(index.info.get('rows.wp_posts', 0))
+
+    print(f"💾 Index: {args.index_file or default_index_file(args.sql_file)}")
+    print(f"   wp_posts: {rows:,} rows")
+    print(f"\n✅ Ready in {time.time() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,14 @@
 import { notFound, redirect } from 'next/navigation';
-import blogPostsData from '@/data/blog_posts.json';
+import { getAllPosts, getPostMetaBySlug } from '@/lib/blogPosts';
 
 export async function generateStaticParams() {
-  return blogPostsData.posts.map((post: any) => ({
+  return getAllPosts().map((post) => ({
     slug: post.slug,
   }));
 }
 
 export default async function EmbedPage({ params }: { params: { slug: string } }) {
-  const post = blogPostsData.posts.find((p: any) => p.slug === params.slug);
+  const post = getPostMetaBySlug(params.slug);
 
   if (!post) {
     notFound();
@@ -1,7 +1,7 @@
 import Link from 'next/link';
 import { notFound } from 'next/navigation';
 import { Suspense } from 'react';
-import blogPostsData from '../../data/blog_posts.json';
+import { getAllPosts, getPostBySlug, getPostMetaBySlug, type BlogPost, type BlogPostMeta } from '@/lib/blogPosts';
 import officesData from '../../data/dmv_offices.json';
 import Header from '../../components/Header';
 import Footer from '../../components/Footer';
@@ -15,19 +15,6 @@ import BlogViewTracker from '@/components/BlogViewTracker';
 import BlogPostContent from '@/components/BlogPostContent';
 import MultiplexAd from '@/components/MultiplexAd';
 
-// Type for blog post
-type BlogPost = {
-  id: number;
-  title: string;
-  slug: string;
-  content: string;
-  excerpt: string;
-  publishedAt: string;
-  author: string;
-  tags?: string[];
-  views?: number;
-};
-
 // Type for DMV office
 type Office = {
   id: number;
@@ -55,12 +42,6 @@ function extractYouTubeId(url: string): string | null {
   return null;
 }
 
-// Extract first image from HTML content
-function extractFirstImageFromHtml(htmlContent: string): string | null {
-  const imgMatch = htmlContent.match(/<img[^>]+src="([^">]+)"/);
-  return imgMatch ? imgMatch[1] : null;
-}
-
 // Generate Table of Contents from H2 headings
 function generateTableOfContents(htmlContent: string): { toc: string; processedHtml: string } {
   const h2Regex = /<h2[^>]*>(.*?)<\/h2>/gi;
@@ -124,7 +105,7 @@ function processContentImages(htmlContent: string, postTitle: string): string {
     /<figure[^>]*wp-block-embed[^>]*>.*?<div[^>]*wp-block-embed__wrapper[^>]*>\s*(https?:\/\/(?:www\.)?dmvcalifornia\.us\/([^\/\s<]+)\/?)\s*<\/div><\/figure>/gis,
     (match, url, slug) => {
       // Find the referenced post
-      const referencedPost = blogPostsData.posts.find((p: BlogPost) => p.slug === slug);
+      const referencedPost = getPostMetaBySlug(slug);
 
       if (!referencedPost) {
         // If post not found, return a simple link
@@ -132,7 +113,7 @@ function processContentImages(htmlContent: string, postTitle: string): string {
       }
 
       // Get the first image from the referenced post
-      const postImage = extractFirstImageFromHtml(referencedPost.content);
+      const postImage = referencedPost.firstImage;
 
       return `<div class="my-8 not-prose">
   <a href="/${referencedPost.slug}" class="block group">
@@ -185,7 +166,7 @@ function processContentImages(htmlContent: string, postTitle: string): string {
       }
 
       // Find the referenced post
-      const referencedPost = blogPostsData.posts.find((p: BlogPost) => p.slug === slug);
+      const referencedPost = getPostMetaBySlug(slug);
 
       if (!referencedPost) {
         // If post not found, keep the original link
@@ -193,7 +174,7 @@ function processContentImages(htmlContent: string, postTitle: string): string {
       }
 
       // Get the first image from the referenced post
-      const postImage = extractFirstImageFromHtml(referencedPost.content);
+      const postImage = referencedPost.firstImage;
 
       return `<div class="my-8 not-prose">
   <a href="/${referencedPost.slug}" class="block group">
@@ -309,7 +290,7 @@ function processContentImages(htmlContent: string, postTitle: string): string {
 
 // Generate static params for all blog posts and office pages (for static generation)
 export async function generateStaticParams() {
-  const blogSlugs = blogPostsData.posts.map((post: BlogPost) => ({
+  const blogSlugs = getAllPosts().map((post) => ({
     slug: post.slug,
   }));
 
@@ -323,7 +304,7 @@ export async function generateStaticParams() {
 // Generate metadata for SEO
 export async function generateMetadata({ params }: { params: { slug: string } }) {
   // Check if it's a blog post
-  const post = blogPostsData.posts.find((p: BlogPost) => p.slug === params.slug);
+  const post = getPostMetaBySlug(params.slug);
 
   if (post) {
     return {
@@ -348,9 +329,9 @@ export async function generateMetadata({ params }: { params: { slug: string } })
 }
 
 // Page component that handles both blog posts and office pages
-export default function SlugPage({ params }: { params: { slug: string } }) {
+export default async function SlugPage({ params }: { params: { slug: string } }) {
   // Check if it's a blog post first
-  const post = blogPostsData.posts.find((p: BlogPost) => p.slug === params.slug);
+  const post = await getPostBySlug(params.slug);
 
   if (post) {
     // Render blog post page (rest of the existing code)
@@ -402,7 +383,8 @@ function renderBlogPost(post: BlogPost) {
   }
 
   // Get all posts sorted by date for prev/next navigation
-  const sortedPosts = [...blogPostsData.posts].sort((a, b) =>
+  const allPosts = getAllPosts();
+  const sortedPosts = [...allPosts].sort((a, b) =>
     new Date(b.publishedAt).getTime() - new Date(a.publishedAt).getTime()
   );
 
@@ -412,11 +394,11 @@ function renderBlogPost(post: BlogPost) {
 
   // Get related posts (by matching tags, or random if no tags)
   const getRelatedPosts = () => {
-    let related: BlogPost[] = [];
+    let related: BlogPostMeta[] = [];
 
     // First, try to find posts with matching tags
     if (post.tags && post.tags.length > 0) {
-      related = blogPostsData.posts.filter(p =>
+      related = allPosts.filter(p =>
         p.id !== post.id &&
         p.tags?.some(tag => post.tags?.includes(tag))
       );
@@ -424,7 +406,7 @@ function renderBlogPost(post: BlogPost) {
 
     // If not enough related posts, add random posts
     if (related.length < 3) {
-      const remaining = blogPostsData.posts
+      const remaining = allPosts
         .filter(p => p.id !== post.id && !related.includes(p))
         .sort(() => Math.random() - 0.5);
       related = [...related, ...remaining];
@@ -512,7 +494,7 @@ function renderBlogPost(post: BlogPost) {
             </h2>
             <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
               {relatedPosts.map(relatedPost => {
-                const postImage = extractFirstImageFromHtml(relatedPost.content);
+                const postImage = relatedPost.firstImage;
                 return (
                   <Link
                     key={relatedPost.id}
@@ -580,10 +562,10 @@ function renderBlogPost(post: BlogPost) {
                   className="group block bg-white rounded-lg shadow-sm hover:shadow-md transition-all border border-gray-200 overflow-hidden"
                 >
                   <div className="flex h-full">
-                    {extractFirstImageFromHtml(prevPost.content) && (
+                    {prevPost.firstImage && (
                       <div className="w-24 h-24 flex-shrink-0 overflow-hidden bg-gray-100">
                         <img
-                          src={extractFirstImageFromHtml(prevPost.content) || ''}
+                          src={prevPost.firstImage || ''}
                           alt={prevPost.title}
                           className="w-full h-full object-cover group-hover:scale-105 transition-transform"
                           loading="lazy"
@@ -625,10 +607,10 @@ function renderBlogPost(post: BlogPost) {
                         {nextPost.title}
                       </h3>
                     </div>
-                    {extractFirstImageFromHtml(nextPost.content) && (
+                    {nextPost.firstImage && (
                       <div className="w-24 h-24 flex-shrink-0 overflow-hidden bg-gray-100">
                         <img
-                          src={extractFirstImageFromHtml(nextPost.content) || ''}
+                          src={nextPost.firstImage || ''}
                           alt={nextPost.title}
                           className="w-full h-full object-cover group-hover:scale-105 transition-transform"
                           loading="lazy"
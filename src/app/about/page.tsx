@@ -2,8 +2,8 @@ import Link from 'next/link';
 import Header from '@/components/Header';
 import Footer from '@/components/Footer';
 import CookieBanner from '@/components/CookieBanner';
-import blogPostsData from '@/data/blog_posts.json';
-import quizzesData from '@/data/quizzes.json';
+import { getAllPosts } from '@/lib/blogPosts';
+import { getQuizManifest } from '@/lib/quizzes';
 
 export const metadata = {
   title: 'About Us - DMV California',
@@ -12,10 +12,10 @@ export const metadata = {
 
 export default function AboutPage() {
   // Select 4 featured quizzes (mix of simulation and practice tests)
-  const featuredQuizzes = quizzesData.quizzes.slice(0, 4);
+  const featuredQuizzes = getQuizManifest(['quizzes.json']).slice(0, 4);
 
   // Select 4 featured blog posts (sorted by views)
-  const featuredPosts = blogPostsData.posts
+  const featuredPosts = [...getAllPosts()]
     .sort((a, b) => b.views - a.views)
     .slice(0, 4);
 
@@ -136,7 +136,7 @@ export default function AboutPage() {
                         {quiz.description}
                       </p>
                       <div className="flex items-center justify-between text-sm text-gray-500">
-                        <span>{quiz.questions.length} Questions</span>
+                        <span>{quiz.questionCount} Questions</span>
                         <span className="text-primary font-medium group-hover:underline">
                           Start Test →
                         </span>
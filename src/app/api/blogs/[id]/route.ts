@@ -1,5 +1,5 @@
 import { NextResponse } from 'next/server';
-import blogsData from '@/data/blog_posts.json';
+import { getPostById } from '@/lib/blogPosts';
 
 export async function GET(
   request: Request,
@@ -16,7 +16,7 @@ export async function GET(
     }
 
     // Find the blog by ID
-    const blog = blogsData.posts.find(post => post.id === id);
+    const blog = await getPostById(id);
 
     if (!blog) {
       return NextResponse.json(
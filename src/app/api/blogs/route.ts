@@ -1,10 +1,10 @@
 import { NextResponse } from 'next/server';
-import blogsData from '@/data/blog_posts.json';
+import { getAllPosts } from '@/lib/blogPosts';
 
 export async function GET() {
   try {
     // Transform blog posts to include essential info without full content
-    const blogs = blogsData.posts.map(post => ({
+    const blogs = getAllPosts().map(post => ({
       id: post.id,
       title: post.title,
       slug: post.slug,
@@ -1,5 +1,96 @@
 import { NextRequest, NextResponse } from 'next/server';
 import clientPromise from '@/lib/mongodb';
+import leaderboardIndex from '@/data/leaderboard/index.json';
+
+// Per-quiz snapshots written by scripts/leaderboard_snapshot.py, keyed by
+// the quiz IDs the site sends: the top-k entries, entry count and average
+// score, so a quiz's leaderboard is served without sorting the whole
+// collection. Quizzes without one are queried live.
+type SnapshotEntry = {
+  name: string;
+  points: number;
+  percentage: number;
+  completedAt: string;
+  rank: number;
+};
+
+const snapshots = leaderboardIndex.quizzes as Record<string, { file: string; topK: number }>;
+
+// Better is a higher percentage, then an earlier finish
+function byRank(a: { percentage: number; completedAt: string }, b: { percentage: number; completedAt: string }) {
+  if (b.percentage !== a.percentage) return b.percentage - a.percentage;
+  return new Date(a.completedAt).getTime() - new Date(b.completedAt).getTime();
+}
+
+function toEntry(entry: any) {
+  return {
+    id: entry._id.toString(),
+    quizId: entry.quizId,
+    date: entry.date,
+    name: entry.name,
+    email: entry.email || '',
+    points: entry.points,
+    percentage: entry.percentage,
+    completedAt: entry.completedAt,
+  };
+}
+
+// Snapshot top entries plus the scores posted since the snapshot was taken;
+// `limit` is at most the snapshot's top-k, the entries it can rank
+async function snapshotLeaderboard(quizId: string, query: object, limit: number) {
+  const { default: snapshot } = await import(`../../../data/leaderboard/${snapshots[quizId].file}`);
+  const top = (snapshot.top as SnapshotEntry[]).map((entry) => ({
+    id: `${quizId}-${entry.rank}`,
+    quizId,
+    date: entry.completedAt.slice(0, 10),
+    name: entry.name,
+    email: '',
+    points: entry.points,
+    percentage: entry.percentage,
+    completedAt: entry.completedAt,
+  }));
+
+  let newer: ReturnType<typeof toEntry>[] = [];
+  let newerCount = 0;
+  let newerTotal = 0;
+  if (process.env.MONGODB_URI && snapshot.through) {
+    try {
+      const client = await clientPromise;
+      const collection = client.db('dmvcalifornia').collection('leaderboard');
+      const since = { $and: [query, { completedAt: { $gt: snapshot.through } }] };
+
+      // Only the best `limit` new entries can make the board
+      const documents = await collection
+        .find(since)
+        .sort({ percentage: -1, completedAt: 1 })
+        .limit(limit)
+        .toArray();
+      newer = documents.map(toEntry);
+
+      // Count and score sum of all of them, for the totals
+      const [stats] = await collection
+        .aggregate([
+          { $match: since },
+          { $group: { _id: null, count: { $sum: 1 }, total: { $sum: '$percentage' } } },
+        ])
+        .toArray();
+      newerCount = stats?.count ?? 0;
+      newerTotal = stats?.total ?? 0;
+    } catch (error) {
+      // The snapshot alone is still a leaderboard
+      console.error('Leaderboard API error (entries since snapshot):', error);
+      newer = [];
+    }
+  }
+
+  const entries = snapshot.entries + newerCount;
+  const total = snapshot.average * snapshot.entries + newerTotal;
+  return {
+    leaderboard: [...top, ...newer].sort(byRank).slice(0, limit),
+    entries,
+    average: Math.round((total / entries) * 10) / 10,
+  };
+}
 
 export async function POST(request: NextRequest) {
   try {
@@ -67,24 +158,10 @@ export async function POST(request: NextRequest) {
 
 export async function GET(request: NextRequest) {
   try {
-    // Check if MongoDB URI is configured
-    if (!process.env.MONGODB_URI) {
-      console.error('MONGODB_URI environment variable is not set');
-      return NextResponse.json(
-        { error: 'Database configuration error' },
-        { status: 500 }
-      );
-    }
-
     // Get quizId from query params if provided
     const { searchParams } = new URL(request.url);
     const quizId = searchParams.get('quizId');
 
-    // Connect to MongoDB
-    const client = await clientPromise;
-    const db = client.db('dmvcalifornia');
-    const collection = db.collection('leaderboard');
-
     // Build query - try to match quizId as either string or number
     let query = {};
     if (quizId) {
@@ -99,6 +176,30 @@ export async function GET(request: NextRequest) {
       }
     }
 
+    // Precomputed top entries when the quiz has a snapshot
+    if (quizId && snapshots[quizId]) {
+      const { topK } = snapshots[quizId];
+      const limit = Math.min(parseInt(searchParams.get('limit') || '') || topK, topK);
+      return NextResponse.json(
+        await snapshotLeaderboard(quizId, query, limit),
+        { status: 200 }
+      );
+    }
+
+    // Check if MongoDB URI is configured
+    if (!process.env.MONGODB_URI) {
+      console.error('MONGODB_URI environment variable is not set');
+      return NextResponse.json(
+        { error: 'Database configuration error' },
+        { status: 500 }
+      );
+    }
+
+    // Connect to MongoDB
+    const client = await clientPromise;
+    const db = client.db('dmvcalifornia');
+    const collection = db.collection('leaderboard');
+
     // Fetch leaderboard entries, sorted by percentage (desc) then by date (asc)
     const entries = await collection
       .find(query)
@@ -106,16 +207,7 @@ export async function GET(request: NextRequest) {
       .toArray();
 
     // Convert MongoDB documents to plain objects
-    const leaderboard = entries.map((entry: any) => ({
-      id: entry._id.toString(),
-      quizId: entry.quizId,
-      date: entry.date,
-      name: entry.name,
-      email: entry.email || '',
-      points: entry.points,
-      percentage: entry.percentage,
-      completedAt: entry.completedAt,
-    }));
+    const leaderboard = entries.map(toEntry);
 
     return NextResponse.json(
       { leaderboard },
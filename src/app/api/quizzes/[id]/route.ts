@@ -1,8 +1,13 @@
 import { NextResponse } from 'next/server';
-import quizzesData from '@/data/quizzes.json';
-import turkishQuizzesData from '@/data/turkish-quizzes.json';
-import spanishSignTestData from '@/data/spanish-sign-test.json';
-import chineseQuizzesData from '@/data/chinese-quizzes.json';
+import { getQuizById } from '@/lib/quizzes';
+
+// English, Turkish, Spanish and Chinese quizzes
+const QUIZ_SOURCES = [
+  'quizzes.json',
+  'turkish-quizzes.json',
+  'spanish-sign-test.json',
+  'chinese-quizzes.json',
+];
 
 export async function GET(
   request: Request,
@@ -11,18 +16,8 @@ export async function GET(
   try {
     const { id } = params;
 
-    // Combine all quizzes (English, Turkish, Spanish, Chinese)
-    // Note: Spanish quiz data has different structure (single quiz object vs array)
-    const spanishQuiz = spanishSignTestData.quiz ? [spanishSignTestData.quiz] : [];
-    const allQuizzes = [
-      ...quizzesData.quizzes,
-      ...turkishQuizzesData.quizzes,
-      ...spanishQuiz,
-      ...chineseQuizzesData.quizzes,
-    ];
-
-    // Find the quiz by ID
-    const quiz = allQuizzes.find(q => q.id === id);
+    // Find the quiz in the manifest; only its file is loaded
+    const quiz = await getQuizById(id, QUIZ_SOURCES);
 
     if (!quiz) {
       return NextResponse.json(
@@ -1,8 +1,13 @@
 import { NextResponse } from 'next/server';
-import quizzesData from '@/data/quizzes.json';
-import turkishQuizzesData from '@/data/turkish-quizzes.json';
-import spanishSignTestData from '@/data/spanish-sign-test.json';
-import chineseQuizzesData from '@/data/chinese-quizzes.json';
+import { getQuizManifest, loadQuiz } from '@/lib/quizzes';
+
+// English, Turkish, Spanish and Chinese quizzes
+const QUIZ_SOURCES = [
+  'quizzes.json',
+  'turkish-quizzes.json',
+  'spanish-sign-test.json',
+  'chinese-quizzes.json',
+];
 
 export async function GET(request: Request) {
   try {
@@ -10,35 +15,24 @@ export async function GET(request: Request) {
     const { searchParams } = new URL(request.url);
     const includeQuestions = searchParams.get('includeQuestions') === 'true';
 
-    // Combine all quizzes (English, Turkish, Spanish, Chinese)
-    // Note: Spanish quiz data has different structure (single quiz object vs array)
-    const spanishQuiz = spanishSignTestData.quiz ? [spanishSignTestData.quiz] : [];
-    const allQuizzes = [
-      ...quizzesData.quizzes,
-      ...turkishQuizzesData.quizzes,
-      ...spanishQuiz,
-      ...chineseQuizzesData.quizzes,
-    ];
+    const allQuizzes = getQuizManifest(QUIZ_SOURCES);
+
+    if (includeQuestions) {
+      // Return full quizzes with questions (for mobile app)
+      return NextResponse.json(await Promise.all(allQuizzes.map(loadQuiz)));
+    }
 
-    // Transform quizzes based on query parameter
-    const quizzes = allQuizzes.map(quiz => {
-      if (includeQuestions) {
-        // Return full quiz with questions (for mobile app)
-        return quiz;
-      } else {
-        // Return metadata only (for website)
-        return {
-          id: quiz.id,
-          title: quiz.title,
-          description: quiz.description,
-          slug: quiz.slug,
-          questionsCount: quiz.questions.length,
-          category: quiz.category,
-          passingScore: quiz.passingScore,
-          timeLimit: quiz.timeLimit,
-        };
-      }
-    });
+    // Return metadata only (for website), straight from the manifest
+    const quizzes = allQuizzes.map(quiz => ({
+      id: quiz.id,
+      title: quiz.title,
+      description: quiz.description,
+      slug: quiz.slug,
+      questionsCount: quiz.questionCount,
+      category: quiz.category,
+      passingScore: quiz.passingScore,
+      timeLimit: quiz.timeLimit,
+    }));
 
     return NextResponse.json(quizzes);
   } catch (error) {
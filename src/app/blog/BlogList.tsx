@@ -1,33 +1,38 @@
 'use client';
 
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useEffect } from 'react';
 import Link from 'next/link';
 import MultiplexAd from '@/components/MultiplexAd';
 
 type FilterSection = 'sort' | 'tags' | null;
 
+// Posts come from the index, without content
 type BlogPost = {
   id: number;
   title: string;
   slug: string;
-  content: string;
   excerpt: string;
   publishedAt: string;
   author: string;
   tags?: string[];
+  firstImage?: string | null;
 };
 
-// Helper to extract first image from HTML content
-function extractFirstImage(htmlContent: string): string | null {
-  const imgMatch = htmlContent.match(/<img[^>]+src="([^">]+)"/);
-  return imgMatch ? imgMatch[1] : null;
-}
-
 export default function BlogList({ posts }: { posts: BlogPost[] }) {
   const [selectedTag, setSelectedTag] = useState<string>('all');
   const [sortBy, setSortBy] = useState<'newest' | 'oldest'>('newest');
   const [expandedSection, setExpandedSection] = useState<FilterSection>(null);
   const [searchQuery, setSearchQuery] = useState<string>('');
+  const [searchTexts, setSearchTexts] = useState<Record<string, string> | null>(null);
+
+  // The posts' plain text (src/data/blog/search.json) is a separate chunk,
+  // fetched once the first search is typed
+  useEffect(() => {
+    if (!searchQuery.trim() || searchTexts) return;
+    import('@/data/blog/search.json').then(({ default: search }) => {
+      setSearchTexts(search.posts as Record<string, string>);
+    });
+  }, [searchQuery, searchTexts]);
 
   // Get all unique tags
   const allTags = useMemo(() => {
@@ -46,7 +51,7 @@ export default function BlogList({ posts }: { posts: BlogPost[] }) {
     if (searchQuery.trim()) {
       const query = searchQuery.toLowerCase();
       filtered = filtered.filter(post => {
-        const searchableText = `${post.title} ${post.excerpt} ${post.content}`.toLowerCase();
+        const searchableText = `${post.title} ${post.excerpt} ${post.tags?.join(' ') ?? ''} ${searchTexts?.[String(post.id)] ?? ''}`.toLowerCase();
         return searchableText.includes(query);
       });
     }
@@ -64,7 +69,7 @@ export default function BlogList({ posts }: { posts: BlogPost[] }) {
     });
 
     return filtered;
-  }, [posts, selectedTag, sortBy, searchQuery]);
+  }, [posts, selectedTag, sortBy, searchQuery, searchTexts]);
 
   return (
     <>
@@ -246,7 +251,7 @@ export default function BlogList({ posts }: { posts: BlogPost[] }) {
         ) : (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
             {filteredPosts.map((post, index) => {
-              const firstImage = extractFirstImage(post.content);
+              const firstImage = post.firstImage;
 
               return (
                 <>
@@ -4,8 +4,8 @@ import Footer from '../../components/Footer';
 import CookieBanner from '../../components/CookieBanner';
 import AppPromotionIOS from '../../components/AppPromotionIOS';
 
-// Import the extracted blog posts
-import blogPostsData from '../../data/blog_posts.json';
+// Post index only; the list never needs post content
+import { getAllPosts } from '@/lib/blogPosts';
 
 export const metadata = {
   title: 'Blog - DMV California',
@@ -13,7 +13,7 @@ export const metadata = {
 };
 
 export default function BlogPage() {
-  const posts = blogPostsData.posts;
+  const posts = getAllPosts();
 
   return (
     <div className="min-h-screen bg-gray-50">
@@ -4,27 +4,30 @@ import Header from '../components/Header';
 import Footer from '../components/Footer';
 import CookieBanner from '../components/CookieBanner';
 import AppPromotion from '../components/AppPromotion';
-import blogPostsData from '../data/blog_posts.json';
-import quizzesData from '../data/quizzes.json';
-import turkishQuizzesData from '../data/turkish-quizzes.json';
-import chineseQuizzesData from '../data/chinese-quizzes.json';
-import spanishSignTestData from '../data/spanish-sign-test.json';
+import { getQuizManifest, type QuizMeta } from '../lib/quizzes';
 import AdSense from '@/components/AdSense';
 import ADSENSE_CONFIG from '@/config/adsense';
 
 export default function Home() {
+  // Quiz listings from the quiz export's manifest (no questions loaded)
+  const englishQuizzes = getQuizManifest(['quizzes.json']);
+  const turkishQuizzes = getQuizManifest(['turkish-quizzes.json']);
+  const chineseQuizzes = getQuizManifest(['chinese-quizzes.json']);
+  const spanishSignTest = getQuizManifest(['spanish-sign-test.json']);
+
   // Calculate total questions across all languages
-  const englishQuestions = quizzesData.quizzes.reduce((sum, quiz) => sum + quiz.questions.length, 0);
-  const turkishQuestions = turkishQuizzesData.quizzes.reduce((sum, quiz) => sum + quiz.questions.length, 0);
-  const chineseQuestions = chineseQuizzesData.quizzes.reduce((sum, quiz) => sum + quiz.questions.length, 0);
-  const spanishQuestions = spanishSignTestData.quiz ? spanishSignTestData.quiz.questions.length : 0;
+  const countQuestions = (quizzes: QuizMeta[]) => quizzes.reduce((sum, quiz) => sum + quiz.questionCount, 0);
+  const englishQuestions = countQuestions(englishQuizzes);
+  const turkishQuestions = countQuestions(turkishQuizzes);
+  const chineseQuestions = countQuestions(chineseQuizzes);
+  const spanishQuestions = countQuestions(spanishSignTest);
   const totalQuestions = englishQuestions + turkishQuestions + chineseQuestions + spanishQuestions;
 
   // Calculate total tests
-  const totalTests = quizzesData.quizzes.length + turkishQuizzesData.quizzes.length + chineseQuizzesData.quizzes.length + 1; // +1 for Spanish
+  const totalTests = englishQuizzes.length + turkishQuizzes.length + chineseQuizzes.length + 1; // +1 for Spanish
 
   // Select 6 featured items (2 simulation tests + interactive flashcards + Spanish + Turkish + Chinese)
-  const simulationTests = quizzesData.quizzes.filter(q => q.category === 'Full Simulation Tests').slice(0, 2);
+  const simulationTests = englishQuizzes.filter(q => q.category === 'Full Simulation Tests').slice(0, 2);
   const featuredTests = [...simulationTests];
 
   return (
@@ -156,7 +159,7 @@ export default function Home() {
                     {quiz.description}
                   </p>
                   <div className="flex items-center justify-between text-sm text-gray-500">
-                    <span>{quiz.questions.length} Questions</span>
+                    <span>{quiz.questionCount} Questions</span>
                     <span className="text-primary font-medium group-hover:underline">
                       Start →
                     </span>
@@ -238,7 +241,7 @@ export default function Home() {
                   California DMV Türkçe sürücü testleri. Turkish driving knowledge tests with complete explanations.
                 </p>
                 <div className="flex items-center justify-between text-sm text-gray-500">
-                  <span>{turkishQuestions} Questions • {turkishQuizzesData.quizzes.length} Tests</span>
+                  <span>{turkishQuestions} Questions • {turkishQuizzes.length} Tests</span>
                   <span className="text-red-600 font-medium group-hover:underline">
                     Başla →
                   </span>
@@ -265,7 +268,7 @@ export default function Home() {
                   加州 DMV 中文駕駛考試。California DMV Chinese driving knowledge tests with complete answers.
                 </p>
                 <div className="flex items-center justify-between text-sm text-gray-500">
-                  <span>{chineseQuestions} Questions • {chineseQuizzesData.quizzes.length} Tests</span>
+                  <span>{chineseQuestions} Questions • {chineseQuizzes.length} Tests</span>
                   <span className="text-yellow-600 font-medium group-hover:underline">
                     開始 →
                   </span>
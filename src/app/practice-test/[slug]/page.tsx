@@ -4,13 +4,13 @@ import CookieBanner from '@/components/CookieBanner';
 import QuizEngine from '@/components/quiz/QuizEngine';
 import Leaderboard from '@/components/quiz/Leaderboard';
 import AppPromotionIOS from '@/components/AppPromotionIOS';
-import quizzesData from '@/data/quizzes.json';
-import chineseQuizzesData from '@/data/chinese-quizzes.json';
+import { getQuizBySlug, getQuizManifest } from '@/lib/quizzes';
 import { notFound } from 'next/navigation';
 import Link from 'next/link';
 
-// Combine all quizzes
-const allQuizzes = [...quizzesData.quizzes, ...chineseQuizzesData.quizzes];
+// English and Chinese quizzes; only the rendered quiz's questions are loaded
+const QUIZ_SOURCES = ['quizzes.json', 'chinese-quizzes.json'];
+const allQuizzes = getQuizManifest(QUIZ_SOURCES);
 
 export async function generateStaticParams() {
   return allQuizzes.map((quiz) => ({
@@ -42,19 +42,20 @@ async function fetchLeaderboard(quizId: string | number) {
 
     if (!response.ok) {
       console.error('Failed to fetch leaderboard:', response.status);
-      return [];
+      return { leaderboard: [] };
     }
 
+    // Snapshot leaderboards also carry the entry count and average of all entries
     const data = await response.json();
-    return data.leaderboard || [];
+    return { leaderboard: data.leaderboard || [], entries: data.entries, average: data.average };
   } catch (error) {
     console.error('Error fetching leaderboard:', error);
-    return [];
+    return { leaderboard: [] };
   }
 }
 
 export default async function QuizPage({ params }: { params: { slug: string } }) {
-  const quiz = allQuizzes.find((q) => q.slug === params.slug);
+  const quiz = await getQuizBySlug(params.slug, QUIZ_SOURCES);
 
   if (!quiz) {
     notFound();
@@ -136,9 +137,11 @@ export default async function QuizPage({ params }: { params: { slug: string } })
               <div className="lg:col-span-1">
                 <div className="sticky top-24 space-y-4">
                   <Leaderboard
-                    entries={quizLeaderboard}
+                    entries={quizLeaderboard.leaderboard}
                     quizTitle={quiz.title}
                     limit={10}
+                    total={quizLeaderboard.entries}
+                    average={quizLeaderboard.average}
                   />
 
                   {/* App Promotion - iOS Only */}
@@ -4,7 +4,7 @@ import Footer from '@/components/Footer';
 import CookieBanner from '@/components/CookieBanner';
 import AppPromotionIOS from '@/components/AppPromotionIOS';
 import PracticeTestsContent from '@/components/PracticeTestsContent';
-import quizzesData from '@/data/quizzes.json';
+import { getQuizManifest } from '@/lib/quizzes';
 
 export const metadata = {
   title: 'California DMV Practice Tests | DMV California',
@@ -12,7 +12,8 @@ export const metadata = {
 };
 
 export default function PracticeTestsPage() {
-  const quizzes = quizzesData.quizzes;
+  // Listing fields only; the questions load on each quiz's own page
+  const quizzes = getQuizManifest(['quizzes.json']);
 
   return (
     <>
@@ -1,7 +1,6 @@
 import { MetadataRoute } from 'next';
-import blogPostsData from '@/data/blog_posts.json';
-import quizzesData from '@/data/quizzes.json';
-import chineseQuizzesData from '@/data/chinese-quizzes.json';
+import { getAllPosts } from '@/lib/blogPosts';
+import { getQuizManifest } from '@/lib/quizzes';
 
 export default function sitemap(): MetadataRoute.Sitemap {
   const baseUrl = 'https://www.dmvcalifornia.us';
@@ -53,7 +52,7 @@ export default function sitemap(): MetadataRoute.Sitemap {
   ];
 
   // Blog posts
-  const blogPages: MetadataRoute.Sitemap = blogPostsData.posts.map((post) => ({
+  const blogPages: MetadataRoute.Sitemap = getAllPosts().map((post) => ({
     url: `${baseUrl}/${post.slug}`,
     lastModified: new Date(post.publishedAt),
     changeFrequency: 'monthly' as const,
@@ -61,7 +60,7 @@ export default function sitemap(): MetadataRoute.Sitemap {
   }));
 
   // Quiz pages (English)
-  const quizPages: MetadataRoute.Sitemap = quizzesData.quizzes.map((quiz) => ({
+  const quizPages: MetadataRoute.Sitemap = getQuizManifest(['quizzes.json']).map((quiz) => ({
     url: `${baseUrl}/practice-test/${quiz.slug}`,
     lastModified: new Date(),
     changeFrequency: 'weekly' as const,
@@ -97,7 +96,7 @@ export default function sitemap(): MetadataRoute.Sitemap {
   ];
 
   // Chinese quiz pages (dynamically generated from data)
-  const chinesePages: MetadataRoute.Sitemap = chineseQuizzesData.quizzes.map((quiz) => ({
+  const chinesePages: MetadataRoute.Sitemap = getQuizManifest(['chinese-quizzes.json']).map((quiz) => ({
     url: `${baseUrl}/practice-test/${quiz.slug}`,
     lastModified: new Date(),
     changeFrequency: 'weekly' as const,
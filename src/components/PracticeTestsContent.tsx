@@ -13,7 +13,7 @@ interface Quiz {
   slug: string;
   passingScore: number;
   timeLimit?: number;
-  questions: any[];
+  questionCount: number;
 }
 
 interface PracticeTestsContentProps {
@@ -45,7 +45,7 @@ export default function PracticeTestsContent({ quizzes }: PracticeTestsContentPr
     if (sortBy === 'title') {
       filtered = filtered.sort((a, b) => a.title.localeCompare(b.title));
     } else if (sortBy === 'questions') {
-      filtered = filtered.sort((a, b) => b.questions.length - a.questions.length);
+      filtered = filtered.sort((a, b) => b.questionCount - a.questionCount);
     } else if (sortBy === 'category') {
       filtered = filtered.sort((a, b) => a.category.localeCompare(b.category));
     }
@@ -166,7 +166,7 @@ export default function PracticeTestsContent({ quizzes }: PracticeTestsContentPr
                     <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                       <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
                     </svg>
-                    <span>{quiz.questions.length} Questions</span>
+                    <span>{quiz.questionCount} Questions</span>
                   </div>
                   <div className="flex items-center gap-2 text-sm text-gray-600">
                     <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -237,7 +237,7 @@ export default function PracticeTestsContent({ quizzes }: PracticeTestsContentPr
                     <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                       <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
                     </svg>
-                    <span>{quiz.questions.length} Q</span>
+                    <span>{quiz.questionCount} Q</span>
                   </div>
                   <div className="flex items-center gap-2 text-sm text-gray-600">
                     <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -7,10 +7,14 @@ interface LeaderboardProps {
   entries: LeaderboardEntry[];
   quizTitle: string;
   limit?: number;
+  // Attempts and average score of all entries, when `entries` only holds the top ones
+  total?: number;
+  average?: number;
 }
 
-export default function Leaderboard({ entries, quizTitle, limit = 10 }: LeaderboardProps) {
+export default function Leaderboard({ entries, quizTitle, limit = 10, total, average }: LeaderboardProps) {
   const [showAll, setShowAll] = useState(false);
+  const attempts = total ?? entries.length;
 
   // Get top entries (sorted by percentage descending)
   const sortedEntries = [...entries]
@@ -60,7 +64,7 @@ export default function Leaderboard({ entries, quizTitle, limit = 10 }: Leaderbo
           🏆 Leaderboard
         </h2>
         <span className="text-sm text-gray-500">
-          {entries.length} {entries.length === 1 ? 'entry' : 'entries'}
+          {attempts} {attempts === 1 ? 'entry' : 'entries'}
         </span>
       </div>
 
@@ -154,13 +158,13 @@ export default function Leaderboard({ entries, quizTitle, limit = 10 }: Leaderbo
         </div>
         <div className="text-center">
           <div className="text-xl font-bold text-gray-900 whitespace-nowrap">
-            {(entries.reduce((sum, e) => sum + e.percentage, 0) / entries.length).toFixed(1)}%
+            {(average ?? entries.reduce((sum, e) => sum + e.percentage, 0) / entries.length).toFixed(1)}%
           </div>
           <div className="text-xs text-gray-500 mt-1 leading-tight">Average<br/>Score</div>
         </div>
         <div className="text-center">
           <div className="text-xl font-bold text-gray-900">
-            {entries.length}
+            {attempts}
           </div>
           <div className="text-xs text-gray-500 mt-1 leading-tight">Total<br/>Attempts</div>
         </div>
@@ -0,0 +1,53 @@
+import blogIndex from '@/data/blog/index.json';
+
+// Blog posts live in src/data/blog (written by scripts/blog_store.py): an
+// index with every field but the HTML content, which is split into shards
+// under content/ and only loaded for the posts that are rendered.
+
+export type BlogPostMeta = {
+  id: number;
+  title: string;
+  slug: string;
+  excerpt: string;
+  publishedAt: string;
+  author: string;
+  tags: string[];
+  views: number;
+  featuredImage?: string;
+  firstImage?: string | null;
+};
+
+export type BlogPost = BlogPostMeta & {
+  content: string;
+};
+
+const posts = blogIndex.posts as BlogPostMeta[];
+
+// All posts without their content, in index order
+export function getAllPosts(): BlogPostMeta[] {
+  return posts;
+}
+
+export function getPostMetaBySlug(slug: string): BlogPostMeta | undefined {
+  return posts.find((post) => post.slug === slug);
+}
+
+// HTML content of one post; only its shard is loaded (and bundled separately)
+export async function getPostContent(id: number): Promise<string> {
+  const shard = Math.floor(id / blogIndex.shard_size);
+  const { default: data } = await import(`../data/blog/content/${shard}.json`);
+  return data.posts[String(id)] ?? '';
+}
+
+async function withContent(meta: BlogPostMeta | undefined): Promise<BlogPost | undefined> {
+  if (!meta) return undefined;
+  return { ...meta, content: await getPostContent(meta.id) };
+}
+
+export async function getPostBySlug(slug: string): Promise<BlogPost | undefined> {
+  return withContent(getPostMetaBySlug(slug));
+}
+
+export async function getPostById(id: number): Promise<BlogPost | undefined> {
+  return withContent(posts.find((post) => post.id === id));
+}
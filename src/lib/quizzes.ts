@@ -0,0 +1,46 @@
+import quizManifest from '@/data/quizzes/manifest.json';
+import type { Quiz } from '@/types/quiz';
+
+// Quizzes live in src/data/quizzes (written by scripts/export_quizzes.py):
+// a manifest with every quiz's listing fields and one file per quiz, which
+// is only loaded for the quiz that is rendered or requested. `source` is the
+// quiz file under src/data the quiz comes from.
+
+export type QuizMeta = {
+  id: string;
+  title: string;
+  description: string;
+  slug: string;
+  category: string;
+  language?: string;
+  passingScore: number;
+  timeLimit?: number;
+  questionCount: number;
+  file: string;
+  source: string;
+  hash: string;
+};
+
+const quizzes = quizManifest.quizzes as QuizMeta[];
+
+// Quizzes of the given source files, in manifest order; all without sources
+export function getQuizManifest(sources?: string[]): QuizMeta[] {
+  if (!sources) return quizzes;
+  return quizzes.filter((quiz) => sources.includes(quiz.source));
+}
+
+// Full quiz with its questions; only its file is loaded (and bundled separately)
+export async function loadQuiz(meta: QuizMeta): Promise<Quiz> {
+  const { default: quiz } = await import(`../data/quizzes/${meta.file}`);
+  return quiz as Quiz;
+}
+
+export async function getQuizBySlug(slug: string, sources?: string[]): Promise<Quiz | undefined> {
+  const meta = getQuizManifest(sources).find((quiz) => quiz.slug === slug);
+  return meta ? loadQuiz(meta) : undefined;
+}
+
+export async function getQuizById(id: string, sources?: string[]): Promise<Quiz | undefined> {
+  const meta = getQuizManifest(sources).find((quiz) => quiz.id === id);
+  return meta ? loadQuiz(meta) : undefined;
+}